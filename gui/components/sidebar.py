@@ -14,6 +14,7 @@ def render_sidebar(db_service: DatabaseService, state_manager: StateManager):
             state_manager.clear_selection()
             st.rerun()
         st.sidebar.divider()
+    render_cache_stats(db_service)
     if not tables:
         st.sidebar.info("📭 No hay tablas\n\nEjecuta CREATE TABLE para comenzar")
         return
@@ -28,3 +29,16 @@ def render_sidebar(db_service: DatabaseService, state_manager: StateManager):
         ):
             state_manager.set_selected_table(table_name)
             st.rerun()
+
+def render_cache_stats(db_service: DatabaseService):
+    stats = db_service.get_cache_stats()
+    with st.sidebar.expander("⚡ Caché de consultas"):
+        col1, col2 = st.columns(2)
+        col1.metric("Parse hits", stats["parse_hits"])
+        col2.metric("Parse misses", stats["parse_misses"])
+        col1.metric("Result hits", stats["result_hits"])
+        col2.metric("Planes", stats["cached_plans"])
+        col1.metric("Parse (EWMA)", f"{stats['ewma_parse_ms']:.2f} ms")
+        col2.metric("Exec (EWMA)", f"{stats['ewma_execute_ms']:.2f} ms")
+        if stats["bypass"]:
+            st.caption("Parseo barato: caché de planes desactivada")
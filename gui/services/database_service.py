@@ -1,27 +1,88 @@
 import sys
+import time
 import streamlit as st
+from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 _ROOT = Path(__file__).resolve().parents[2]
 if str(_ROOT) not in sys.path:
     sys.path.insert(0, str(_ROOT))
-from indexes.core.database_manager import DatabaseManager
-from sql_parser.parser import parse
-from sql_parser.executor import Executor
+from sql_parser.plan_types import SelectPlan
+if TYPE_CHECKING:
+    from indexes.core.database_manager import DatabaseManager
+    from sql_parser.executor import Executor
+_READ_ONLY_PLANS = (SelectPlan,)
+_PLAN_CACHE_SIZE = 128
+_EWMA_ALPHA = 0.1
+_BYPASS_MIN_SAMPLES = 5
+_BYPASS_PARSE_MS = 1.0
+@dataclass
+class CacheStats:
+    parse_hits: int = 0
+    parse_misses: int = 0
+    result_hits: int = 0
+    parse_samples: int = 0
+    ewma_parse_ms: float = 0.0
+    ewma_execute_ms: float = 0.0
+    bypass: bool = False
+    def record_parse(self, elapsed_ms: float):
+        self.parse_misses += 1
+        self.parse_samples += 1
+        if self.parse_samples == 1:
+            self.ewma_parse_ms = elapsed_ms
+        else:
+            self.ewma_parse_ms += _EWMA_ALPHA * (elapsed_ms - self.ewma_parse_ms)
+        self.bypass = self.parse_samples >= _BYPASS_MIN_SAMPLES and self.ewma_parse_ms < _BYPASS_PARSE_MS
+    def record_execute(self, elapsed_ms: float):
+        if self.ewma_execute_ms == 0.0:
+            self.ewma_execute_ms = elapsed_ms
+        else:
+            self.ewma_execute_ms += _EWMA_ALPHA * (elapsed_ms - self.ewma_execute_ms)
 @st.cache_resource
-def get_cached_db_manager(db_base_dir: str) -> DatabaseManager:
+def get_cached_db_manager(db_base_dir: str) -> "DatabaseManager":
+    from indexes.core.database_manager import DatabaseManager
     return DatabaseManager(database_name="frontend_db", base_path=db_base_dir)
 @st.cache_resource
-def get_cached_executor(_db: DatabaseManager) -> Executor:
+def get_cached_executor(_db: "DatabaseManager") -> "Executor":
+    from sql_parser.executor import Executor
     return Executor(_db)
+@st.cache_resource
+def get_cached_stats() -> CacheStats:
+    return CacheStats()
+@st.cache_resource
+def get_cached_plans() -> Dict[str, list]:
+    return {}
 class DatabaseService:
     def __init__(self, base_path: Path):
         self.base_path = base_path
         self.db_base_dir = str(base_path / "databases")
-    def get_db(self) -> DatabaseManager:
+    def get_db(self) -> "DatabaseManager":
         return get_cached_db_manager(self.db_base_dir)
-    def get_executor(self) -> Executor:
+    def get_executor(self) -> "Executor":
         return get_cached_executor(self.get_db())
+    def get_cache_stats(self) -> Dict[str, Any]:
+        stats = asdict(get_cached_stats())
+        stats["cached_plans"] = len(get_cached_plans())
+        return stats
+    def _parse_cached(self, sql_text: str) -> list:
+        from sql_parser.parser import parse
+        stats = get_cached_stats()
+        plan_cache = get_cached_plans()
+        if not stats.bypass:
+            plans = plan_cache.get(sql_text)
+            if plans is not None:
+                stats.parse_hits += 1
+                return plans
+        start = time.perf_counter_ns()
+        plans = parse(sql_text)
+        stats.record_parse((time.perf_counter_ns() - start) / 1e6)
+        if stats.bypass:
+            plan_cache.clear()
+        elif plans:
+            if len(plan_cache) >= _PLAN_CACHE_SIZE:
+                plan_cache.pop(next(iter(plan_cache)))
+            plan_cache[sql_text] = plans
+        return plans
     def reset(self):
         st.cache_resource.clear()
     def list_tables(self) -> List[str]:
@@ -44,17 +105,31 @@ class DatabaseService:
     def execute_sql(self, sql_text: str) -> List[Dict[str, Any]]:
         results = []
         try:
-            plans = parse(sql_text)
+            plans = self._parse_cached(sql_text)
         except Exception as e:
             return [{"plan": "ParseError", "error": str(e)}]
         if not plans:
             return [{"plan": "EmptyQuery", "error": "No se generaron planes ejecutables"}]
         executor = self.get_executor()
+        stats = get_cached_stats()
+        seen: Dict[str, Any] = {}
         for plan in plans:
             plan_name = type(plan).__name__
+            read_only = isinstance(plan, _READ_ONLY_PLANS)
+            plan_key = repr(plan) if read_only else None
+            if read_only and plan_key in seen:
+                stats.result_hits += 1
+                results.append({"plan": plan_name, "result": seen[plan_key]})
+                continue
+            if not read_only:
+                seen.clear()
             try:
+                start = time.perf_counter_ns()
                 result = executor.execute(plan)
+                stats.record_execute((time.perf_counter_ns() - start) / 1e6)
                 results.append({"plan": plan_name, "result": result})
+                if read_only:
+                    seen[plan_key] = result
             except Exception as e:
                 results.append({"plan": plan_name, "error": str(e)})
         return results
@@ -1,7 +1,26 @@
 import os
 import streamlit as st
 from pathlib import Path
-from typing import Optional
+from typing import Final, Optional
+_DEFAULT_SQL_EDITOR: Final[str] = """CREATE TABLE Restaurantes (
+    id INT KEY INDEX BTREE,
+    nombre VARCHAR[100] INDEX BTREE,
+    ubicacion ARRAY[FLOAT] INDEX RTREE,
+    rating FLOAT INDEX HASH,
+    precio_promedio FLOAT,
+    fecha_apertura VARCHAR[20],
+    ciudad VARCHAR[50]
+);
+LOAD DATA FROM FILE "data/datasets/restaurantes.csv" INTO Restaurantes
+WITH MAPPING (ubicacion = ARRAY(latitud, longitud));
+SELECT * FROM Restaurantes
+WHERE ubicacion NEAREST ((-34.6037, -58.3816), 10);"""
+_SESSION_DEFAULTS = (
+    ('selected_table', None),
+    ('show_docs', False),
+    ('last_sql', ""),
+    ('query_results', None),
+)
 class StateManager:
     def __init__(self, base_path: Path):
         self.base_path = base_path
@@ -24,28 +43,9 @@ class StateManager:
     def clear_selection(self):
         st.session_state['selected_table'] = None
     def initialize_session_state(self):
-        if 'selected_table' not in st.session_state:
-            st.session_state['selected_table'] = None
-        if 'show_docs' not in st.session_state:
-            st.session_state['show_docs'] = False
-        if 'last_sql' not in st.session_state:
-            st.session_state['last_sql'] = ""
-        if 'query_results' not in st.session_state:
-            st.session_state['query_results'] = None
+        for key, default in _SESSION_DEFAULTS:
+            st.session_state.setdefault(key, default)
 
         if 'sql_editor_initialized' not in st.session_state:
-            default_sql = """CREATE TABLE Restaurantes (
-    id INT KEY INDEX BTREE,
-    nombre VARCHAR[100] INDEX BTREE,
-    ubicacion ARRAY[FLOAT] INDEX RTREE,
-    rating FLOAT INDEX HASH,
-    precio_promedio FLOAT,
-    fecha_apertura VARCHAR[20],
-    ciudad VARCHAR[50]
-);
-LOAD DATA FROM FILE "data/datasets/restaurantes.csv" INTO Restaurantes
-WITH MAPPING (ubicacion = ARRAY(latitud, longitud));
-SELECT * FROM Restaurantes
-WHERE ubicacion NEAREST ((-34.6037, -58.3816), 10);"""
-            st.session_state['sql_editor'] = default_sql
+            st.session_state['sql_editor'] = _DEFAULT_SQL_EDITOR
             st.session_state['sql_editor_initialized'] = True
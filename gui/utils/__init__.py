@@ -1,3 +1,3 @@
-from .formatters import format_value, format_time, format_record
+from .formatters import format_value, format_time, format_record, make_record_formatter
 
-__all__ = ['format_value', 'format_time', 'format_record']
+__all__ = ['format_value', 'format_time', 'format_record', 'make_record_formatter']
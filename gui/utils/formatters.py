@@ -1,4 +1,6 @@
-from typing import Any
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Tuple
 def format_value(v: Any) -> Any:
     if isinstance(v, float):
         return round(v, 4)
@@ -11,15 +13,26 @@ def format_value(v: Any) -> Any:
             return str(v)
     return v
 def format_time(ms: float) -> str:
-    if ms < 1:
-        return f"{ms:.3f} ms"
-    elif ms < 1000:
-        return f"{ms:.2f} ms"
-    else:
-        return f"{ms/1000:.2f} s"
+    return f"{ms:.3f} ms" if ms < 1 else (f"{ms:.2f} ms" if ms < 1000 else f"{ms/1000:.2f} s")
+@lru_cache(maxsize=64)
+def make_record_formatter(names: Tuple[str, ...]) -> Callable[[Any], dict]:
+    getter = attrgetter(*names)
+    single = len(names) == 1
+    def formatter(record) -> dict:
+        try:
+            values = getter(record)
+        except AttributeError:
+            values = tuple(getattr(record, col, None) for col in names)
+        else:
+            if single:
+                values = (values,)
+        return {col: format_value(v) for col, v in zip(names, values)}
+    return formatter
 def format_record(record) -> dict:
     try:
-        names = [n for (n, _, _) in record.value_type_size]
-    except (AttributeError, IndexError):
+        names = tuple(n for (n, _, _) in record.value_type_size)
+    except (AttributeError, IndexError, TypeError, ValueError):
+        return {}
+    if not names:
         return {}
-    return {col: format_value(getattr(record, col, None)) for col in names}
+    return make_record_formatter(names)(record)
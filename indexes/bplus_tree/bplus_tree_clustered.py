@@ -1,10 +1,34 @@
 from typing import Any, List, Optional, Dict
+from array import array
+from collections import OrderedDict
+from itertools import compress
 import bisect
+import mmap
 import struct
 import os
+import zlib
 from ..core.record import Record
 from ..core.performance_tracker import PerformanceTracker, OperationResult
 
+MADV_SEQUENTIAL = getattr(mmap, "MADV_SEQUENTIAL", None)
+MADV_WILLNEED = getattr(mmap, "MADV_WILLNEED", None)
+MAP_POPULATE = getattr(mmap, "MAP_POPULATE", 0)
+O_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+METADATA_PROBE_SIZE = 4 * mmap.PAGESIZE
+INTERNAL_ID_FLAG = 1 << 30
+LEAF_INTERLEAVED = 1
+LEAF_COLUMNAR = 2
+NODE_HEADER_STRUCT = struct.Struct("=Biii")
+LEAF_LINKS_STRUCT = struct.Struct("=ii")
+NODE_ID_STRUCT = struct.Struct("=i")
+PARENT_OFFSET = struct.calcsize("=Bii")
+PREV_LEAF_OFFSET = NODE_HEADER_STRUCT.size
+FREE_LINK_OFFSET = PARENT_OFFSET
+METADATA_COUNTERS_OFFSET = 8
+METADATA_COUNTERS_STRUCT = struct.Struct("=ii")
+METADATA_TAIL_STRUCT = struct.Struct("=iii")
+METADATA_CRC_STRUCT = struct.Struct("=I")
+
 
 class Node:
     def __init__(self, is_leaf: bool = False):
@@ -20,120 +44,238 @@ class Node:
         return len(self.keys) < min_keys
 
 
+class LazyRecordList:
+    """Registros de una hoja: guarda los bytes crudos y solo los deserializa al accederlos.
+    El registro decodificado se memoriza aparte, de modo que la hoja se reescribe con los bytes originales;
+    cada acceso entrega una copia para que quien lo reciba no altere la hoja cacheada"""
+
+    def __init__(self, items: Optional[List] = None, decode=None, decoded: Optional[List] = None):
+        self._items = items if items is not None else []
+        self._decoded = decoded if decoded is not None else [None] * len(self._items)
+        self._decode = decode
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LazyRecordList(self._items[index], self._decode, self._decoded[index])
+        item = self._items[index]
+        if isinstance(item, (bytes, memoryview)):
+            record = self._decoded[index]
+            if record is None:
+                record = self._decoded[index] = self._decode(item)
+            return record.copy()
+        return item.copy()
+
+    def __iter__(self):
+        for i in range(len(self._items)):
+            yield self[i]
+
+    def packed(self) -> List[bytes]:
+        items = self._items
+        for i, item in enumerate(items):
+            if type(item) is not bytes:
+                items[i] = bytes(item) if isinstance(item, memoryview) else item.pack()
+        return items
+
+    def insert(self, index: int, record):
+        self._items.insert(index, record)
+        self._decoded.insert(index, None)
+
+    def append(self, record):
+        self._items.append(record)
+        self._decoded.append(None)
+
+    def pop(self, index: int = -1):
+        """Quita el elemento sin deserializarlo: se devuelve tal cual (bytes o Record) para moverlo a otra hoja"""
+        self._decoded.pop(index)
+        return self._items.pop(index)
+
+    def compress(self, selectors) -> 'LazyRecordList':
+        """Conserva solo los elementos marcados en selectors, sin deserializarlos"""
+        selectors = list(selectors)
+        return LazyRecordList(list(compress(self._items, selectors)), self._decode,
+                              list(compress(self._decoded, selectors)))
+
+    def extend(self, other):
+        if isinstance(other, LazyRecordList):
+            if self._decode is None:
+                self._decode = other._decode
+            self._items.extend(other._items)
+            self._decoded.extend(other._decoded)
+        else:
+            self._items.extend(other)
+            self._decoded.extend([None] * len(other))
+
+
 class LeafNode(Node):
     def __init__(self):
         super().__init__(is_leaf=True)
-        self.records = []
+        self.records = LazyRecordList()
         self.prev_leaf_id = None
         self.next_leaf_id = None
 
-    def pack(self, key_packer, record_size: int, null_id: int) -> bytes:
+    def pack(self, keys_packer, header_struct: struct.Struct, records_offset: int, null_id: int) -> bytearray:
+        """Formato columnar: todas las claves seguidas tras la cabecera y los registros desde records_offset"""
         parent_id = self.parent_node_id if self.parent_node_id is not None else null_id
-        
-        data = bytearray()
-        data.extend(struct.pack('?', True))
-        data.extend(struct.pack('i', len(self.keys)))
-        data.extend(struct.pack('i', self.node_id))
-        data.extend(struct.pack('i', parent_id))
-        
         prev_id = self.prev_leaf_id if self.prev_leaf_id is not None else null_id
         next_id = self.next_leaf_id if self.next_leaf_id is not None else null_id
-        data.extend(struct.pack('i', prev_id))
-        data.extend(struct.pack('i', next_id))
-        
-        for i in range(len(self.keys)):
-            data.extend(key_packer(self.keys[i]))
-            data.extend(self.records[i].pack())
-        
-        return bytes(data)
+
+        num_keys = len(self.keys)
+        keys = keys_packer(self.keys)
+        records = b"".join(self.records.packed())
+        data = bytearray(records_offset + len(records))
+        header_struct.pack_into(data, 0, LEAF_COLUMNAR, num_keys, self.node_id, parent_id, prev_id, next_id)
+        data[header_struct.size:header_struct.size + len(keys)] = keys
+        data[records_offset:] = records
+
+        return data
 
     @staticmethod
-    def unpack(data: bytes, offset: int, num_keys: int, node_id: int, parent_id: Optional[int],
-               key_unpacker, key_storage_size: int, record_size: int, record_class, 
-               value_type_size: List, key_column: str, null_id: int, normalize_key: bool) -> 'LeafNode':
+    def _unpack_links(data: bytes, offset: int, node_id: int, parent_id: Optional[int], null_id: int) -> 'LeafNode':
         leaf = LeafNode()
         leaf.node_id = node_id
         leaf.parent_node_id = parent_id
 
-        prev_id, next_id = struct.unpack('ii', data[offset:offset+8])
+        prev_id, next_id = LEAF_LINKS_STRUCT.unpack_from(data, offset)
         leaf.prev_leaf_id = None if prev_id == null_id else prev_id
         leaf.next_leaf_id = None if next_id == null_id else next_id
-        offset += 8
+        return leaf
 
-        leaf.keys = []
-        leaf.records = []
+    @staticmethod
+    def unpack(data: bytes, offset: int, num_keys: int, node_id: int, parent_id: Optional[int],
+               keys_struct: struct.Struct, records_offset: int, record_size: int,
+               record_decoder, null_id: int, normalize_key: bool) -> 'LeafNode':
+        leaf = LeafNode._unpack_links(data, offset, node_id, parent_id, null_id)
 
-        for i in range(num_keys):
-            key_bytes = data[offset:offset+key_storage_size]
-            key = key_unpacker(key_bytes)
-            
-            if normalize_key:
-                key = key.decode('utf-8').rstrip('\x00')
-            
-            leaf.keys.append(key)
-            offset += key_storage_size
+        values = keys_struct.unpack_from(data, offset + 8)
+        if normalize_key:
+            leaf.keys = [key.rstrip(b'\x00').decode('utf-8') for key in values]
+        else:
+            leaf.keys = list(values)
 
-            record_bytes = data[offset:offset+record_size]
-            record = record_class.unpack(record_bytes, value_type_size, key_column)
-            
-            for field_name, field_type, _ in value_type_size:
-                if field_type == "CHAR":
-                    value = getattr(record, field_name)
-                    if isinstance(value, bytes):
-                        setattr(record, field_name, value.decode('utf-8').rstrip('\x00'))
-            
-            leaf.records.append(record)
-            offset += record_size
+        records_end = records_offset + num_keys * record_size
+        leaf.records = LazyRecordList([data[start:start + record_size]
+                                       for start in range(records_offset, records_end, record_size)], record_decoder)
+
+        return leaf
+
+    @staticmethod
+    def unpack_interleaved(data: bytes, offset: int, num_keys: int, node_id: int, parent_id: Optional[int],
+                           slot_struct: struct.Struct, record_decoder, null_id: int, normalize_key: bool) -> 'LeafNode':
+        """Hojas escritas antes del formato columnar, con clave y registro intercalados"""
+        leaf = LeafNode._unpack_links(data, offset, node_id, parent_id, null_id)
+        offset += 8
+
+        slots_end = offset + num_keys * slot_struct.size
+        slots = list(slot_struct.iter_unpack(data[offset:slots_end]))
+
+        if normalize_key:
+            leaf.keys = [key.rstrip(b'\x00').decode('utf-8') for key, _ in slots]
+        else:
+            leaf.keys = [key for key, _ in slots]
+        leaf.records = LazyRecordList([record_bytes for _, record_bytes in slots], record_decoder)
 
         return leaf
 
 
+class LeafView:
+    """Acceso de solo lectura a una hoja directamente sobre el mmap, sin deserializarla"""
+    BUFFER_BISECT_MIN_KEYS = 128
+
+    def __init__(self, buffer, page_offset: int, header_size: int, key_struct: struct.Struct,
+                 record_size: int, normalize_key: bool, keys_struct_for, records_offset: Optional[int] = None,
+                 encode_key=None):
+        self.buffer = buffer
+        self.num_keys = NODE_HEADER_STRUCT.unpack_from(buffer, page_offset)[1]
+        self.keys_offset = page_offset + header_size
+        if records_offset is None:
+            self.key_stride = self.record_stride = key_struct.size + record_size
+            self.records_offset = self.keys_offset + key_struct.size
+        else:
+            self.key_stride, self.record_stride = key_struct.size, record_size
+            self.records_offset = page_offset + records_offset
+        self.key_struct = key_struct
+        self.record_size = record_size
+        self.normalize_key = normalize_key
+        self.keys_struct_for = keys_struct_for
+        self.key_code = key_struct.format[-1] if records_offset is not None and not normalize_key else None
+        self.encode_key = encode_key
+
+    def key_at(self, i: int) -> Any:
+        key = self.key_struct.unpack_from(self.buffer, self.keys_offset + i * self.key_stride)[0]
+        if self.normalize_key:
+            key = key.rstrip(b'\x00').decode('utf-8')
+        return key
+
+    def keys(self) -> List[Any]:
+        values = self.keys_struct_for(self.num_keys).unpack_from(self.buffer, self.keys_offset)
+        if self.normalize_key:
+            return [key.rstrip(b'\x00').decode('utf-8') for key in values]
+        return list(values)
+
+    def record_bytes_at(self, i: int) -> bytes:
+        start = self.records_offset + i * self.record_stride
+        return self.buffer[start:start + self.record_size]
+
+    def bisect_left(self, key: Any) -> int:
+        if self.key_code is not None and self.num_keys >= self.BUFFER_BISECT_MIN_KEYS:
+            # en hojas grandes se busca sobre el mmap sin desempaquetar todas las claves
+            end = self.keys_offset + self.num_keys * self.key_stride
+            with memoryview(self.buffer) as buffer, buffer[self.keys_offset:end] as raw, raw.cast(self.key_code) as keys:
+                return bisect.bisect_left(keys, key)
+
+        if not self.normalize_key:
+            keys = self.keys_struct_for(self.num_keys).unpack_from(self.buffer, self.keys_offset)
+            return bisect.bisect_left(keys, key)
+
+        if self.encode_key is not None and isinstance(key, str) and '\x00' not in key:
+            # UTF-8 rellenado con ceros ordena igual que el str: se comparan los bytes guardados sin decodificarlos
+            keys = self.keys_struct_for(self.num_keys).unpack_from(self.buffer, self.keys_offset)
+            return bisect.bisect_left(keys, self.encode_key(key))
+
+        lo, hi = 0, self.num_keys
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
 class InternalNode(Node):
     def __init__(self):
         super().__init__(is_leaf=False)
-        self.child_node_ids = []
+        self.child_node_ids = array('i')
 
-    def pack(self, key_packer, null_id: int) -> bytes:
+    def pack(self, keys_packer, null_id: int) -> bytearray:
         parent_id = self.parent_node_id if self.parent_node_id is not None else null_id
-        
-        data = bytearray()
-        data.extend(struct.pack('?', False))
-        data.extend(struct.pack('i', len(self.keys)))
-        data.extend(struct.pack('i', self.node_id))
-        data.extend(struct.pack('i', parent_id))
-        
-        for key in self.keys:
-            data.extend(key_packer(key))
-        
-        for child_id in self.child_node_ids:
-            data.extend(struct.pack('i', child_id))
-        
-        return bytes(data)
+
+        keys = keys_packer(self.keys)
+        data = bytearray(NODE_HEADER_STRUCT.size + len(keys))
+        NODE_HEADER_STRUCT.pack_into(data, 0, 0, len(self.keys), self.node_id, parent_id)
+        data[NODE_HEADER_STRUCT.size:] = keys
+        data += self.child_node_ids.tobytes()
+
+        return data
 
     @staticmethod
     def unpack(data: bytes, offset: int, num_keys: int, node_id: int, parent_id: Optional[int],
-               key_unpacker, key_storage_size: int, normalize_key: bool) -> 'InternalNode':
+               keys_struct: struct.Struct, normalize_key: bool) -> 'InternalNode':
         internal = InternalNode()
         internal.node_id = node_id
         internal.parent_node_id = parent_id
 
-        internal.keys = []
-        internal.child_node_ids = []
-
-        for i in range(num_keys):
-            key_bytes = data[offset:offset+key_storage_size]
-            key = key_unpacker(key_bytes)
-            
-            if normalize_key:
-                key = key.decode('utf-8').rstrip('\x00')
-            
-            internal.keys.append(key)
-            offset += key_storage_size
+        values = keys_struct.unpack_from(data, offset)
 
-        child_count = num_keys + 1
-        child_format = f'{child_count}i'
-        children = struct.unpack(child_format, data[offset:offset+(child_count*4)])
-        internal.child_node_ids = list(children)
+        if normalize_key:
+            internal.keys = [key.rstrip(b'\x00').decode('utf-8') for key in values]
+        else:
+            internal.keys = list(values)
+        children_offset = offset + keys_struct.size
+        internal.child_node_ids.frombytes(data[children_offset:children_offset + (num_keys + 1) * 4])
 
         return internal
 
@@ -142,6 +284,10 @@ class BPlusTreeClusteredIndex:
     METADATA_NODE_ID = 0
     FIRST_DATA_NODE_ID = 1
     NULL_NODE_ID = -1
+    NODE_CACHE_SIZE = 1024
+    READAHEAD_NODES = 64
+    GROW_CHUNK_NODES = 64
+    SYNC_ON_COMMIT = False
 
     def __init__(self, order: int, key_column: str, file_path: str, record_class, table=None):
         self.key_column = key_column
@@ -151,9 +297,16 @@ class BPlusTreeClusteredIndex:
         self.min_keys = (order + 1) // 2 - 1
         self.file_path = file_path
         self.data_file = file_path + ".dat"
+        self.internal_file = file_path + ".internal"
         self.table = table
         self.performance = PerformanceTracker()
-        self._file_handle = None
+        self._fd = None
+        self._mm = None
+        self._internal_fd = None
+        self._internal_mm = None
+        self._node_cache: "OrderedDict[int, Node]" = OrderedDict()
+        self._dirty_nodes: Dict[int, Node] = {}
+        self._unsynced: Dict[bool, tuple] = {}
 
         if table is not None:
             dummy_record = table.record
@@ -168,10 +321,16 @@ class BPlusTreeClusteredIndex:
         
         self.key_type, self.key_size = self._get_key_type_info()
         self._calculate_node_sizes()
+        self._char_fields = tuple(name for name, field_type, _ in self.value_type_size if field_type == "CHAR")
+        self._record_decoder = self.record_class.make_decoder(self.value_type_size, self.key_column)
 
         self.root_node_id = self.FIRST_DATA_NODE_ID
         self.next_available_node_id = self.FIRST_DATA_NODE_ID + 1
+        self.next_internal_node_id = 0
+        self._reset_free_lists()
         self._metadata_dirty = False
+        self._metadata_tail_offset = None
+        self._warmed = False
 
         if not os.path.exists(self.data_file):
             self._initialize_new_tree()
@@ -180,46 +339,44 @@ class BPlusTreeClusteredIndex:
 
     def _load_record_info_from_metadata(self):
         try:
-            with open(self.data_file, 'rb') as f:
-                f.seek(0)
-                metadata_bytes = f.read(self.NODE_SIZE)
-                
-                magic = struct.unpack('4s', metadata_bytes[0:4])[0]
-                if magic != b'BPT+':
-                    raise ValueError("Invalid metadata format")
-                
-                version, root_id, next_id, order, key_col_len = struct.unpack('iiiii', metadata_bytes[4:24])
-                offset = 24
-                
-                key_col_bytes = metadata_bytes[offset:offset+key_col_len]
-                self.key_column = key_col_bytes.decode('utf-8')
-                offset += key_col_len
-                
-                record_size, num_fields = struct.unpack('ii', metadata_bytes[offset:offset+8])
-                offset += 8
-                
-                self.record_size = record_size
+            metadata_bytes = self._read_metadata_page()
+            
+            magic = struct.unpack('4s', metadata_bytes[0:4])[0]
+            if magic != b'BPT+':
+                raise ValueError("Invalid metadata format")
+            
+            version, root_id, next_id, order, key_col_len = struct.unpack('iiiii', metadata_bytes[4:24])
+            offset = 24
+            
+            key_col_bytes = metadata_bytes[offset:offset+key_col_len]
+            self.key_column = key_col_bytes.decode('utf-8')
+            offset += key_col_len
+            
+            record_size, num_fields = struct.unpack('ii', metadata_bytes[offset:offset+8])
+            offset += 8
+            
+            self.record_size = record_size
+            
+            self.value_type_size = []
+            for i in range(num_fields):
+                field_name_len = struct.unpack('i', metadata_bytes[offset:offset+4])[0]
+                offset += 4
+                field_name = metadata_bytes[offset:offset+field_name_len].decode('utf-8')
+                offset += field_name_len
                 
-                self.value_type_size = []
-                for i in range(num_fields):
-                    field_name_len = struct.unpack('i', metadata_bytes[offset:offset+4])[0]
-                    offset += 4
-                    field_name = metadata_bytes[offset:offset+field_name_len].decode('utf-8')
-                    offset += field_name_len
-                    
-                    field_type_len = struct.unpack('i', metadata_bytes[offset:offset+4])[0]
-                    offset += 4
-                    field_type = metadata_bytes[offset:offset+field_type_len].decode('utf-8')
-                    offset += field_type_len
-                    
-                    field_size = struct.unpack('i', metadata_bytes[offset:offset+4])[0]
-                    offset += 4
-                    
-                    self.value_type_size.append((field_name, field_type, field_size))
+                field_type_len = struct.unpack('i', metadata_bytes[offset:offset+4])[0]
+                offset += 4
+                field_type = metadata_bytes[offset:offset+field_type_len].decode('utf-8')
+                offset += field_type_len
                 
-                dummy = self.record_class(self.value_type_size, self.key_column)
-                self.record_format = dummy.FORMAT
+                field_size = struct.unpack('i', metadata_bytes[offset:offset+4])[0]
+                offset += 4
                 
+                self.value_type_size.append((field_name, field_type, field_size))
+            
+            dummy = self.record_class(self.value_type_size, self.key_column)
+            self.record_format = dummy.FORMAT
+            
         except Exception as e:
             raise ValueError(f"Cannot load record info from metadata: {e}")
 
@@ -230,7 +387,7 @@ class BPlusTreeClusteredIndex:
         raise ValueError(f"Key column '{self.key_column}' not found in record")
 
     def _calculate_node_sizes(self):
-        header_size = 13
+        header_size = NODE_HEADER_STRUCT.size
         
         if self.key_type == "INT":
             self.key_storage_size = 4
@@ -255,37 +412,55 @@ class BPlusTreeClusteredIndex:
         
         self.NODE_SIZE = max(self.internal_node_size, self.leaf_node_size)
         self.NODE_SIZE = ((self.NODE_SIZE + 511) // 512) * 512
-
-    def _pack_key(self, key: Any) -> bytes:
+        self.INTERNAL_NODE_SIZE = ((self.internal_node_size + 63) // 64) * 64
+        self._zero_page = memoryview(bytes(self.NODE_SIZE))
+
+        key_format = {"INT": "i", "FLOAT": "f"}.get(self.key_type, f"{self.key_storage_size}s")
+        self._leaf_slot_struct = struct.Struct(f"={key_format}{self.record_size}s")
+        self._leaf_header_struct = struct.Struct("=Biiiii")
+        self._key_struct = struct.Struct(f"={key_format}")
+        self._leaf_records_offset = self._leaf_header_struct.size + self.max_keys * self.key_storage_size
+        self._leaf_keys_structs: Dict[int, struct.Struct] = {}
+        self._keys_structs: Dict[int, struct.Struct] = {}
+        self._compile_key_codecs()
+
+    def _compile_key_codecs(self):
+        """Especializa _pack_key/_unpack_key según key_type una sola vez"""
+        pack = self._key_struct.pack
         if self.key_type == "INT":
-            return struct.pack('i', int(key))
+            self._pack_key = lambda key: pack(int(key))
         elif self.key_type == "FLOAT":
-            return struct.pack('f', float(key))
-        elif self.key_type == "CHAR":
-            if isinstance(key, bytes):
-                key_bytes = key
-            elif isinstance(key, str):
-                key_bytes = key.encode('utf-8')
-            else:
-                key_bytes = str(key).encode('utf-8')
-            
-            return key_bytes[:self.key_size].ljust(self.key_size, b'\x00')
+            self._pack_key = lambda key: pack(float(key))
         else:
-            raise ValueError(f"Unsupported key type: {self.key_type}")
+            key_size = self.key_size
 
-    def _unpack_key(self, data: bytes) -> Any:
-        if self.key_type == "INT":
-            return struct.unpack('i', data)[0]
-        elif self.key_type == "FLOAT":
-            return struct.unpack('f', data)[0]
-        elif self.key_type == "CHAR":
-            return data
+            def pack_char(key: Any) -> bytes:
+                if isinstance(key, str):
+                    key = key.encode('utf-8')
+                elif not isinstance(key, bytes):
+                    key = str(key).encode('utf-8')
+                return key[:key_size].ljust(key_size, b'\x00')
+
+            self._pack_key = pack_char
+        self._encode_search_key = self._pack_key if self.key_type == "CHAR" else None
+
+        if self.key_type == "CHAR":
+            self._unpack_key = lambda data: data
         else:
-            raise ValueError(f"Unsupported key type: {self.key_type}")
+            unpack = self._key_struct.unpack
+            self._unpack_key = lambda data: unpack(data)[0]
 
     def _initialize_new_tree(self):
-        with open(self.data_file, 'wb') as f:
-            f.write(b'\x00' * self.NODE_SIZE)
+        self.close()
+        self._node_cache.clear()
+        self._dirty_nodes.clear()
+        self._fd = os.open(self.data_file, os.O_RDWR | os.O_CREAT | os.O_TRUNC | O_CLOEXEC, 0o644)
+        os.ftruncate(self._fd, self.NODE_SIZE)
+        if os.path.exists(self.internal_file):
+            os.remove(self.internal_file)
+        self.next_internal_node_id = 0
+        self._reset_free_lists()
+        self._metadata_tail_offset = None
 
         self._persist_metadata()
 
@@ -294,110 +469,138 @@ class BPlusTreeClusteredIndex:
         root.parent_node_id = None
         root.prev_leaf_id = None
         root.next_leaf_id = None
+        root.records = LazyRecordList(decode=self._decode_record)
 
         self._write_node(self.FIRST_DATA_NODE_ID, root)
+        self._flush_dirty_nodes()
 
     def _load_tree_metadata(self):
         try:
-            with open(self.data_file, 'rb') as f:
-                f.seek(0)
-                metadata_bytes = f.read(self.NODE_SIZE)
-
-                if metadata_bytes == b'\x00' * self.NODE_SIZE:
-                    self.root_node_id = self.FIRST_DATA_NODE_ID
-                    self.next_available_node_id = self.FIRST_DATA_NODE_ID + 1
-                    return
-
-                magic = struct.unpack('4s', metadata_bytes[0:4])[0]
-                if magic != b'BPT+':
-                    self.root_node_id = self.FIRST_DATA_NODE_ID
-                    self.next_available_node_id = self.FIRST_DATA_NODE_ID + 1
-                    return
-
-                version, root_id, next_id, order = struct.unpack('iiii', metadata_bytes[4:20])
-                
-                self.root_node_id = root_id
-                self.next_available_node_id = next_id
-                
-                if not hasattr(self, 'value_type_size') or not self.value_type_size:
-                    offset = 20
-                    
-                    key_col_len = struct.unpack('i', metadata_bytes[offset:offset+4])[0]
-                    offset += 4
-                    key_col_bytes = metadata_bytes[offset:offset+key_col_len]
-                    offset += key_col_len
-                    
-                    record_size, num_fields = struct.unpack('ii', metadata_bytes[offset:offset+8])
-                    offset += 8
-                    
-                    self.record_size = record_size
-                    self.value_type_size = []
-                    
-                    for i in range(num_fields):
-                        field_name_len = struct.unpack('i', metadata_bytes[offset:offset+4])[0]
-                        offset += 4
-                        field_name = metadata_bytes[offset:offset+field_name_len].decode('utf-8')
-                        offset += field_name_len
-                        
-                        field_type_len = struct.unpack('i', metadata_bytes[offset:offset+4])[0]
-                        offset += 4
-                        field_type = metadata_bytes[offset:offset+field_type_len].decode('utf-8')
-                        offset += field_type_len
-                        
-                        field_size = struct.unpack('i', metadata_bytes[offset:offset+4])[0]
-                        offset += 4
-                        
-                        self.value_type_size.append((field_name, field_type, field_size))
-                    
-                    dummy = self.record_class(self.value_type_size, self.key_column)
-                    self.record_format = dummy.FORMAT
+            metadata_bytes = self._read_metadata_page()
 
-        except Exception as e:
-            print(f"Error loading metadata: {e}")
-            self.root_node_id = self.FIRST_DATA_NODE_ID
-            self.next_available_node_id = self.FIRST_DATA_NODE_ID + 1
+            if metadata_bytes == self._zero_page:
+                self.root_node_id = self.FIRST_DATA_NODE_ID
+                self.next_available_node_id = self.FIRST_DATA_NODE_ID + 1
+                return
 
-    def _persist_metadata(self):
-        self.performance.track_write()
+            magic = struct.unpack('4s', metadata_bytes[0:4])[0]
+            if magic != b'BPT+':
+                self.root_node_id = self.FIRST_DATA_NODE_ID
+                self.next_available_node_id = self.FIRST_DATA_NODE_ID + 1
+                return
 
-        try:
-            metadata_parts = []
+            version, root_id, next_id, order = struct.unpack('iiii', metadata_bytes[4:20])
             
-            metadata_parts.append(struct.pack('4siiii', 
-                b'BPT+',
-                1,
-                self.root_node_id,
-                self.next_available_node_id,
-                self.order
-            ))
+            self.root_node_id = root_id
+            self.next_available_node_id = next_id
             
-            key_col_bytes = self.key_column.encode('utf-8')
-            metadata_parts.append(struct.pack('i', len(key_col_bytes)))
-            metadata_parts.append(key_col_bytes)
+            offset = 20
             
-            metadata_parts.append(struct.pack('ii', self.record_size, len(self.value_type_size)))
+            key_col_len = struct.unpack('i', metadata_bytes[offset:offset+4])[0]
+            offset += 4
+            key_col_bytes = metadata_bytes[offset:offset+key_col_len]
+            offset += key_col_len
             
-            for field_name, field_type, field_size in self.value_type_size:
-                name_bytes = field_name.encode('utf-8')
-                type_bytes = field_type.encode('utf-8')
+            record_size, num_fields = struct.unpack('ii', metadata_bytes[offset:offset+8])
+            offset += 8
+            
+            fields = []
+            for i in range(num_fields):
+                field_name_len = struct.unpack('i', metadata_bytes[offset:offset+4])[0]
+                offset += 4
+                field_name = metadata_bytes[offset:offset+field_name_len].decode('utf-8')
+                offset += field_name_len
+                
+                field_type_len = struct.unpack('i', metadata_bytes[offset:offset+4])[0]
+                offset += 4
+                field_type = metadata_bytes[offset:offset+field_type_len].decode('utf-8')
+                offset += field_type_len
                 
-                metadata_parts.append(struct.pack('i', len(name_bytes)))
-                metadata_parts.append(name_bytes)
-                metadata_parts.append(struct.pack('i', len(type_bytes)))
-                metadata_parts.append(type_bytes)
-                metadata_parts.append(struct.pack('i', field_size))
+                field_size = struct.unpack('i', metadata_bytes[offset:offset+4])[0]
+                offset += 4
+                
+                fields.append((field_name, field_type, field_size))
+
+            # los árboles anteriores a los nodos internos separados no guardan este contador (queda en 0)
+            self.next_internal_node_id, leaf_free_head, internal_free_head = METADATA_TAIL_STRUCT.unpack_from(
+                metadata_bytes, offset)
+            self._free_heads = {False: leaf_free_head, True: internal_free_head}
+            self._free_lists = {}
+
+            # checksum 0: página escrita antes de que existiera, no se puede validar
+            crc_offset = offset + METADATA_TAIL_STRUCT.size
+            checksum = METADATA_CRC_STRUCT.unpack_from(metadata_bytes, crc_offset)[0]
+            if checksum and checksum != zlib.crc32(metadata_bytes[:crc_offset]):
+                raise ValueError("Metadata checksum mismatch")
             
-            metadata_bytes = b''.join(metadata_parts)
+            if not hasattr(self, 'value_type_size') or not self.value_type_size:
+                self.record_size = record_size
+                self.value_type_size = fields
+                
+                dummy = self.record_class(self.value_type_size, self.key_column)
+                self.record_format = dummy.FORMAT
 
-            if len(metadata_bytes) > self.NODE_SIZE:
-                raise ValueError(f"Metadata too large: {len(metadata_bytes)} > {self.NODE_SIZE}")
+        except Exception as e:
+            print(f"Error loading metadata: {e}")
+            self.root_node_id = self.FIRST_DATA_NODE_ID
+            self.next_available_node_id = self.FIRST_DATA_NODE_ID + 1
+
+    def _metadata_bytes(self) -> bytes:
+        metadata_parts = []
+        
+        metadata_parts.append(struct.pack('4siiii', 
+            b'BPT+',
+            1,
+            self.root_node_id,
+            self.next_available_node_id,
+            self.order
+        ))
+        
+        key_col_bytes = self.key_column.encode('utf-8')
+        metadata_parts.append(struct.pack('i', len(key_col_bytes)))
+        metadata_parts.append(key_col_bytes)
+        
+        metadata_parts.append(struct.pack('ii', self.record_size, len(self.value_type_size)))
+        
+        for field_name, field_type, field_size in self.value_type_size:
+            name_bytes = field_name.encode('utf-8')
+            type_bytes = field_type.encode('utf-8')
+            
+            metadata_parts.append(struct.pack('i', len(name_bytes)))
+            metadata_parts.append(name_bytes)
+            metadata_parts.append(struct.pack('i', len(type_bytes)))
+            metadata_parts.append(type_bytes)
+            metadata_parts.append(struct.pack('i', field_size))
 
-            padded_data = metadata_bytes + b'\x00' * (self.NODE_SIZE - len(metadata_bytes))
+        self._metadata_tail_offset = sum(map(len, metadata_parts))
+        metadata_parts.append(METADATA_TAIL_STRUCT.pack(self.next_internal_node_id,
+                                                        self._free_head(False), self._free_head(True)))
 
-            with open(self.data_file, 'r+b') as f:
-                f.seek(0)
-                f.write(padded_data)
-                f.flush()
+        metadata_bytes = b''.join(metadata_parts)
+        metadata_bytes += METADATA_CRC_STRUCT.pack(zlib.crc32(metadata_bytes))
+
+        if len(metadata_bytes) > self.NODE_SIZE:
+            raise ValueError(f"Metadata too large: {len(metadata_bytes)} > {self.NODE_SIZE}")
+
+        return metadata_bytes
+
+    def _persist_metadata(self):
+        self.performance.track_write()
+
+        try:
+            mm = self._ensure_file_open()
+            tail_offset = self._metadata_tail_offset
+            if tail_offset is None:
+                self._write_padded(mm, 0, self._metadata_bytes(), self.NODE_SIZE)
+            else:
+                # el esquema no cambia: solo se reescriben los contadores y el checksum
+                METADATA_COUNTERS_STRUCT.pack_into(mm, METADATA_COUNTERS_OFFSET,
+                                                   self.root_node_id, self.next_available_node_id)
+                METADATA_TAIL_STRUCT.pack_into(mm, tail_offset, self.next_internal_node_id,
+                                               self._free_head(False), self._free_head(True))
+                crc_offset = tail_offset + METADATA_TAIL_STRUCT.size
+                METADATA_CRC_STRUCT.pack_into(mm, crc_offset, zlib.crc32(mm[:crc_offset]))
+                self._mark_unsynced(mm, 0, crc_offset + METADATA_CRC_STRUCT.size)
 
             self._metadata_dirty = False
 
@@ -406,123 +609,443 @@ class BPlusTreeClusteredIndex:
             raise
 
     def _get_node_offset(self, node_id: int) -> int:
+        if node_id & INTERNAL_ID_FLAG:
+            return (node_id ^ INTERNAL_ID_FLAG) * self.INTERNAL_NODE_SIZE
         return node_id * self.NODE_SIZE
 
-    def _ensure_file_open(self):
-        if self._file_handle is None or self._file_handle.closed:
-            self._file_handle = open(self.data_file, 'r+b', buffering=0)
-        return self._file_handle
+    def _locate(self, node_id: int) -> tuple:
+        """Archivo mapeado, offset y tamaño de página de un nodo: los internos viven en su propio archivo"""
+        if node_id & INTERNAL_ID_FLAG:
+            return self._ensure_internal_open(), self._get_node_offset(node_id), self.INTERNAL_NODE_SIZE
+        return self._ensure_file_open(), node_id * self.NODE_SIZE, self.NODE_SIZE
+
+    def _ensure_fd(self) -> int:
+        if self._fd is None:
+            self._fd = os.open(self.data_file, os.O_RDWR | O_CLOEXEC)
+        return self._fd
+
+    def _ensure_file_open(self) -> mmap.mmap:
+        if self._mm is None:
+            self._mm = mmap.mmap(self._ensure_fd(), 0)
+        return self._mm
+
+    def _ensure_internal_open(self) -> mmap.mmap:
+        if self._internal_mm is None:
+            if self._internal_fd is None:
+                self._internal_fd = os.open(self.internal_file, os.O_RDWR | os.O_CREAT | O_CLOEXEC, 0o644)
+            if os.fstat(self._internal_fd).st_size == 0:
+                os.ftruncate(self._internal_fd, self.GROW_CHUNK_NODES * self.INTERNAL_NODE_SIZE)
+            self._internal_mm = self._map_resident(self._internal_fd)
+        return self._internal_mm
+
+    @staticmethod
+    def _map_resident(fd: int) -> mmap.mmap:
+        """Los niveles internos son pocos y se recorren en cada operación: se mapean ya cargados en memoria"""
+        if MAP_POPULATE:
+            return mmap.mmap(fd, 0, flags=mmap.MAP_SHARED | MAP_POPULATE)
+        mm = mmap.mmap(fd, 0)
+        if MADV_WILLNEED is not None:
+            try:
+                mm.madvise(MADV_WILLNEED)
+            except OSError:
+                pass
+        return mm
+
+    def _read_metadata_page(self) -> bytes:
+        """Lee la página de metadata con un solo pread, sin seek ni objeto de archivo"""
+        fd = self._ensure_fd()
+        size = getattr(self, 'NODE_SIZE', None) or min(os.fstat(fd).st_size, METADATA_PROBE_SIZE)
+        return os.pread(fd, size, 0)
+
+    def _ensure_capacity(self, required_size: int, internal: bool = False) -> mmap.mmap:
+        mm = self._ensure_internal_open() if internal else self._ensure_file_open()
+        if len(mm) < required_size:
+            page_size = self.INTERNAL_NODE_SIZE if internal else self.NODE_SIZE
+            new_size = max(required_size, len(mm) + self.GROW_CHUNK_NODES * page_size)
+            try:
+                mm.resize(new_size)
+            except OSError:
+                # madvise sobre un subrango parte el mapeo y mremap ya no puede crecer en el sitio
+                fd = self._internal_fd if internal else self._fd
+                mm.close()
+                os.ftruncate(fd, new_size)
+                mm = self._map_resident(fd) if internal else mmap.mmap(fd, 0)
+                if internal:
+                    self._internal_mm = mm
+                else:
+                    self._mm = mm
+        return mm
 
     def _read_node(self, node_id: int) -> Optional[Node]:
         if node_id is None or node_id == self.METADATA_NODE_ID:
             return None
 
+        if node_id in self._dirty_nodes:
+            self.performance.track_cache_hit()
+            return self._dirty_nodes[node_id]
+
+        cached = self._node_cache.get(node_id)
+        if cached is not None:
+            self._node_cache.move_to_end(node_id)
+            self.performance.track_cache_hit()
+            return cached
+
+        self.performance.track_cache_miss()
         self.performance.track_read()
 
         try:
-            offset = self._get_node_offset(node_id)
-
-            f = self._ensure_file_open()
-            f.seek(offset)
-            node_bytes = f.read(self.NODE_SIZE)
+            mm, offset, page_size = self._locate(node_id)
 
-            if len(node_bytes) < 13:
+            if offset + page_size > len(mm):
                 return None
 
-            if node_bytes[0] == 0 and node_bytes[1] == 0:
-                return None
+            # se decodifica directamente sobre el mmap, sin copiar la página
+            node_type, num_keys, node_id_read, parent_id = NODE_HEADER_STRUCT.unpack_from(mm, offset)
 
-            node_type = node_bytes[0] != 0
-            num_keys = struct.unpack('i', node_bytes[1:5])[0]
-            node_id_read = struct.unpack('i', node_bytes[5:9])[0]
-            parent_id = struct.unpack('i', node_bytes[9:13])[0]
+            if node_id_read == 0:
+                return None
 
             if parent_id == self.NULL_NODE_ID:
                 parent_id = None
 
-            data_offset = 13
+            data_offset = offset + NODE_HEADER_STRUCT.size
             normalize_key = self.key_type == "CHAR"
 
-            if node_type:
-                return LeafNode.unpack(
-                    node_bytes, data_offset, num_keys, node_id_read, parent_id,
-                    self._unpack_key, self.key_storage_size, self.record_size,
-                    self.record_class, self.value_type_size, self.key_column,
-                    self.NULL_NODE_ID, normalize_key
+            if node_type == LEAF_COLUMNAR:
+                node = LeafNode.unpack(
+                    mm, data_offset, num_keys, node_id_read, parent_id,
+                    self._keys_struct(num_keys), offset + self._leaf_records_offset, self.record_size,
+                    self._decode_record, self.NULL_NODE_ID, normalize_key
+                )
+            elif node_type:
+                node = LeafNode.unpack_interleaved(
+                    mm, data_offset, num_keys, node_id_read, parent_id,
+                    self._leaf_slot_struct, self._decode_record, self.NULL_NODE_ID, normalize_key
                 )
             else:
-                return InternalNode.unpack(
-                    node_bytes, data_offset, num_keys, node_id_read, parent_id,
-                    self._unpack_key, self.key_storage_size, normalize_key
+                node = InternalNode.unpack(
+                    mm, data_offset, num_keys, node_id_read, parent_id,
+                    self._keys_struct(num_keys), normalize_key
                 )
 
+            self._cache_node(node_id, node)
+            return node
+
         except Exception as e:
             print(f"Error reading node {node_id}: {e}")
             return None
 
+    def _advise(self, advice: Optional[int], node_id: int, num_nodes: int = 1):
+        mm = self._internal_mm if node_id & INTERNAL_ID_FLAG else self._mm
+        if advice is None or mm is None:
+            return
+        offset = self._get_node_offset(node_id)
+        page_size = self.INTERNAL_NODE_SIZE if node_id & INTERNAL_ID_FLAG else self.NODE_SIZE
+        start = offset - offset % mmap.PAGESIZE
+        end = min(offset + num_nodes * page_size, len(mm))
+        if end <= start:
+            return
+        try:
+            mm.madvise(advice, start, end - start)
+        except (OSError, ValueError):
+            pass
+
+    def _advise_sequential(self, node_id: int):
+        self._advise(MADV_SEQUENTIAL, node_id, self.READAHEAD_NODES)
+
+    def _advise_willneed(self, node_id: int):
+        self._advise(MADV_WILLNEED, node_id)
+
+    def _advise_willneed_many(self, node_ids):
+        """Pide al kernel todas las páginas de una vez, fusionando ids contiguos en un solo madvise"""
+        pending = sorted(node_id for node_id in node_ids
+                         if node_id not in self._node_cache and node_id not in self._dirty_nodes)
+        i = 0
+        while i < len(pending):
+            j = i
+            while j + 1 < len(pending) and pending[j + 1] == pending[j] + 1:
+                j += 1
+            self._advise(MADV_WILLNEED, pending[i], j - i + 1)
+            i = j + 1
+
+    def _leaf_view(self, node_id: int) -> Optional[LeafView]:
+        if node_id & INTERNAL_ID_FLAG:
+            return None
+        mm = self._ensure_file_open()
+        offset = self._get_node_offset(node_id)
+        if offset + self.NODE_SIZE > len(mm) or mm[offset] == 0:
+            return None
+
+        self.performance.track_read()
+        if mm[offset] == LEAF_COLUMNAR:
+            return LeafView(mm, offset, self._leaf_header_struct.size, self._key_struct, self.record_size,
+                            self.key_type == "CHAR", self._keys_struct, self._leaf_records_offset,
+                            self._encode_search_key)
+        return LeafView(mm, offset, self._leaf_header_struct.size, self._key_struct, self.record_size,
+                        self.key_type == "CHAR", self._leaf_keys_struct, encode_key=self._encode_search_key)
+
+    def _read_leaf_keys(self, node_id: int) -> List[Any]:
+        """Claves de una hoja leyendo solo su bloque de claves, sin traer ni decodificar los registros"""
+        node = self._dirty_nodes.get(node_id) or self._node_cache.get(node_id)
+        if node is not None:
+            return node.keys
+        return self._leaf_view(node_id).keys()
+
+    def _is_leaf(self, node_id: int) -> bool:
+        if node_id & INTERNAL_ID_FLAG:
+            return False
+        node = self._dirty_nodes.get(node_id) or self._node_cache.get(node_id)
+        if node is not None:
+            return node.is_leaf
+        return self._ensure_file_open()[self._get_node_offset(node_id)] != 0
+
+    def _keys_struct(self, num_keys: int) -> struct.Struct:
+        """Struct de num_keys claves contiguas (nodos internos y hojas columnares)"""
+        keys_struct = self._keys_structs.get(num_keys)
+        if keys_struct is None:
+            key_format = self._key_struct.format.lstrip("=")
+            if self.key_type == "CHAR":
+                keys_format = key_format * num_keys
+            else:
+                keys_format = f"{num_keys}{key_format}"
+            keys_struct = struct.Struct(f"={keys_format}")
+            self._keys_structs[num_keys] = keys_struct
+        return keys_struct
+
+    def _leaf_keys_struct(self, num_keys: int) -> struct.Struct:
+        keys_struct = self._leaf_keys_structs.get(num_keys)
+        if keys_struct is None:
+            key_format = self._key_struct.format.lstrip("=")
+            skip = f"{key_format}{self.record_size}x" * max(num_keys - 1, 0)
+            keys_struct = struct.Struct("=" + skip + (key_format if num_keys else ""))
+            self._leaf_keys_structs[num_keys] = keys_struct
+        return keys_struct
+
+    def _decode_record(self, record_bytes) -> Record:
+        record = self._record_decoder(record_bytes)
+
+        for field_name in self._char_fields:
+            value = getattr(record, field_name)
+            if type(value) is bytes:
+                setattr(record, field_name, value.decode('utf-8').rstrip('\x00'))
+
+        return record
+
     def _write_node(self, node_id: int, node: Node):
         if node_id == self.METADATA_NODE_ID:
             raise ValueError("Cannot write data to metadata node (node 0)")
 
+        self._node_cache.pop(node_id, None)
+        self._dirty_nodes[node_id] = node
+
+    def _flush_dirty_nodes(self):
+        if not self._dirty_nodes:
+            return
+
+        live_ids = [node_id for node_id, node in self._dirty_nodes.items() if node is not None]
+        leaf_file_ids = [node_id for node_id in live_ids if not node_id & INTERNAL_ID_FLAG]
+        internal_file_ids = [node_id for node_id in live_ids if node_id & INTERNAL_ID_FLAG]
+        if leaf_file_ids:
+            self._ensure_capacity(self._get_node_offset(max(leaf_file_ids) + 1))
+        if internal_file_ids:
+            self._ensure_capacity(self._get_node_offset(max(internal_file_ids) + 1), internal=True)
+        for node_id in sorted(self._dirty_nodes):
+            node = self._dirty_nodes[node_id]
+            if node is None:
+                self._erase_page(node_id)
+            else:
+                self._write_page(node_id, node)
+                self._cache_node(node_id, node)
+        self._dirty_nodes.clear()
+        self._flush_free_links()
+
+    def _write_page(self, node_id: int, node: Node):
         self.performance.track_write()
 
         try:
-            if isinstance(node, LeafNode):
-                node_bytes = node.pack(self._pack_key, self.record_size, self.NULL_NODE_ID)
-            else:
-                node_bytes = node.pack(self._pack_key, self.NULL_NODE_ID)
+            mm, offset, page_size = self._locate(node_id)
+            self._write_padded(mm, offset, self._pack_node(node), page_size)
 
-            padded_data = node_bytes + b'\x00' * (self.NODE_SIZE - len(node_bytes))
+        except Exception as e:
+            print(f"Error writing node {node_id}: {e}")
+            raise
 
-            offset = self._get_node_offset(node_id)
+    def _pack_node(self, node: Node) -> bytes:
+        if node.is_leaf:
+            return node.pack(self._pack_keys, self._leaf_header_struct, self._leaf_records_offset, self.NULL_NODE_ID)
+        return node.pack(self._pack_keys, self.NULL_NODE_ID)
+
+    def _pack_keys(self, keys: List[Any]) -> bytes:
+        """Empaqueta todas las claves de un nodo con un solo Struct; CHAR y claves de otro tipo van una a una"""
+        if self.key_type != "CHAR":
+            try:
+                return self._keys_struct(len(keys)).pack(*keys)
+            except struct.error:
+                pass
+        return b"".join(map(self._pack_key, keys))
+
+    def _write_padded(self, mm: mmap.mmap, offset: int, data: bytes, page_size: int):
+        end = offset + len(data)
+        mm[offset:end] = data
+        mm[end:offset + page_size] = self._zero_page[:page_size - len(data)]
+        self._mark_unsynced(mm, offset, offset + page_size)
+
+    def _mark_unsynced(self, mm: mmap.mmap, start: int, end: int):
+        """Acumula el rango escrito de cada archivo para que sync() solo haga msync de esa parte"""
+        internal = mm is self._internal_mm
+        span = self._unsynced.get(internal)
+        self._unsynced[internal] = (start, end) if span is None else (min(span[0], start), max(span[1], end))
+
+    def _set_parent_pointer(self, node_id: int, parent_id: Optional[int]):
+        """Cambia solo el padre de un nodo: si no está pendiente de escritura se parchean sus 4 bytes en el mmap"""
+        node = self._dirty_nodes.get(node_id)
+        if node is not None:
+            node.parent_node_id = parent_id
+            return
 
-            if not os.path.exists(self.data_file):
-                with open(self.data_file, 'wb') as f:
-                    f.write(b'\x00' * self.NODE_SIZE)
+        cached = self._node_cache.get(node_id)
+        if cached is not None:
+            cached.parent_node_id = parent_id
+        self._patch_node_id_field(node_id, PARENT_OFFSET, parent_id)
 
-            current_size = os.path.getsize(self.data_file)
-            required_size = (node_id + 1) * self.NODE_SIZE
+    def _set_prev_leaf(self, node_id: int, prev_id: Optional[int]):
+        node = self._dirty_nodes.get(node_id)
+        if node is not None:
+            node.prev_leaf_id = prev_id
+            return
 
-            if current_size < required_size:
-                with open(self.data_file, 'ab') as f:
-                    f.write(b'\x00' * (required_size - current_size))
+        cached = self._node_cache.get(node_id)
+        if cached is not None:
+            cached.prev_leaf_id = prev_id
+        self._patch_node_id_field(node_id, PREV_LEAF_OFFSET, prev_id)
 
-            f = self._ensure_file_open()
-            f.seek(offset)
-            f.write(padded_data)
-            f.flush()
+    def _patch_node_id_field(self, node_id: int, field_offset: int, value: Optional[int]):
+        self.performance.track_write()
+        mm, offset, _ = self._locate(node_id)
+        start = offset + field_offset
+        NODE_ID_STRUCT.pack_into(mm, start, self.NULL_NODE_ID if value is None else value)
+        self._mark_unsynced(mm, start, start + NODE_ID_STRUCT.size)
 
-        except Exception as e:
-            print(f"Error writing node {node_id}: {e}")
-            raise
+    def _cache_node(self, node_id: int, node: Node):
+        self._node_cache[node_id] = node
+        if len(self._node_cache) > self.NODE_CACHE_SIZE:
+            self._node_cache.popitem(last=False)
 
     def _mark_node_as_deleted(self, node_id: int):
         if node_id == self.METADATA_NODE_ID:
             raise ValueError("Cannot delete metadata node")
 
+        self._node_cache.pop(node_id, None)
+        self._dirty_nodes[node_id] = None
+        self._release_node_id(node_id)
+
+    def _erase_page(self, node_id: int):
         self.performance.track_write()
 
         try:
-            offset = self._get_node_offset(node_id)
-
-            if os.path.exists(self.data_file):
-                f = self._ensure_file_open()
-                f.seek(offset)
-                f.write(b'\x00' * self.NODE_SIZE)
-                f.flush()
+            mm, offset, page_size = self._locate(node_id)
+            if offset + page_size <= len(mm):
+                mm[offset:offset + page_size] = self._zero_page[:page_size]
+                self._mark_unsynced(mm, offset, offset + page_size)
         except Exception as e:
             print(f"Error deleting node {node_id}: {e}")
 
-    def _allocate_node_id(self) -> int:
+    def _allocate_node_id(self, near: Optional[int] = None) -> int:
+        free_ids = self._free_ids(False)
+        if free_ids:
+            return self._take_free_id(free_ids, near)
+
         node_id = self.next_available_node_id
         self.next_available_node_id += 1
         self._metadata_dirty = True
         return node_id
 
+    def _allocate_internal_node_id(self, near: Optional[int] = None) -> int:
+        free_ids = self._free_ids(True)
+        if free_ids:
+            return self._take_free_id(free_ids, near)
+
+        node_id = INTERNAL_ID_FLAG | self.next_internal_node_id
+        self.next_internal_node_id += 1
+        self._metadata_dirty = True
+        return node_id
+
+    def _reset_free_lists(self):
+        self._free_heads = {False: 0, True: 0}
+        self._free_lists: Dict[bool, List[int]] = {False: [], True: []}
+        self._free_links_dirty = set()
+
+    def _free_ids(self, internal: bool) -> List[int]:
+        """Páginas libres de un archivo, ordenadas; la cadena guardada en disco se recorre una sola vez"""
+        free_ids = self._free_lists.get(internal)
+        if free_ids is None:
+            free_ids = []
+            node_id = self._free_heads[internal]
+            while node_id:
+                free_ids.append(node_id)
+                mm, offset, _ = self._locate(node_id)
+                node_id = NODE_ID_STRUCT.unpack_from(mm, offset + FREE_LINK_OFFSET)[0]
+            self._free_lists[internal] = free_ids
+        return free_ids
+
+    def _free_head(self, internal: bool) -> int:
+        free_ids = self._free_lists.get(internal)
+        if free_ids is None:
+            return self._free_heads[internal]
+        return free_ids[0] if free_ids else 0
+
+    def _take_free_id(self, free_ids: List[int], near: Optional[int]) -> int:
+        """Reutiliza la página libre más cercana a near para que los nodos vecinos queden juntos en el archivo"""
+        i = 0 if near is None else bisect.bisect_left(free_ids, near)
+        if i == len(free_ids) or (i > 0 and near - free_ids[i - 1] <= free_ids[i] - near):
+            i -= 1
+        node_id = free_ids.pop(i)
+        self._touch_free_link(free_ids, i - 1)
+        return node_id
+
+    def _release_node_id(self, node_id: int):
+        free_ids = self._free_ids(bool(node_id & INTERNAL_ID_FLAG))
+        i = bisect.bisect_left(free_ids, node_id)
+        if i < len(free_ids) and free_ids[i] == node_id:
+            return
+        free_ids.insert(i, node_id)
+        self._free_links_dirty.add(node_id)
+        self._touch_free_link(free_ids, i - 1)
+
+    def _touch_free_link(self, free_ids: List[int], i: int):
+        if i >= 0:
+            self._free_links_dirty.add(free_ids[i])
+        else:
+            self._metadata_dirty = True
+
+    def _flush_free_links(self):
+        """Cada página libre guarda la siguiente de la lista en el campo del padre (su node_id queda en 0)"""
+        for node_id in self._free_links_dirty:
+            free_ids = self._free_lists[bool(node_id & INTERNAL_ID_FLAG)]
+            i = bisect.bisect_left(free_ids, node_id)
+            if i < len(free_ids) and free_ids[i] == node_id:
+                self._patch_node_id_field(node_id, FREE_LINK_OFFSET, free_ids[i + 1] if i + 1 < len(free_ids) else 0)
+        self._free_links_dirty.clear()
+
     def _flush_metadata_if_needed(self):
         if self._metadata_dirty:
             self._persist_metadata()
 
+    def _commit(self):
+        """Cierra una operación: vuelca nodos y metadata, y sincroniza una sola vez si se pide"""
+        self._flush_dirty_nodes()
+        self._flush_metadata_if_needed()
+        if self.SYNC_ON_COMMIT:
+            self.sync()
+
+    def sync(self):
+        for internal, (start, end) in self._unsynced.items():
+            mm = self._internal_mm if internal else self._mm
+            if mm is not None:
+                start -= start % mmap.ALLOCATIONGRANULARITY
+                mm.flush(start, min(end, len(mm)) - start)
+        self._unsynced.clear()
+
     def get_key_value(self, record: Record) -> Any:
         key = record.get_field_value(self.key_column)
         return self._normalize_key(key)
@@ -539,16 +1062,75 @@ class BPlusTreeClusteredIndex:
         self.performance.start_operation()
         
         key = self._normalize_key(key)
+        node_id = self.root_node_id
 
-        leaf = self._find_leaf_for_key(key)
-        pos = bisect.bisect_left(leaf.keys, key)
+        while True:
+            if node_id not in self._node_cache and node_id not in self._dirty_nodes:
+                view = self._leaf_view(node_id)
+                if view is not None:
+                    pos = view.bisect_left(key)
+                    if pos < view.num_keys and view.key_at(pos) == key:
+                        record = self._decode_record(view.record_bytes_at(pos))
+                        return self.performance.end_operation(record)
+                    return self.performance.end_operation(None)
+
+            node = self._read_node(node_id)
+            if node.is_leaf:
+                break
+            node_id = node.child_node_ids[bisect.bisect_right(node.keys, key)]
 
-        if pos < len(leaf.keys) and leaf.keys[pos] == key:
-            record = leaf.records[pos]
+        pos = bisect.bisect_left(node.keys, key)
+
+        if pos < len(node.keys) and node.keys[pos] == key:
+            record = node.records[pos]
             return self.performance.end_operation(record)
 
         return self.performance.end_operation(None)
 
+    def search_many(self, keys: List[Any]) -> OperationResult:
+        """Busca un lote de claves; se recorren ordenadas y todas las que caen en la misma hoja se resuelven con una sola bajada.
+        Devuelve los registros en el orden de keys, con None para las que no existen"""
+        self.performance.start_operation()
+
+        keys = [self._normalize_key(key) for key in keys]
+        pending = sorted(set(keys))
+        found = {}
+
+        i = 0
+        while i < len(pending):
+            node_id = self.root_node_id
+            view = node = None
+            while True:
+                if node_id not in self._node_cache and node_id not in self._dirty_nodes:
+                    view = self._leaf_view(node_id)
+                    if view is not None:
+                        break
+                node = self._read_node(node_id)
+                if node.is_leaf:
+                    break
+                node_id = node.child_node_ids[bisect.bisect_right(node.keys, pending[i])]
+
+            leaf_keys = view.keys() if view is not None else node.keys
+            # las claves hasta la última de la hoja no pueden estar en otra, aunque no aparezcan aquí
+            last_key = leaf_keys[-1] if leaf_keys else None
+            first = i
+            while i < len(pending) and (i == first or (last_key is not None and pending[i] <= last_key)):
+                key = pending[i]
+                pos = bisect.bisect_left(leaf_keys, key)
+                if pos < len(leaf_keys) and leaf_keys[pos] == key:
+                    found[key] = self._decode_record(view.record_bytes_at(pos)) if view is not None else node.records[pos]
+                i += 1
+
+        records = []
+        for key in keys:
+            record = found.get(key)
+            if record is not None:
+                # una clave repetida en el lote recibe otro objeto en cada posición
+                found[key] = record.copy()
+            records.append(record)
+
+        return self.performance.end_operation(records)
+
     def insert(self, record: Record) -> OperationResult:
         self.performance.start_operation()
 
@@ -556,35 +1138,155 @@ class BPlusTreeClusteredIndex:
             key = self.get_key_value(record)
             success = self._insert_into_tree(self.root_node_id, key, record)
             
-            self._flush_metadata_if_needed()
+            self._commit()
             
             return self.performance.end_operation(success)
         except ValueError as e:
+            self._commit()
             return self.performance.end_operation(False)
 
+    def insert_many(self, records: List[Record]) -> OperationResult:
+        """Inserta un lote de registros; si el árbol está vacío lo construye de abajo hacia arriba"""
+        self.performance.start_operation()
+
+        entries = {}
+        for record in records:
+            entries.setdefault(self.get_key_value(record), record)
+
+        root = self._read_node(self.root_node_id)
+        if not root.is_leaf or root.keys:
+            inserted = 0
+            for key, record in entries.items():
+                try:
+                    inserted += self._insert_into_tree(self.root_node_id, key, record)
+                except ValueError:
+                    pass
+            self._commit()
+            return self.performance.end_operation(inserted)
+
+        keys = sorted(entries)
+        level = self._bulk_build_leaves(keys, entries, root.node_id)
+        while len(level) > 1:
+            level = self._bulk_build_internal_level(level)
+
+        self.root_node_id = level[0][1].node_id
+        self._metadata_dirty = True
+        self._commit()
+
+        return self.performance.end_operation(len(keys))
+
+    @staticmethod
+    def _even_chunks(items: List, capacity: int):
+        groups = max(-(-len(items) // capacity), 1)
+        size, extra = divmod(len(items), groups)
+        start = 0
+        for i in range(groups):
+            end = start + size + (1 if i < extra else 0)
+            yield items[start:end]
+            start = end
+
+    def _bulk_build_leaves(self, keys: List[Any], entries: Dict[Any, Record], first_node_id: int) -> List[tuple]:
+        level = []
+        prev_leaf = None
+
+        for chunk in self._even_chunks(keys, self.max_keys):
+            leaf = LeafNode()
+            leaf.node_id = first_node_id if prev_leaf is None else self._allocate_node_id(prev_leaf.node_id)
+            leaf.keys = list(chunk)
+            leaf.records = LazyRecordList([entries[key] for key in chunk], self._decode_record)
+
+            if prev_leaf is not None:
+                leaf.prev_leaf_id = prev_leaf.node_id
+                prev_leaf.next_leaf_id = leaf.node_id
+
+            level.append((chunk[0], leaf))
+            prev_leaf = leaf
+
+        for _, leaf in level:
+            self._write_node(leaf.node_id, leaf)
+        return level
+
+    def _bulk_build_internal_level(self, children: List[tuple]) -> List[tuple]:
+        level = []
+
+        for chunk in self._even_chunks(children, self.max_keys + 1):
+            internal = InternalNode()
+            internal.node_id = self._allocate_internal_node_id()
+            internal.keys = [first_key for first_key, _ in chunk[1:]]
+            internal.child_node_ids = array('i', [child.node_id for _, child in chunk])
+
+            for _, child in chunk:
+                child.parent_node_id = internal.node_id
+
+            level.append((chunk[0][0], internal))
+
+        for _, internal in level:
+            self._write_node(internal.node_id, internal)
+        return level
+
     def delete(self, key: Any) -> OperationResult:
         self.performance.start_operation()
         
         key = self._normalize_key(key)
 
-        leaf = self._find_leaf_for_key(key)
-        pos = bisect.bisect_left(leaf.keys, key)
+        leaf_id, path = self._find_leaf_path(key)
+        keys = self._read_leaf_keys(leaf_id)
+        pos = bisect.bisect_left(keys, key)
 
-        if pos >= len(leaf.keys) or leaf.keys[pos] != key:
+        if pos >= len(keys) or keys[pos] != key:
             return self.performance.end_operation(False)
 
+        leaf = self._read_node(leaf_id)
         leaf.keys.pop(pos)
         leaf.records.pop(pos)
         self._write_node(leaf.node_id, leaf)
 
         if leaf.node_id != self.root_node_id and leaf.is_underflow(self.min_keys):
-            self._handle_leaf_underflow(leaf)
+            self._handle_leaf_underflow(leaf, path)
 
         self._reduce_tree_height_if_needed()
-        self._flush_metadata_if_needed()
+        self._commit()
 
         return self.performance.end_operation(True)
 
+    def delete_many(self, keys) -> OperationResult:
+        """Borra un lote de claves: las que caen en la misma hoja se quitan de una vez y la hoja se rebalancea al final"""
+        self.performance.start_operation()
+
+        pending = sorted({self._normalize_key(key) for key in keys})
+        deleted, i = 0, 0
+
+        while i < len(pending):
+            leaf_id, path = self._find_leaf_path(pending[i])
+            leaf_keys = self._read_leaf_keys(leaf_id)
+            end = bisect.bisect_right(pending, leaf_keys[-1], i) if leaf_keys else i
+            if end == i:
+                i += 1
+                continue
+
+            doomed = set(pending[i:end]).intersection(leaf_keys)
+            i = end
+            if not doomed:
+                continue
+
+            leaf = self._read_node(leaf_id)
+            keep = [key not in doomed for key in leaf.keys]
+            leaf.keys = list(compress(leaf.keys, keep))
+            leaf.records = leaf.records.compress(keep)
+            self._write_node(leaf.node_id, leaf)
+            deleted += len(doomed)
+
+            # cada préstamo aporta una sola clave: se repite hasta que la hoja se llena o se fusiona
+            while (leaf.node_id != self.root_node_id and leaf.is_underflow(self.min_keys)
+                   and self._dirty_nodes.get(leaf.node_id) is leaf):
+                self._handle_leaf_underflow(leaf, path)
+
+            self._reduce_tree_height_if_needed()
+
+        self._commit()
+
+        return self.performance.end_operation(deleted)
+
     def range_search(self, start_key: Any, end_key: Any) -> OperationResult:
         self.performance.start_operation()
         
@@ -592,11 +1294,14 @@ class BPlusTreeClusteredIndex:
         end_key = self._normalize_key(end_key)
 
         results = []
-        leaf = self._find_leaf_for_key(start_key)
+        leaf = self._find_leaf_for_range(start_key, end_key)
 
         pos = bisect.bisect_left(leaf.keys, start_key)
 
         while leaf is not None:
+            if leaf.next_leaf_id is not None:
+                self._advise_willneed(leaf.next_leaf_id)
+
             for i in range(pos, len(leaf.keys)):
                 if leaf.keys[i] > end_key:
                     return self.performance.end_operation(results)
@@ -616,13 +1321,19 @@ class BPlusTreeClusteredIndex:
         results = []
 
         current = self._read_node(self.root_node_id)
-        while isinstance(current, InternalNode):
+        while not current.is_leaf:
             if len(current.child_node_ids) > 0:
                 current = self._read_node(current.child_node_ids[0])
             else:
                 break
 
-        while current is not None and isinstance(current, LeafNode):
+        if current is not None:
+            self._advise_sequential(current.node_id)
+
+        while current is not None:
+            if current.next_leaf_id is not None:
+                self._advise_willneed(current.next_leaf_id)
+
             results.extend(current.records)
 
             if current.next_leaf_id is not None:
@@ -632,22 +1343,49 @@ class BPlusTreeClusteredIndex:
 
         return self.performance.end_operation(results)
 
-    def _find_leaf_for_key(self, key: Any) -> LeafNode:
-        current_id = self.root_node_id
-        
-        while True:
-            current = self._read_node(current_id)
-            
-            if isinstance(current, LeafNode):
-                return current
-            
+    def _find_leaf_path(self, key: Any) -> tuple:
+        """Baja hasta la hoja de key sin deserializarla; devuelve su id y la posición de hijo elegida en cada nivel"""
+        path = []
+        node_id = self.root_node_id
+
+        while not self._is_leaf(node_id):
+            current = self._read_node(node_id)
             pos = bisect.bisect_right(current.keys, key)
-            current_id = current.child_node_ids[pos]
+            self._prefetch_children(current, pos)
+            path.append(pos)
+            node_id = current.child_node_ids[pos]
+
+        return node_id, path
+
+    def _find_leaf_for_range(self, start_key: Any, end_key: Any) -> LeafNode:
+        current = self._read_node(self.root_node_id)
+        parent, lo, hi = None, 0, 0
+
+        while not current.is_leaf:
+            parent = current
+            lo = bisect.bisect_right(current.keys, start_key)
+            hi = bisect.bisect_right(current.keys, end_key)
+            if hi == lo:
+                self._prefetch_children(current, lo)
+            current = self._read_node(current.child_node_ids[lo])
+
+        if parent is not None and hi > lo:
+            self._advise_willneed_many(parent.child_node_ids[lo + 1:hi + 1])
+        return current
+
+    def _prefetch_children(self, internal: InternalNode, pos: int):
+        if self._mm is None:
+            return
+        child_ids = internal.child_node_ids
+        for i in range(max(pos - 1, 0), min(pos + 2, len(child_ids))):
+            child_id = child_ids[i]
+            if child_id not in self._node_cache and child_id not in self._dirty_nodes:
+                self._advise_willneed(child_id)
 
     def _insert_into_tree(self, node_id: int, key: Any, record: Record) -> bool:
         node = self._read_node(node_id)
 
-        if isinstance(node, LeafNode):
+        if node.is_leaf:
             return self._insert_into_leaf(node, key, record)
         else:
             return self._insert_into_internal(node, key, record)
@@ -673,7 +1411,7 @@ class BPlusTreeClusteredIndex:
 
     def _split_leaf_node(self, leaf: LeafNode):
         new_leaf = LeafNode()
-        new_leaf.node_id = self._allocate_node_id()
+        new_leaf.node_id = self._allocate_node_id(leaf.node_id)
         new_leaf.parent_node_id = leaf.parent_node_id
 
         mid = len(leaf.keys) // 2
@@ -685,9 +1423,7 @@ class BPlusTreeClusteredIndex:
         leaf.next_leaf_id = new_leaf.node_id
 
         if new_leaf.next_leaf_id is not None:
-            next_leaf = self._read_node(new_leaf.next_leaf_id)
-            next_leaf.prev_leaf_id = new_leaf.node_id
-            self._write_node(next_leaf.node_id, next_leaf)
+            self._set_prev_leaf(new_leaf.next_leaf_id, new_leaf.node_id)
 
         leaf.keys = leaf.keys[:mid]
         leaf.records = leaf.records[:mid]
@@ -700,7 +1436,7 @@ class BPlusTreeClusteredIndex:
 
     def _split_internal_node(self, internal: InternalNode):
         new_internal = InternalNode()
-        new_internal.node_id = self._allocate_node_id()
+        new_internal.node_id = self._allocate_internal_node_id(internal.node_id)
         new_internal.parent_node_id = internal.parent_node_id
 
         mid = len(internal.keys) // 2
@@ -713,9 +1449,7 @@ class BPlusTreeClusteredIndex:
         internal.child_node_ids = internal.child_node_ids[:mid + 1]
 
         for child_id in new_internal.child_node_ids:
-            child = self._read_node(child_id)
-            child.parent_node_id = new_internal.node_id
-            self._write_node(child_id, child)
+            self._set_parent_pointer(child_id, new_internal.node_id)
 
         self._write_node(internal.node_id, internal)
         self._write_node(new_internal.node_id, new_internal)
@@ -725,17 +1459,15 @@ class BPlusTreeClusteredIndex:
     def _promote_key_to_parent(self, left_child: Node, key: Any, right_child_id: int):
         if left_child.parent_node_id is None:
             new_root = InternalNode()
-            new_root.node_id = self._allocate_node_id()
+            new_root.node_id = self._allocate_internal_node_id()
             new_root.parent_node_id = None
             new_root.keys = [key]
-            new_root.child_node_ids = [left_child.node_id, right_child_id]
+            new_root.child_node_ids = array('i', [left_child.node_id, right_child_id])
 
             left_child.parent_node_id = new_root.node_id
-            right_child = self._read_node(right_child_id)
-            right_child.parent_node_id = new_root.node_id
+            self._set_parent_pointer(right_child_id, new_root.node_id)
 
             self._write_node(left_child.node_id, left_child)
-            self._write_node(right_child_id, right_child)
             self._write_node(new_root.node_id, new_root)
 
             self.root_node_id = new_root.node_id
@@ -743,16 +1475,14 @@ class BPlusTreeClusteredIndex:
         else:
             parent = self._read_node(left_child.parent_node_id)
 
-            if not isinstance(parent, InternalNode):
+            if parent is None or parent.is_leaf:
                 raise ValueError(f"Parent must be internal node, got {type(parent)}")
 
             pos = bisect.bisect_left(parent.keys, key)
             parent.keys.insert(pos, key)
             parent.child_node_ids.insert(pos + 1, right_child_id)
 
-            right_child = self._read_node(right_child_id)
-            right_child.parent_node_id = parent.node_id
-            self._write_node(right_child_id, right_child)
+            self._set_parent_pointer(right_child_id, parent.node_id)
 
             self._write_node(left_child.node_id, left_child)
             self._write_node(parent.node_id, parent)
@@ -763,49 +1493,49 @@ class BPlusTreeClusteredIndex:
     def _reduce_tree_height_if_needed(self):
         root = self._read_node(self.root_node_id)
 
-        if isinstance(root, InternalNode) and len(root.keys) == 0:
+        if not root.is_leaf and len(root.keys) == 0:
             if len(root.child_node_ids) > 0:
                 old_root_id = root.node_id
                 self.root_node_id = root.child_node_ids[0]
 
-                new_root = self._read_node(self.root_node_id)
-                new_root.parent_node_id = None
-                self._write_node(self.root_node_id, new_root)
+                self._set_parent_pointer(self.root_node_id, None)
 
                 self._metadata_dirty = True
                 self._mark_node_as_deleted(old_root_id)
 
-    def _handle_leaf_underflow(self, leaf: LeafNode):
+    @staticmethod
+    def _child_index(parent: InternalNode, child_id: int, path: Optional[List[int]]) -> int:
+        if path:
+            hint = path[-1]
+            if hint < len(parent.child_node_ids) and parent.child_node_ids[hint] == child_id:
+                return hint
+        return parent.child_node_ids.index(child_id)
+
+    def _handle_leaf_underflow(self, leaf: LeafNode, path: Optional[List[int]] = None):
         if leaf.parent_node_id is None:
             return
 
         parent = self._read_node(leaf.parent_node_id)
-        leaf_index = parent.child_node_ids.index(leaf.node_id)
-
-        if leaf_index > 0:
-            left_sibling_id = parent.child_node_ids[leaf_index - 1]
-            left_sibling = self._read_node(left_sibling_id)
-            if isinstance(left_sibling, LeafNode) and len(left_sibling.keys) > self.min_keys:
-                self._borrow_from_left_leaf(leaf, left_sibling, parent, leaf_index)
-                return
+        leaf_index = self._child_index(parent, leaf.node_id, path)
+        child_count = len(parent.child_node_ids)
+        parent_path = path[:-1] if path else None
+
+        # los hermanos están en el mismo nivel, así que son del mismo tipo: no hace falta comprobarlo
+        left_sibling = self._read_node(parent.child_node_ids[leaf_index - 1]) if leaf_index > 0 else None
+        if left_sibling is not None and len(left_sibling.keys) > self.min_keys:
+            self._borrow_from_left_leaf(leaf, left_sibling, parent, leaf_index)
+            return
 
-        if leaf_index < len(parent.child_node_ids) - 1:
-            right_sibling_id = parent.child_node_ids[leaf_index + 1]
-            right_sibling = self._read_node(right_sibling_id)
-            if isinstance(right_sibling, LeafNode) and len(right_sibling.keys) > self.min_keys:
-                self._borrow_from_right_leaf(leaf, right_sibling, parent, leaf_index)
-                return
+        right_sibling = self._read_node(parent.child_node_ids[leaf_index + 1]) if leaf_index < child_count - 1 else None
+        if right_sibling is not None and len(right_sibling.keys) > self.min_keys:
+            self._borrow_from_right_leaf(leaf, right_sibling, parent, leaf_index)
+            return
 
-        if leaf_index > 0:
-            left_sibling_id = parent.child_node_ids[leaf_index - 1]
-            left_sibling = self._read_node(left_sibling_id)
-            if isinstance(left_sibling, LeafNode):
-                self._merge_leaf_with_left(leaf, left_sibling, parent, leaf_index)
-        else:
-            right_sibling_id = parent.child_node_ids[leaf_index + 1]
-            right_sibling = self._read_node(right_sibling_id)
-            if isinstance(right_sibling, LeafNode):
-                self._merge_leaf_with_right(leaf, right_sibling, parent, leaf_index)
+        if left_sibling is not None:
+            self._merge_leaf_with_left(leaf, left_sibling, parent, leaf_index)
+        elif right_sibling is not None:
+            self._merge_leaf_with_right(leaf, right_sibling, parent, leaf_index)
+        self._handle_internal_underflow(parent, parent_path)
 
     def _borrow_from_left_leaf(self, leaf: LeafNode, left_sibling: LeafNode,
                                 parent: InternalNode, leaf_index: int):
@@ -842,9 +1572,7 @@ class BPlusTreeClusteredIndex:
 
         left_sibling.next_leaf_id = leaf.next_leaf_id
         if leaf.next_leaf_id is not None:
-            next_leaf = self._read_node(leaf.next_leaf_id)
-            next_leaf.prev_leaf_id = left_sibling.node_id
-            self._write_node(next_leaf.node_id, next_leaf)
+            self._set_prev_leaf(leaf.next_leaf_id, left_sibling.node_id)
 
         parent.child_node_ids.pop(leaf_index)
         parent.keys.pop(leaf_index - 1)
@@ -853,9 +1581,6 @@ class BPlusTreeClusteredIndex:
         self._write_node(parent.node_id, parent)
         self._mark_node_as_deleted(leaf.node_id)
 
-        if parent.node_id != self.root_node_id and parent.is_underflow(self.min_keys):
-            self._handle_internal_underflow(parent)
-
     def _merge_leaf_with_right(self, leaf: LeafNode, right_sibling: LeafNode,
                                 parent: InternalNode, leaf_index: int):
         leaf.keys.extend(right_sibling.keys)
@@ -863,9 +1588,7 @@ class BPlusTreeClusteredIndex:
 
         leaf.next_leaf_id = right_sibling.next_leaf_id
         if right_sibling.next_leaf_id is not None:
-            next_leaf = self._read_node(right_sibling.next_leaf_id)
-            next_leaf.prev_leaf_id = leaf.node_id
-            self._write_node(next_leaf.node_id, next_leaf)
+            self._set_prev_leaf(right_sibling.next_leaf_id, leaf.node_id)
 
         parent.child_node_ids.pop(leaf_index + 1)
         parent.keys.pop(leaf_index)
@@ -874,40 +1597,34 @@ class BPlusTreeClusteredIndex:
         self._write_node(parent.node_id, parent)
         self._mark_node_as_deleted(right_sibling.node_id)
 
-        if parent.node_id != self.root_node_id and parent.is_underflow(self.min_keys):
-            self._handle_internal_underflow(parent)
-
-    def _handle_internal_underflow(self, internal: InternalNode):
-        if internal.parent_node_id is None:
-            return
+    def _handle_internal_underflow(self, internal: InternalNode, path: Optional[List[int]] = None):
+        """Sube por los ancestros sin recursión: cada fusión puede dejar al padre por debajo del mínimo"""
+        while internal.node_id != self.root_node_id and internal.is_underflow(self.min_keys):
+            if internal.parent_node_id is None:
+                return
 
-        parent = self._read_node(internal.parent_node_id)
-        internal_index = parent.child_node_ids.index(internal.node_id)
+            parent = self._read_node(internal.parent_node_id)
+            internal_index = self._child_index(parent, internal.node_id, path)
+            child_count = len(parent.child_node_ids)
+            path = path[:-1] if path else None
 
-        if internal_index > 0:
-            left_sibling_id = parent.child_node_ids[internal_index - 1]
-            left_sibling = self._read_node(left_sibling_id)
-            if isinstance(left_sibling, InternalNode) and len(left_sibling.keys) > self.min_keys:
+            # los hermanos están en el mismo nivel, así que son del mismo tipo: no hace falta comprobarlo
+            left_sibling = self._read_node(parent.child_node_ids[internal_index - 1]) if internal_index > 0 else None
+            if left_sibling is not None and len(left_sibling.keys) > self.min_keys:
                 self._borrow_from_left_internal(internal, left_sibling, parent, internal_index)
                 return
 
-        if internal_index < len(parent.child_node_ids) - 1:
-            right_sibling_id = parent.child_node_ids[internal_index + 1]
-            right_sibling = self._read_node(right_sibling_id)
-            if isinstance(right_sibling, InternalNode) and len(right_sibling.keys) > self.min_keys:
+            right_sibling = (self._read_node(parent.child_node_ids[internal_index + 1])
+                             if internal_index < child_count - 1 else None)
+            if right_sibling is not None and len(right_sibling.keys) > self.min_keys:
                 self._borrow_from_right_internal(internal, right_sibling, parent, internal_index)
                 return
 
-        if internal_index > 0:
-            left_sibling_id = parent.child_node_ids[internal_index - 1]
-            left_sibling = self._read_node(left_sibling_id)
-            if isinstance(left_sibling, InternalNode):
+            if left_sibling is not None:
                 self._merge_internal_with_left(internal, left_sibling, parent, internal_index)
-        else:
-            right_sibling_id = parent.child_node_ids[internal_index + 1]
-            right_sibling = self._read_node(right_sibling_id)
-            if isinstance(right_sibling, InternalNode):
+            elif right_sibling is not None:
                 self._merge_internal_with_right(internal, right_sibling, parent, internal_index)
+            internal = parent
 
     def _borrow_from_left_internal(self, internal: InternalNode, left_sibling: InternalNode,
                                     parent: InternalNode, internal_index: int):
@@ -917,9 +1634,7 @@ class BPlusTreeClusteredIndex:
         borrowed_child_id = left_sibling.child_node_ids.pop()
         internal.child_node_ids.insert(0, borrowed_child_id)
 
-        borrowed_child = self._read_node(borrowed_child_id)
-        borrowed_child.parent_node_id = internal.node_id
-        self._write_node(borrowed_child_id, borrowed_child)
+        self._set_parent_pointer(borrowed_child_id, internal.node_id)
 
         parent.keys[internal_index - 1] = left_sibling.keys.pop()
 
@@ -935,9 +1650,7 @@ class BPlusTreeClusteredIndex:
         borrowed_child_id = right_sibling.child_node_ids.pop(0)
         internal.child_node_ids.append(borrowed_child_id)
 
-        borrowed_child = self._read_node(borrowed_child_id)
-        borrowed_child.parent_node_id = internal.node_id
-        self._write_node(borrowed_child_id, borrowed_child)
+        self._set_parent_pointer(borrowed_child_id, internal.node_id)
 
         parent.keys[internal_index] = right_sibling.keys.pop(0)
 
@@ -954,9 +1667,7 @@ class BPlusTreeClusteredIndex:
         left_sibling.child_node_ids.extend(internal.child_node_ids)
 
         for child_id in internal.child_node_ids:
-            child = self._read_node(child_id)
-            child.parent_node_id = left_sibling.node_id
-            self._write_node(child_id, child)
+            self._set_parent_pointer(child_id, left_sibling.node_id)
 
         parent.child_node_ids.pop(internal_index)
         parent.keys.pop(internal_index - 1)
@@ -965,9 +1676,6 @@ class BPlusTreeClusteredIndex:
         self._write_node(parent.node_id, parent)
         self._mark_node_as_deleted(internal.node_id)
 
-        if parent.node_id != self.root_node_id and parent.is_underflow(self.min_keys):
-            self._handle_internal_underflow(parent)
-
     def _merge_internal_with_right(self, internal: InternalNode, right_sibling: InternalNode,
                                     parent: InternalNode, internal_index: int):
         separator_key = parent.keys[internal_index]
@@ -977,9 +1685,7 @@ class BPlusTreeClusteredIndex:
         internal.child_node_ids.extend(right_sibling.child_node_ids)
 
         for child_id in right_sibling.child_node_ids:
-            child = self._read_node(child_id)
-            child.parent_node_id = internal.node_id
-            self._write_node(child_id, child)
+            self._set_parent_pointer(child_id, internal.node_id)
 
         parent.child_node_ids.pop(internal_index + 1)
         parent.keys.pop(internal_index)
@@ -988,35 +1694,118 @@ class BPlusTreeClusteredIndex:
         self._write_node(parent.node_id, parent)
         self._mark_node_as_deleted(right_sibling.node_id)
 
-        if parent.node_id != self.root_node_id and parent.is_underflow(self.min_keys):
-            self._handle_internal_underflow(parent)
+    def reorganize(self) -> OperationResult:
+        """Reescribe el archivo con los nodos en orden van Emde Boas (Lindstrom y Rajan, 2014)"""
+        self.performance.start_operation()
+        self._commit()
 
-    def warm_up(self):
-        _ = self._read_node(self.root_node_id)
-        
-        if self.key_type == "INT":
-            dummy_key = -999999
-        elif self.key_type == "FLOAT":
-            dummy_key = -999999.0
-        else:
-            dummy_key = "\x00"
-        
+        root = self._read_node(self.root_node_id)
+        height, current = 1, root
+        while not current.is_leaf:
+            current = self._read_node(current.child_node_ids[0])
+            height += 1
+
+        order = self._veb_order(root, height)
+        leaves = [node for node in order if node.is_leaf]
+        internals = [node for node in order if not node.is_leaf]
+        new_ids = {node.node_id: self.FIRST_DATA_NODE_ID + i for i, node in enumerate(leaves)}
+        new_ids.update((node.node_id, INTERNAL_ID_FLAG | i) for i, node in enumerate(internals))
+        remap = lambda node_id: None if node_id is None else new_ids[node_id]
+
+        for node in order:
+            node.node_id = new_ids[node.node_id]
+            node.parent_node_id = remap(node.parent_node_id)
+            if node.is_leaf:
+                node.prev_leaf_id = remap(node.prev_leaf_id)
+                node.next_leaf_id = remap(node.next_leaf_id)
+            else:
+                node.child_node_ids = array('i', [new_ids[child_id] for child_id in node.child_node_ids])
+
+        self.root_node_id = root.node_id
+        self.next_available_node_id = self.FIRST_DATA_NODE_ID + len(leaves)
+        self.next_internal_node_id = len(internals)
+        self._reset_free_lists()
+
+        leaf_image = bytearray(self._get_node_offset(self.next_available_node_id))
+        metadata_bytes = self._metadata_bytes()
+        leaf_image[0:len(metadata_bytes)] = metadata_bytes
+        internal_image = bytearray(self.next_internal_node_id * self.INTERNAL_NODE_SIZE)
+        for node in order:
+            self.performance.track_write()
+            node_bytes = self._pack_node(node)
+            offset = self._get_node_offset(node.node_id)
+            image = internal_image if node.node_id & INTERNAL_ID_FLAG else leaf_image
+            image[offset:offset + len(node_bytes)] = node_bytes
+
+        temp_files = [(self.data_file + ".tmp", self.data_file, leaf_image)]
+        if internal_image:
+            temp_files.append((self.internal_file + ".tmp", self.internal_file, internal_image))
+        for temp_file, _, image in temp_files:
+            self._write_file(temp_file, image)
+
+        self.close()
+        self._node_cache.clear()
+        if not internal_image and os.path.exists(self.internal_file):
+            os.remove(self.internal_file)
+        for temp_file, target_file, _ in temp_files:
+            os.replace(temp_file, target_file)
+        self._warmed = False
+        self._metadata_dirty = False
+
+        return self.performance.end_operation(len(order))
+
+    @staticmethod
+    def _write_file(path: str, image: bytearray):
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | O_CLOEXEC, 0o644)
         try:
-            leaf = self._find_leaf_for_key(dummy_key)
-            _ = bisect.bisect_left(leaf.keys, dummy_key)
-            
-            if not self._metadata_dirty:
-                pass
-        except:
-            pass
-        
+            view = memoryview(image)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _veb_order(self, node: Node, height: int) -> List[Node]:
+        if height == 1:
+            return [node]
+
+        top_height = height // 2
+        order = self._veb_order(node, top_height)
+
+        level = [node]
+        for _ in range(top_height - 1):
+            level = [self._read_node(child_id) for parent in level for child_id in parent.child_node_ids]
+
+        for parent in level:
+            for child_id in parent.child_node_ids:
+                order.extend(self._veb_order(self._read_node(child_id), height - top_height))
+        return order
+
+    def warm_up(self):
+        """Carga en la caché los niveles internos, de la raíz hacia abajo, y pide al kernel las hojas del último nivel"""
+        if not self._warmed:
+            level = [self._read_node(self.root_node_id)]
+            budget = self.NODE_CACHE_SIZE // 2
+            while not level[0].is_leaf:
+                child_ids = [child_id for node in level for child_id in node.child_node_ids]
+                if len(child_ids) > budget:
+                    break
+                self._advise_willneed_many(child_ids)
+                if self._is_leaf(child_ids[0]):
+                    break
+                budget -= len(child_ids)
+                level = [self._read_node(child_id) for child_id in child_ids]
+            self._warmed = True
+
         self.performance = PerformanceTracker()
 
     def drop_table(self):
         removed_files = []
-        if os.path.exists(self.data_file):
-            os.remove(self.data_file)
-            removed_files.append(self.data_file)
+        self.close()
+        for path in (self.data_file, self.internal_file):
+            if os.path.exists(path):
+                os.remove(path)
+                removed_files.append(path)
 
         self.root_node_id = self.FIRST_DATA_NODE_ID
         self.next_available_node_id = self.FIRST_DATA_NODE_ID + 1
@@ -1025,32 +1814,45 @@ class BPlusTreeClusteredIndex:
         self._initialize_new_tree()
         return removed_files
 
-    def get_total_nodes(self) -> int:
-        if not os.path.exists(self.data_file):
-            return 0
+    def _file_size(self, internal: bool = False) -> Optional[int]:
+        """Tamaño con fstat sobre el descriptor ya abierto (sin stat por ruta); None si el archivo no existe"""
+        fd = self._internal_fd if internal else self._fd
+        try:
+            if fd is not None:
+                return os.fstat(fd).st_size
+            return os.stat(self.internal_file if internal else self.data_file).st_size
+        except OSError:
+            return None
 
-        file_size = os.path.getsize(self.data_file)
-        return file_size // self.NODE_SIZE
+    def get_total_nodes(self) -> int:
+        file_size = self._file_size()
+        return file_size // self.NODE_SIZE if file_size is not None else 0
 
     def get_file_info(self) -> dict:
-        if not os.path.exists(self.data_file):
+        file_size = self._file_size()
+        if file_size is None:
             return {"exists": False}
 
-        file_size = os.path.getsize(self.data_file)
         total_nodes = file_size // self.NODE_SIZE
+        internal_file_size = self._file_size(internal=True) or 0
+        utilization = self.next_available_node_id / total_nodes * 100 if total_nodes > 0 else 0
 
         return {
             "exists": True,
             "file_path": self.data_file,
             "file_size_bytes": file_size,
             "file_size_kb": file_size / 1024,
+            "internal_file_path": self.internal_file,
+            "internal_file_size_bytes": internal_file_size,
+            "internal_nodes": self.next_internal_node_id,
             "node_size_bytes": self.NODE_SIZE,
+            "internal_page_size_bytes": self.INTERNAL_NODE_SIZE,
             "internal_node_size": self.internal_node_size,
             "leaf_node_size": self.leaf_node_size,
             "record_size": self.record_size,
             "total_nodes": total_nodes,
             "allocated_nodes": self.next_available_node_id,
-            "utilization_ratio": f"{(self.next_available_node_id / total_nodes * 100):.1f}%" if total_nodes > 0 else "0%"
+            "utilization_ratio": f"{utilization:.1f}%" if total_nodes > 0 else "0%"
         }
 
     def get_tree_info(self) -> dict:
@@ -1066,9 +1868,22 @@ class BPlusTreeClusteredIndex:
         }
 
     def close(self):
-        if self._file_handle is not None and not self._file_handle.closed:
-            self._file_handle.close()
-            self._file_handle = None
+        if getattr(self, '_dirty_nodes', None) and self._mm is not None:
+            self._flush_dirty_nodes()
+        if getattr(self, '_unsynced', None):
+            self.sync()
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+            self._mm = None
+        if getattr(self, '_fd', None) is not None:
+            os.close(self._fd)
+            self._fd = None
+        if getattr(self, '_internal_mm', None) is not None:
+            self._internal_mm.close()
+            self._internal_mm = None
+        if getattr(self, '_internal_fd', None) is not None:
+            os.close(self._internal_fd)
+            self._internal_fd = None
 
     def __del__(self):
         self.close()
\ No newline at end of file
@@ -1,11 +1,27 @@
-from typing import Any, List, Optional
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Dict, List, Optional
 import bisect
+import mmap
 import struct
 import os
 import unicodedata
 from ..core.record import IndexRecord
 from ..core.performance_tracker import PerformanceTracker, OperationResult
 
+NODE_HEADER_STRUCT = struct.Struct("=?iii")
+LEAF_LINKS_STRUCT = struct.Struct("=ii")
+METADATA_PREFIX_STRUCT = struct.Struct("=4siiiiiii")
+INT_STRUCT = struct.Struct("=i")
+PARENT_OFFSET = struct.calcsize("=?ii")
+FREE_LINK_OFFSET = PARENT_OFFSET
+O_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+MADV_WILLNEED = getattr(mmap, "MADV_WILLNEED", None)
+
+
+def decode_char_key(raw: bytes) -> str:
+    """Decodifica un CHAR rellenado con \\x00: quita el relleno sobre los bytes y decodifica una sola vez"""
+    return raw.rstrip(b'\x00').decode('utf-8')
 
 class Node:
     def __init__(self, is_leaf: bool = False):
@@ -24,74 +40,41 @@ class Node:
 class LeafNode(Node):
     def __init__(self):
         super().__init__(is_leaf=True)
-        self.index_records = []
+        self.primary_keys = []
         self.prev_leaf_id = None
         self.next_leaf_id = None
 
-    def pack(self, key_packer, index_record_size: int, null_id: int) -> bytes:
+    def pack(self, buf, offset: int, entries_struct: struct.Struct, entry_values, null_id: int) -> int:
+        """Escribe el nodo en buf desde offset (todas las entradas con un solo Struct) y devuelve los bytes usados"""
         parent_id = self.parent_node_id if self.parent_node_id is not None else null_id
         prev_id = self.prev_leaf_id if self.prev_leaf_id is not None else null_id
         next_id = self.next_leaf_id if self.next_leaf_id is not None else null_id
         
-        data = bytearray()
+        NODE_HEADER_STRUCT.pack_into(buf, offset, True, len(self.keys), self.node_id, parent_id)
+        LEAF_LINKS_STRUCT.pack_into(buf, offset + NODE_HEADER_STRUCT.size, prev_id, next_id)
+        cursor = NODE_HEADER_STRUCT.size + LEAF_LINKS_STRUCT.size
         
-        data.extend(struct.pack('?', True))
-        data.extend(struct.pack('i', len(self.keys)))
-        data.extend(struct.pack('i', self.node_id))
-        data.extend(struct.pack('i', parent_id))
-
-        data.extend(struct.pack('i', prev_id))
-        data.extend(struct.pack('i', next_id))
-        
-        for i in range(len(self.keys)):
-            data.extend(key_packer(self.keys[i]))
-            data.extend(self.index_records[i].pack())
-        
-        return bytes(data)
+        entries_struct.pack_into(buf, offset + cursor, *entry_values(self.keys, self.primary_keys))
+        return cursor + entries_struct.size
 
     @staticmethod
     def unpack(data: bytes, offset: int, num_keys: int, node_id: int, parent_id: Optional[int],
-               key_unpacker, key_storage_size: int, index_record_size: int, index_record_class,
-               value_type_size: List, key_column: str, null_id: int, normalize_key: bool) -> 'LeafNode':
+               entries_struct: struct.Struct, null_id: int, key_decoder) -> 'LeafNode':
+        """Las entradas se decodifican con un solo Struct en dos columnas: claves y primary keys"""
         leaf = LeafNode()
         leaf.node_id = node_id
         leaf.parent_node_id = parent_id
 
-        prev_id, next_id = struct.unpack('ii', data[offset:offset+8])
+        prev_id, next_id = LEAF_LINKS_STRUCT.unpack_from(data, offset)
         
         leaf.prev_leaf_id = None if prev_id == null_id else prev_id
         leaf.next_leaf_id = None if next_id == null_id else next_id
         
-        offset += 8
-
-        leaf.keys = []
-        leaf.index_records = []
+        offset += LEAF_LINKS_STRUCT.size
 
-        for i in range(num_keys):
-            key_bytes = data[offset:offset+key_storage_size]
-            
-            key = key_unpacker(key_bytes)
-            
-            if normalize_key:
-                key = key.decode('utf-8').rstrip('\x00')
-            
-            leaf.keys.append(key)
-            
-            offset += key_storage_size
-
-            index_record_bytes = data[offset:offset+index_record_size]
-            
-            index_record = index_record_class.unpack(index_record_bytes, value_type_size, key_column)
-            
-            for field_name, field_type, _ in value_type_size:
-                if field_type == "CHAR":
-                    value = getattr(index_record, field_name)
-                    if isinstance(value, bytes):
-                        setattr(index_record, field_name, value.decode('utf-8').rstrip('\x00'))
-            
-            leaf.index_records.append(index_record)
-            
-            offset += index_record_size
+        entries = entries_struct.unpack_from(data, offset)
+        leaf.keys = key_decoder(entries[0::2])
+        leaf.primary_keys = list(entries[1::2])
 
         return leaf
 
@@ -101,51 +84,25 @@ class InternalNode(Node):
         super().__init__(is_leaf=False)
         self.child_node_ids = []
 
-    def pack(self, key_packer, null_id: int) -> bytes:
+    def pack(self, buf, offset: int, body_struct: struct.Struct, key_encoder, null_id: int) -> int:
+        """Escribe el nodo en buf desde offset (claves e hijos con un solo Struct) y devuelve los bytes usados"""
         parent_id = self.parent_node_id if self.parent_node_id is not None else null_id
         
-        data = bytearray()
-        
-        data.extend(struct.pack('?', False))
-        data.extend(struct.pack('i', len(self.keys)))
-        data.extend(struct.pack('i', self.node_id))
-        data.extend(struct.pack('i', parent_id))
-        
-        for key in self.keys:
-            data.extend(key_packer(key))
-        
-        for child_id in self.child_node_ids:
-            data.extend(struct.pack('i', child_id))
-        
-        return bytes(data)
+        NODE_HEADER_STRUCT.pack_into(buf, offset, False, len(self.keys), self.node_id, parent_id)
+        body_struct.pack_into(buf, offset + NODE_HEADER_STRUCT.size, *key_encoder(self.keys), *self.child_node_ids)
+        return NODE_HEADER_STRUCT.size + body_struct.size
 
     @staticmethod
     def unpack(data: bytes, offset: int, num_keys: int, node_id: int, parent_id: Optional[int],
-               key_unpacker, key_storage_size: int, normalize_key: bool) -> 'InternalNode':
+               body_struct: struct.Struct, key_decoder) -> 'InternalNode':
+        """Claves e hijos salen de una sola llamada: las num_keys primeras son claves, el resto hijos"""
         internal = InternalNode()
         internal.node_id = node_id
         internal.parent_node_id = parent_id
 
-        internal.keys = []
-        internal.child_node_ids = []
-
-        for i in range(num_keys):
-            key_bytes = data[offset:offset+key_storage_size]
-            
-            key = key_unpacker(key_bytes)
-            
-            if normalize_key:
-                key = key.decode('utf-8').rstrip('\x00')
-            
-            internal.keys.append(key)
-            
-            offset += key_storage_size
-
-        child_count = num_keys + 1
-        
-        children = struct.unpack(f'{child_count}i', data[offset:offset+(child_count*4)])
-        
-        internal.child_node_ids = list(children)
+        values = body_struct.unpack_from(data, offset)
+        internal.keys = key_decoder(values[:num_keys])
+        internal.child_node_ids = list(values[num_keys:])
 
         return internal
 
@@ -153,19 +110,29 @@ class BPlusTreeUnclusteredIndex:
     METADATA_NODE_ID = 0
     FIRST_DATA_NODE_ID = 1
     NULL_NODE_ID = -1
+    NODE_CACHE_SIZE = 1024
+    GROW_CHUNK_NODES = 64
+    SYNC_ON_COMMIT = False
+    BULK_FILL_FACTOR = 0.75
 
-    def __init__(self, order: int, index_column: str, file_path: str):
+    def __init__(self, order: int, index_column: str, file_path: str, node_size_bytes: Optional[int] = None):
         self.index_column = index_column
-        self.order = order
-        self.max_keys = order - 1
-        self.min_keys = (order + 1) // 2 - 1
+        self.node_size_bytes = node_size_bytes
+        self._set_order(order)
         self.file_path = file_path + ".dat"
         self.performance = PerformanceTracker()
-        self._file_handle = None
+        self._fd = None
+        self._mm = None
+        self._node_cache: "OrderedDict[int, LeafNode]" = OrderedDict()
+        self._internal_nodes: Dict[int, InternalNode] = {}
+        self._dirty_nodes: Dict[int, Optional[Node]] = {}
+        self._unsynced: Optional[tuple] = None
 
         self.root_node_id = self.FIRST_DATA_NODE_ID
         self.next_available_node_id = self.FIRST_DATA_NODE_ID + 1
         self._metadata_dirty = False
+        self._leaf_chain_clean = False
+        self._reset_free_list()
 
         self.index_record_class = None
         self.value_type_size = None
@@ -176,6 +143,9 @@ class BPlusTreeUnclusteredIndex:
         self.NODE_SIZE = None
         self.internal_node_size = None
         self.leaf_node_size = None
+        self._keys_structs = {}
+        self._leaf_pack_structs = {}
+        self._zero_page = None
 
         if not os.path.exists(self.file_path):
             with open(self.file_path, 'wb') as f:
@@ -183,6 +153,11 @@ class BPlusTreeUnclusteredIndex:
         else:
             self._load_tree_metadata()
 
+    def _set_order(self, order: int):
+        self.order = order
+        self.max_keys = order - 1
+        self.min_keys = (order + 1) // 2 - 1
+
     def _initialize_index_record_info(self, index_record: IndexRecord):
         if self.index_record_class is None:
             self.index_record_class = IndexRecord
@@ -194,12 +169,22 @@ class BPlusTreeUnclusteredIndex:
                     self.key_type = field_type
                     self.key_size = field_size
                     break
+
+            if self.node_size_bytes:
+                self._set_order(self._order_for_page(self.node_size_bytes))
             
             self._calculate_node_sizes()
             self._persist_metadata()
 
+    def _order_for_page(self, page_size: int) -> int:
+        """Mayor orden cuyas hojas e internos caben en page_size; el orden se guarda en la metadata y fija el layout"""
+        key_storage_size = self.key_size if self.key_type == "CHAR" else 4
+        leaf_keys = (page_size - NODE_HEADER_STRUCT.size - 8) // (key_storage_size + self.index_record_size)
+        internal_keys = (page_size - NODE_HEADER_STRUCT.size - 4) // (key_storage_size + 4)
+        return max(min(leaf_keys, internal_keys), 3) + 1
+
     def _calculate_node_sizes(self):
-        header_size = 13
+        header_size = NODE_HEADER_STRUCT.size
         
         if self.key_type == "INT":
             self.key_storage_size = 4
@@ -224,42 +209,122 @@ class BPlusTreeUnclusteredIndex:
         
         self.NODE_SIZE = max(self.internal_node_size, self.leaf_node_size)
         self.NODE_SIZE = ((self.NODE_SIZE + 511) // 512) * 512
+        self._keys_structs = {}
+        self._leaf_pack_structs = {}
+        self._zero_page = memoryview(bytes(self.NODE_SIZE))
+        self._compile_key_codecs()
 
-    def _pack_key(self, key: Any) -> bytes:
+    def _keys_struct(self, num_keys: int, is_leaf: bool) -> Optional[struct.Struct]:
+        """Struct que decodifica un nodo en una sola llamada: en hojas, claves alternadas con su primary key; en internos, claves seguidas de los hijos"""
         if self.key_type == "INT":
-            return struct.pack('i', int(key))
+            key_format = "i"
         elif self.key_type == "FLOAT":
-            return struct.pack('f', float(key))
+            key_format = "f"
         elif self.key_type == "CHAR":
-            if isinstance(key, bytes):
-                key_bytes = key
-            elif isinstance(key, str):
-                key_bytes = key.encode('utf-8')
-            else:
-                key_bytes = str(key).encode('utf-8')
-            return key_bytes[:self.key_size].ljust(self.key_size, b'\x00')
+            key_format = f"{self.key_storage_size}s"
         else:
-            raise ValueError(f"Unsupported key type: {self.key_type}")
+            return None
 
-    def _unpack_key(self, data: bytes) -> Any:
+        cache_key = (num_keys, is_leaf)
+        keys_struct = self._keys_structs.get(cache_key)
+        if keys_struct is None:
+            if is_leaf:
+                # primary_key es el último campo INT del IndexRecord: se salta index_value (repite la clave)
+                keys_struct = struct.Struct("=" + f"{key_format}{self.index_record_size - 4}xi" * num_keys)
+            else:
+                keys_struct = struct.Struct("=" + key_format * num_keys + f"{num_keys + 1}i")
+            self._keys_structs[cache_key] = keys_struct
+        return keys_struct
+
+    def _leaf_pack_struct(self, num_keys: int) -> struct.Struct:
+        """Struct que escribe todas las entradas de una hoja: clave, IndexRecord (index_value, relleno, primary_key)"""
+        entries_struct = self._leaf_pack_structs.get(num_keys)
+        if entries_struct is None:
+            key_format = {"INT": "i", "FLOAT": "f"}.get(self.key_type, f"{self.key_storage_size}s")
+            value_format = {"INT": "i", "FLOAT": "f"}.get(self.key_type, f"{self.key_size}s")
+            padding = self.index_record_size - 4 - struct.calcsize(f"={value_format}")
+            entries_struct = struct.Struct("=" + f"{key_format}{value_format}{padding}xi" * num_keys)
+            self._leaf_pack_structs[num_keys] = entries_struct
+        return entries_struct
+
+    def _compile_key_codecs(self):
+        """Especializa _pack_key/_unpack_key según key_type una sola vez"""
+        key_format = {"INT": "i", "FLOAT": "f"}.get(self.key_type, f"{self.key_storage_size}s")
+        self._key_struct = struct.Struct(f"={key_format}")
+        pack = self._key_struct.pack
         if self.key_type == "INT":
-            return struct.unpack('i', data)[0]
+            self._pack_key = lambda key: pack(int(key))
         elif self.key_type == "FLOAT":
-            return struct.unpack('f', data)[0]
-        elif self.key_type == "CHAR":
-            return data
+            self._pack_key = lambda key: pack(float(key))
         else:
-            raise ValueError(f"Unsupported key type: {self.key_type}")
+            key_size = self.key_size
+
+            def pack_char(key: Any) -> bytes:
+                if isinstance(key, str):
+                    key = key.encode('utf-8')
+                elif not isinstance(key, bytes):
+                    key = str(key).encode('utf-8')
+                return key[:key_size].ljust(key_size, b'\x00')
+
+            self._pack_key = pack_char
+
+        # codificación por lotes para los Struct de nodo: el relleno y el truncado de 's' los hace struct
+        if self.key_type == "CHAR":
+            key_size = self.key_size
+
+            def encode_keys(keys: List[Any]) -> List[bytes]:
+                return [key.encode('utf-8') if isinstance(key, str)
+                        else key if isinstance(key, bytes) else str(key).encode('utf-8') for key in keys]
+
+            def leaf_values(keys: List[Any], primary_keys: List[int]) -> List[Any]:
+                # index_value sigue el formato de IndexRecord: los str se rellenan con espacios
+                index_values = [key if isinstance(key, bytes) else str(key).ljust(key_size).encode('utf-8')
+                                for key in keys]
+                return list(chain.from_iterable(zip(encode_keys(keys), index_values, primary_keys)))
+        else:
+            convert = int if self.key_type == "INT" else float
+
+            def encode_keys(keys: List[Any]) -> List[Any]:
+                return list(map(convert, keys))
+
+            def leaf_values(keys: List[Any], primary_keys: List[int]) -> List[Any]:
+                encoded = list(map(convert, keys))
+                return list(chain.from_iterable(zip(encoded, encoded, primary_keys)))
+
+        self._encode_keys = encode_keys
+        self._leaf_values = leaf_values
+
+        # la normalización también queda fija por layout: INT y FLOAT no vuelven a comparar key_type en cada operación
+        if self.key_type == "CHAR":
+            self._unpack_key = lambda data: data
+            # se decodifican todas las claves crudas del nodo en una sola comprensión, sin una llamada por clave
+            self._decode_keys = lambda raw_keys: [key.rstrip(b'\x00').decode('utf-8') for key in raw_keys]
+            self._normalize_key = self._normalize_char_key
+        else:
+            unpack = self._key_struct.unpack
+            self._unpack_key = lambda data: unpack(data)[0]
+            self._decode_keys = list
+            self._normalize_key = lambda key: key
 
     def _normalize_key(self, key: Any) -> Any:
         if self.key_type == "CHAR":
-            if isinstance(key, bytes):
-                key = key.decode('utf-8')
-            if isinstance(key, str):
-                key = key.rstrip('\x00')
+            return self._normalize_char_key(key)
+        return key
+
+    @staticmethod
+    def _normalize_char_key(key: Any) -> Any:
+        if isinstance(key, bytes):
+            return decode_char_key(key)
+        if isinstance(key, str):
+            return key.rstrip('\x00')
         return key
 
     def _initialize_new_tree(self):
+        self._node_cache.clear()
+        self._internal_nodes.clear()
+        self._dirty_nodes.clear()
+        self._reset_free_list()
+        self._release_file()
         with open(self.file_path, 'wb') as f:
             f.write(b'\x00' * 8192)
 
@@ -273,91 +338,65 @@ class BPlusTreeUnclusteredIndex:
 
     def _load_tree_metadata(self):
         try:
-            with open(self.file_path, 'rb') as f:
-                f.seek(0)
-                metadata_bytes = f.read(8192)
-
-                if len(metadata_bytes) < 24 or metadata_bytes == b'\x00' * 8192:
-                    self.root_node_id = self.FIRST_DATA_NODE_ID
-                    self.next_available_node_id = self.FIRST_DATA_NODE_ID + 1
-                    return
-
-                magic = struct.unpack('4s', metadata_bytes[0:4])[0]
-                if magic != b'BPT+':
-                    self.root_node_id = self.FIRST_DATA_NODE_ID
-                    self.next_available_node_id = self.FIRST_DATA_NODE_ID + 1
-                    return
-
-                version, root_id, next_id, order, record_size = struct.unpack('iiiii', metadata_bytes[4:24])
-
-                self.root_node_id = root_id
-                self.next_available_node_id = next_id
-                self.index_record_size = record_size
-
-                offset = 24
-                if offset + 12 > len(metadata_bytes):
-                    return
-
-                num_fields, key_type_len = struct.unpack('ii', metadata_bytes[offset:offset+8])
-                offset += 8
-
-                if key_type_len > 0:
-                    if offset + key_type_len + 4 > len(metadata_bytes):
-                        offset = 28
-                        num_fields = struct.unpack('i', metadata_bytes[24:28])[0]
-                    else:
-                        self.key_type = metadata_bytes[offset:offset+key_type_len].decode('utf-8')
-                        offset += key_type_len
-                        self.key_size, = struct.unpack('i', metadata_bytes[offset:offset+4])
-                        offset += 4
-                else:
-                    offset = 28
-                    num_fields = struct.unpack('i', metadata_bytes[24:28])[0]
-
-                self.value_type_size = []
-                for i in range(num_fields):
-                    if offset + 4 > len(metadata_bytes):
-                        return
-
-                    field_name_len, = struct.unpack('i', metadata_bytes[offset:offset+4])
-                    offset += 4
+            metadata_bytes = os.pread(self._ensure_fd(), 8192, 0)
 
-                    if offset + field_name_len > len(metadata_bytes):
-                        return
-
-                    field_name = metadata_bytes[offset:offset+field_name_len].decode('utf-8')
-                    offset += field_name_len
+            if len(metadata_bytes) < METADATA_PREFIX_STRUCT.size or metadata_bytes[:4] != b'BPT+':
+                self.root_node_id = self.FIRST_DATA_NODE_ID
+                self.next_available_node_id = self.FIRST_DATA_NODE_ID + 1
+                return
 
-                    if offset + 4 > len(metadata_bytes):
-                        return
+            # todo el prefijo fijo sale de un solo unpack; un archivo truncado cae en el except general
+            (_, version, root_id, next_id, order, record_size,
+             num_fields, key_type_len) = METADATA_PREFIX_STRUCT.unpack_from(metadata_bytes)
+
+            self.root_node_id = root_id
+            self.next_available_node_id = next_id
+            self.index_record_size = record_size
+            # el tamaño de página depende del orden con que se creó el archivo, no del que se pase al reabrir
+            if order > 2:
+                self._set_order(order)
+
+            unpack_int = INT_STRUCT.unpack_from
+            offset = METADATA_PREFIX_STRUCT.size
+            if key_type_len > 0:
+                self.key_type = metadata_bytes[offset:offset + key_type_len].decode('utf-8')
+                offset += key_type_len
+                self.key_size, = unpack_int(metadata_bytes, offset)
+                offset += 4
+            else:
+                offset = 28
 
-                    field_type_len, = struct.unpack('i', metadata_bytes[offset:offset+4])
-                    offset += 4
+            value_type_size = []
+            for _ in range(num_fields):
+                field_name_len, = unpack_int(metadata_bytes, offset)
+                offset += 4
+                field_name = metadata_bytes[offset:offset + field_name_len].decode('utf-8')
+                offset += field_name_len
 
-                    if offset + field_type_len > len(metadata_bytes):
-                        return
+                field_type_len, = unpack_int(metadata_bytes, offset)
+                offset += 4
+                field_type = metadata_bytes[offset:offset + field_type_len].decode('utf-8')
+                offset += field_type_len
 
-                    field_type = metadata_bytes[offset:offset+field_type_len].decode('utf-8')
-                    offset += field_type_len
+                field_size, = unpack_int(metadata_bytes, offset)
+                offset += 4
+                value_type_size.append((field_name, field_type, field_size))
 
-                    if offset + 4 > len(metadata_bytes):
-                        return
+            # los archivos anteriores a la lista libre tienen relleno en 0 aquí: lista vacía
+            self._free_head_id, = unpack_int(metadata_bytes, offset)
+            self._free_list = None
 
-                    field_size, = struct.unpack('i', metadata_bytes[offset:offset+4])
-                    offset += 4
-                    
-                    self.value_type_size.append((field_name, field_type, field_size))
-                
-                self.index_record_class = IndexRecord
+            self.value_type_size = value_type_size
+            self.index_record_class = IndexRecord
 
-                if self.key_type is None:
-                    for field_name, field_type, field_size in self.value_type_size:
-                        if field_name == "index_value":
-                            self.key_type = field_type
-                            self.key_size = field_size
-                            break
+            if self.key_type is None:
+                for field_name, field_type, field_size in self.value_type_size:
+                    if field_name == "index_value":
+                        self.key_type = field_type
+                        self.key_size = field_size
+                        break
 
-                self._calculate_node_sizes()
+            self._calculate_node_sizes()
 
         except Exception as e:
             print(f"Error loading metadata: {e}")
@@ -371,16 +410,11 @@ class BPlusTreeUnclusteredIndex:
         self.performance.track_write()
 
         try:
-            metadata_parts = []
-
-            metadata_parts.append(struct.pack('4siiii',
-                b'BPT+', 1, self.root_node_id, self.next_available_node_id, self.order
-            ))
-
             key_type_bytes = self.key_type.encode('utf-8') if self.key_type else b''
-            metadata_parts.append(struct.pack('iii',
+            metadata_parts = [METADATA_PREFIX_STRUCT.pack(
+                b'BPT+', 1, self.root_node_id, self.next_available_node_id, self.order,
                 self.index_record_size, len(self.value_type_size), len(key_type_bytes)
-            ))
+            )]
             if key_type_bytes:
                 metadata_parts.append(key_type_bytes)
             metadata_parts.append(struct.pack('i', self.key_size if self.key_size else 0))
@@ -395,6 +429,8 @@ class BPlusTreeUnclusteredIndex:
                 metadata_parts.append(type_bytes)
                 metadata_parts.append(struct.pack('i', field_size))
 
+            metadata_parts.append(INT_STRUCT.pack(self._free_head()))
+
             metadata_bytes = b''.join(metadata_parts)
 
             if len(metadata_bytes) > self.NODE_SIZE:
@@ -402,10 +438,9 @@ class BPlusTreeUnclusteredIndex:
 
             padded_data = metadata_bytes + b'\x00' * (self.NODE_SIZE - len(metadata_bytes))
 
-            with open(self.file_path, 'r+b') as f:
-                f.seek(0)
-                f.write(padded_data)
-                f.flush()
+            mm = self._ensure_capacity(self.NODE_SIZE)
+            mm[0:self.NODE_SIZE] = padded_data
+            self._mark_unsynced(0, self.NODE_SIZE)
 
             self._metadata_dirty = False
 
@@ -416,10 +451,40 @@ class BPlusTreeUnclusteredIndex:
     def _get_node_offset(self, node_id: int) -> int:
         return node_id * self.NODE_SIZE
 
-    def _ensure_file_open(self):
-        if self._file_handle is None or self._file_handle.closed:
-            self._file_handle = open(self.file_path, 'r+b', buffering=0)
-        return self._file_handle
+    def _ensure_fd(self) -> int:
+        if self._fd is None:
+            self._fd = os.open(self.file_path, os.O_RDWR | os.O_CREAT | O_CLOEXEC, 0o644)
+        return self._fd
+
+    def _ensure_file_open(self) -> mmap.mmap:
+        if self._mm is None:
+            fd = self._ensure_fd()
+            if os.fstat(fd).st_size == 0:
+                os.ftruncate(fd, 8192)
+            self._mm = mmap.mmap(fd, 0)
+        return self._mm
+
+    def _ensure_capacity(self, required_size: int) -> mmap.mmap:
+        """Crece el archivo por bloques de GROW_CHUNK_NODES páginas en vez de una página por nodo nuevo"""
+        mm = self._ensure_file_open()
+        if len(mm) < required_size:
+            new_size = max(required_size, len(mm) + self.GROW_CHUNK_NODES * self.NODE_SIZE)
+            try:
+                mm.resize(new_size)
+            except OSError:
+                mm.close()
+                os.ftruncate(self._fd, new_size)
+                mm = self._mm = mmap.mmap(self._fd, 0)
+        return mm
+
+    def _release_file(self):
+        self._unsynced = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
 
     def _read_node(self, node_id: int) -> Optional[Node]:
         if node_id is None or node_id == self.METADATA_NODE_ID:
@@ -428,45 +493,59 @@ class BPlusTreeUnclusteredIndex:
         if self.NODE_SIZE is None:
             return None
 
+        cached = self._internal_nodes.get(node_id)
+        if cached is not None:
+            self.performance.track_cache_hit()
+            return cached
+
+        cached = self._node_cache.get(node_id)
+        if cached is not None:
+            self._node_cache.move_to_end(node_id)
+            self.performance.track_cache_hit()
+            return cached
+
+        # un nodo pendiente de volcar pudo salir de la caché: la página en disco todavía no está al día
+        if node_id in self._dirty_nodes:
+            node = self._dirty_nodes[node_id]
+            if node is not None:
+                self._cache_node(node_id, node)
+            return node
+
+        self.performance.track_cache_miss()
         self.performance.track_read()
 
         try:
             offset = self._get_node_offset(node_id)
 
-            f = self._ensure_file_open()
-            f.seek(offset)
-            node_bytes = f.read(self.NODE_SIZE)
-
-            if len(node_bytes) < 13 or (node_bytes[0] == 0 and node_bytes[1] == 0):
+            # se decodifica directamente sobre el mmap, sin copiar la página
+            mm = self._ensure_file_open()
+            if offset + self.NODE_SIZE > len(mm):
                 return None
 
-            try:
-                node_type = struct.unpack('?', node_bytes[0:1])[0]
-                num_keys = struct.unpack('i', node_bytes[1:5])[0]
-                node_id_read = struct.unpack('i', node_bytes[5:9])[0]
-                parent_id = struct.unpack('i', node_bytes[9:13])[0]
-            except struct.error as e:
+            # una sola lectura de la cabecera decide también si la página está vacía (interna sin claves)
+            node_type, num_keys, node_id_read, parent_id = NODE_HEADER_STRUCT.unpack_from(mm, offset)
+            if not node_type and not num_keys:
                 return None
 
             if parent_id == self.NULL_NODE_ID:
                 parent_id = None
 
-            data_offset = 13
-            normalize_key = self.key_type == "CHAR"
+            data_offset = offset + NODE_HEADER_STRUCT.size
 
             if node_type:
-                return LeafNode.unpack(
-                    node_bytes, data_offset, num_keys, node_id_read, parent_id,
-                    self._unpack_key, self.key_storage_size, self.index_record_size,
-                    self.index_record_class, self.value_type_size, "index_value",
-                    self.NULL_NODE_ID, normalize_key
+                node = LeafNode.unpack(
+                    mm, data_offset, num_keys, node_id_read, parent_id,
+                    self._keys_struct(num_keys, True), self.NULL_NODE_ID, self._decode_keys
                 )
             else:
-                return InternalNode.unpack(
-                    node_bytes, data_offset, num_keys, node_id_read, parent_id,
-                    self._unpack_key, self.key_storage_size, normalize_key
+                node = InternalNode.unpack(
+                    mm, data_offset, num_keys, node_id_read, parent_id,
+                    self._keys_struct(num_keys, False), self._decode_keys
                 )
 
+            self._cache_node(node_id, node)
+            return node
+
         except Exception as e:
             print(f"Error reading node {node_id}: {e}")
             return None
@@ -478,62 +557,185 @@ class BPlusTreeUnclusteredIndex:
         if self.NODE_SIZE is None:
             return
 
-        self.performance.track_write()
+        self._dirty_nodes[node_id] = node
+        self._cache_node(node_id, node)
 
-        try:
-
-            if isinstance(node, LeafNode):
-                node_bytes = node.pack(self._pack_key, self.index_record_size, self.NULL_NODE_ID)
-            else:
-                node_bytes = node.pack(self._pack_key, self.NULL_NODE_ID)
+    def _flush_dirty_nodes(self):
+        """Vuelca en orden de página los nodos modificados por la operación; cada nodo se empaqueta una sola vez"""
+        if not self._dirty_nodes:
+            return
 
-            padded_data = node_bytes.ljust(self.NODE_SIZE, b'\x00')
+        # todo id vivo es menor que next_available_node_id: el tamaño necesario sale de ahí, sin recorrer los ids
+        mm = self._ensure_capacity(self._get_node_offset(self.next_available_node_id))
+        node_size = self.NODE_SIZE
+        zero_page = self._zero_page
 
+        dirty_ids = sorted(self._dirty_nodes)
+        for node_id in dirty_ids:
+            node = self._dirty_nodes[node_id]
             offset = self._get_node_offset(node_id)
+            self.performance.track_write()
 
-            if not os.path.exists(self.file_path):
-                with open(self.file_path, 'wb') as f:
-                    f.write(b'\x00' * self.NODE_SIZE)
-
-            current_size = os.path.getsize(self.file_path)
-            required_size = (node_id + 1) * self.NODE_SIZE
+            try:
+                if node is None:
+                    if offset + node_size <= len(mm):
+                        mm[offset:offset + node_size] = zero_page
+                    continue
 
-            if current_size < required_size:
-                with open(self.file_path, 'ab') as f:
-                    f.write(b'\x00' * (required_size - current_size))
+                # se empaqueta directo sobre el mmap: el límite evita pisar la página vecina
+                num_keys = len(node.keys)
+                if num_keys > self.max_keys:
+                    raise ValueError(f"Node {node_id} has {num_keys} keys, max is {self.max_keys}")
+                if node.is_leaf:
+                    used = node.pack(mm, offset, self._leaf_pack_struct(num_keys), self._leaf_values,
+                                     self.NULL_NODE_ID)
+                else:
+                    used = node.pack(mm, offset, self._keys_struct(num_keys, False), self._encode_keys,
+                                     self.NULL_NODE_ID)
+                mm[offset + used:offset + node_size] = zero_page[used:]
+
+            except Exception as e:
+                print(f"Error writing node {node_id}: {e}")
+                raise
+
+        self._mark_unsynced(self._get_node_offset(dirty_ids[0]), self._get_node_offset(dirty_ids[-1] + 1))
+        self._dirty_nodes.clear()
+        self._flush_free_links()
+
+    def _set_parent_pointer(self, node_id: int, parent_id: Optional[int]):
+        """Cambia solo el padre de un hijo: en memoria se marca sucio si cambió, si no se parchean sus 4 bytes en el mmap"""
+        node = self._internal_nodes.get(node_id)
+        if node is None:
+            node = self._node_cache.get(node_id)
+            if node is None:
+                node = self._dirty_nodes.get(node_id)
+        if node is not None:
+            if node.parent_node_id != parent_id:
+                node.parent_node_id = parent_id
+                self._write_node(node_id, node)
+            return
 
-            f = self._ensure_file_open()
-            f.seek(offset)
-            f.write(padded_data)
-            f.flush()
+        mm = self._ensure_file_open()
+        start = self._get_node_offset(node_id) + PARENT_OFFSET
+        if start + INT_STRUCT.size <= len(mm):
+            self.performance.track_write()
+            INT_STRUCT.pack_into(mm, start, self.NULL_NODE_ID if parent_id is None else parent_id)
+            self._mark_unsynced(start, start + INT_STRUCT.size)
+
+    def _mark_unsynced(self, start: int, end: int):
+        """Acumula el rango escrito para que sync() solo haga msync de esa parte"""
+        span = self._unsynced
+        self._unsynced = (start, end) if span is None else (min(span[0], start), max(span[1], end))
+
+    def _commit(self):
+        """Cierra una operación: vuelca nodos y metadata, y sincroniza una sola vez si se pide"""
+        self._flush_dirty_nodes()
+        self._flush_metadata_if_needed()
+        if self.SYNC_ON_COMMIT:
+            self.sync()
+
+    def sync(self):
+        if self._unsynced is not None and self._mm is not None:
+            start, end = self._unsynced
+            start -= start % mmap.ALLOCATIONGRANULARITY
+            self._mm.flush(start, min(end, len(self._mm)) - start)
+        self._unsynced = None
+
+    def _cache_node(self, node_id: int, node: Node):
+        """Los internos quedan fijados en memoria (son una fracción mínima del árbol); solo las hojas pasan por el LRU"""
+        node_cache = self._node_cache
+        if not node.is_leaf:
+            self._internal_nodes[node_id] = node
+            node_cache.pop(node_id, None)
+            return
 
-        except Exception as e:
-            print(f"Error writing node {node_id}: {e}")
-            raise
+        self._internal_nodes.pop(node_id, None)
+        node_cache[node_id] = node
+        node_cache.move_to_end(node_id)
+        if len(node_cache) > self.NODE_CACHE_SIZE:
+            node_cache.popitem(last=False)
 
     def _mark_node_as_deleted(self, node_id: int):
         if node_id == self.METADATA_NODE_ID:
             raise ValueError("Cannot delete metadata node")
 
-        self.performance.track_write()
+        self._node_cache.pop(node_id, None)
+        self._internal_nodes.pop(node_id, None)
+        self._dirty_nodes[node_id] = None
+        self._release_node_id(node_id)
 
-        try:
-            offset = self._get_node_offset(node_id)
-
-            if os.path.exists(self.file_path):
-                f = self._ensure_file_open()
-                f.seek(offset)
-                f.write(b'\x00' * self.NODE_SIZE)
-                f.flush()
-        except Exception as e:
-            print(f"Error deleting node {node_id}: {e}")
+    def _allocate_node_id(self, near: Optional[int] = None) -> int:
+        free_ids = self._free_ids()
+        if free_ids:
+            return self._take_free_id(free_ids, near)
 
-    def _allocate_node_id(self) -> int:
         node_id = self.next_available_node_id
         self.next_available_node_id += 1
         self._metadata_dirty = True
         return node_id
 
+    def _reset_free_list(self):
+        self._free_head_id = 0
+        self._free_list: Optional[List[int]] = []
+        self._free_links_dirty = set()
+
+    def _free_ids(self) -> List[int]:
+        """Páginas libres ordenadas; la cadena guardada en disco se recorre una sola vez"""
+        free_ids = self._free_list
+        if free_ids is None:
+            free_ids = []
+            mm = self._ensure_file_open()
+            node_id = self._free_head_id
+            while node_id:
+                free_ids.append(node_id)
+                node_id, = INT_STRUCT.unpack_from(mm, self._get_node_offset(node_id) + FREE_LINK_OFFSET)
+            self._free_list = free_ids
+        return free_ids
+
+    def _free_head(self) -> int:
+        if self._free_list is None:
+            return self._free_head_id
+        return self._free_list[0] if self._free_list else 0
+
+    def _take_free_id(self, free_ids: List[int], near: Optional[int]) -> int:
+        """Reutiliza la página libre más cercana a near para que los nodos vecinos queden juntos en el archivo"""
+        i = 0 if near is None else bisect.bisect_left(free_ids, near)
+        if i == len(free_ids) or (i > 0 and near - free_ids[i - 1] <= free_ids[i] - near):
+            i -= 1
+        node_id = free_ids.pop(i)
+        self._touch_free_link(free_ids, i - 1)
+        return node_id
+
+    def _release_node_id(self, node_id: int):
+        free_ids = self._free_ids()
+        i = bisect.bisect_left(free_ids, node_id)
+        if i < len(free_ids) and free_ids[i] == node_id:
+            return
+        free_ids.insert(i, node_id)
+        self._free_links_dirty.add(node_id)
+        self._touch_free_link(free_ids, i - 1)
+
+    def _touch_free_link(self, free_ids: List[int], i: int):
+        if i >= 0:
+            self._free_links_dirty.add(free_ids[i])
+        else:
+            self._metadata_dirty = True
+
+    def _flush_free_links(self):
+        """Cada página libre (ya en ceros) guarda la siguiente de la lista en el campo del padre"""
+        if not self._free_links_dirty:
+            return
+        mm = self._ensure_file_open()
+        free_ids = self._free_list
+        for node_id in self._free_links_dirty:
+            i = bisect.bisect_left(free_ids, node_id)
+            if i < len(free_ids) and free_ids[i] == node_id:
+                self.performance.track_write()
+                start = self._get_node_offset(node_id) + FREE_LINK_OFFSET
+                INT_STRUCT.pack_into(mm, start, free_ids[i + 1] if i + 1 < len(free_ids) else 0)
+                self._mark_unsynced(start, start + INT_STRUCT.size)
+        self._free_links_dirty.clear()
+
     def _flush_metadata_if_needed(self):
         if self._metadata_dirty:
             self._persist_metadata()
@@ -546,7 +748,8 @@ class BPlusTreeUnclusteredIndex:
 
         key = self._normalize_key(key)
 
-        leaf = self._find_leaf_for_key(key)
+        # con duplicados repartidos en varias hojas el descenso cae en la última: se retrocede a la primera
+        leaf = self._find_start_leaf_for_range(key)
         if leaf is None:
             return self.performance.end_operation([])
 
@@ -555,7 +758,7 @@ class BPlusTreeUnclusteredIndex:
 
         while leaf is not None:
             while pos < len(leaf.keys) and leaf.keys[pos] == key:
-                primary_keys.append(leaf.index_records[pos].primary_key)
+                primary_keys.append(leaf.primary_keys[pos])
                 pos += 1
 
             if pos >= len(leaf.keys):
@@ -585,14 +788,55 @@ class BPlusTreeUnclusteredIndex:
                 self._persist_metadata()
 
             key = self._normalize_key(index_record.index_value)
-            success = self._insert_into_tree(self.root_node_id, key, index_record)
+            success = self._insert_into_tree(key, index_record)
             
-            self._flush_metadata_if_needed()
+            self._commit()
             
             return self.performance.end_operation(success)
         except Exception as e:
             return self.performance.end_operation(False)
 
+    def insert_many(self, index_records: List[IndexRecord]) -> OperationResult:
+        """Inserta un lote de IndexRecord; si el árbol está vacío lo construye de abajo hacia arriba"""
+        self.performance.start_operation()
+
+        try:
+            if not index_records:
+                return self.performance.end_operation(0)
+
+            if self.index_record_class is None:
+                self._initialize_index_record_info(index_records[0])
+                root = LeafNode()
+                root.node_id = self.FIRST_DATA_NODE_ID
+                self._write_node(self.FIRST_DATA_NODE_ID, root)
+                self._persist_metadata()
+
+            root = self._read_node(self.root_node_id)
+            if root is None or not root.is_leaf or root.keys:
+                # ordenadas por clave normalizada, las inserciones consecutivas caen en las mismas hojas
+                entries = sorted(((self._normalize_key(index_record.index_value), index_record)
+                                  for index_record in index_records), key=lambda entry: entry[0])
+                inserted = 0
+                for key, index_record in entries:
+                    inserted += self._insert_into_tree(key, index_record)
+                self._commit()
+                return self.performance.end_operation(inserted)
+
+            # mismo orden que deja _insert_into_leaf: por clave y, entre claves iguales, por primary_key
+            entries = sorted({(self._normalize_key(index_record.index_value), index_record.primary_key)
+                              for index_record in index_records})
+            level = self._bulk_build_leaves(entries, root.node_id)
+            while len(level) > 1:
+                level = self._bulk_build_internal_level(level)
+
+            self.root_node_id = level[0][1].node_id
+            self._metadata_dirty = True
+            self._commit()
+
+            return self.performance.end_operation(len(entries))
+        except Exception as e:
+            return self.performance.end_operation(False)
+
     def delete(self, secondary_key: Any, primary_key: Any = None) -> OperationResult:
         self.performance.start_operation()
         
@@ -600,13 +844,15 @@ class BPlusTreeUnclusteredIndex:
 
         if primary_key is not None:
             result = self._delete_by_keys(secondary_key, primary_key)
-            return self.performance.end_operation(result)
         else:
             result = self._delete_all_by_secondary_key(secondary_key)
-            return self.performance.end_operation(result)
+
+        self._commit()
+        return self.performance.end_operation(result)
 
     def _delete_by_keys(self, secondary_key: Any, primary_key: Any) -> bool:
-        leaf = self._find_leaf_for_key(secondary_key)
+        # como en search: la racha de la clave puede empezar en hojas anteriores a la del descenso
+        leaf = self._find_start_leaf_for_range(secondary_key)
         if leaf is None:
             return False
 
@@ -614,16 +860,15 @@ class BPlusTreeUnclusteredIndex:
 
         while leaf is not None:
             while pos < len(leaf.keys) and leaf.keys[pos] == secondary_key:
-                if leaf.index_records[pos].primary_key == primary_key:
+                if leaf.primary_keys[pos] == primary_key:
                     leaf.keys.pop(pos)
-                    leaf.index_records.pop(pos)
+                    leaf.primary_keys.pop(pos)
                     self._write_node(leaf.node_id, leaf)
 
                     if leaf.node_id != self.root_node_id and leaf.is_underflow(self.min_keys):
                         self._handle_leaf_underflow(leaf)
 
                     self._reduce_tree_height_if_needed()
-                    self._flush_metadata_if_needed()
 
                     return True
                 pos += 1
@@ -643,52 +888,41 @@ class BPlusTreeUnclusteredIndex:
 
         return False
 
-    def _delete_all_by_secondary_key(self, secondary_key: Any) -> List[Any]:
-        leaf = self._find_leaf_for_key(secondary_key)
-        if leaf is None:
-            return []
+    def _find_first_leaf_with_key(self, key: Any) -> tuple:
+        """Primera hoja que contiene key y la posición de su primera aparición; (None, 0) si no está"""
+        leaf = self._find_start_leaf_for_range(key)
+        while leaf is not None:
+            pos = bisect.bisect_left(leaf.keys, key)
+            if pos < len(leaf.keys):
+                return (leaf, pos) if leaf.keys[pos] == key else (None, 0)
+            if leaf.next_leaf_id is None:
+                break
+            leaf = self._read_node(leaf.next_leaf_id)
+        return None, 0
 
+    def _delete_all_by_secondary_key(self, secondary_key: Any) -> List[Any]:
         deleted_pks = []
-        pos = bisect.bisect_left(leaf.keys, secondary_key)
 
-        while leaf is not None:
-            indices_to_delete = []
-
-            i = pos
-            while i < len(leaf.keys) and leaf.keys[i] == secondary_key:
-                indices_to_delete.append(i)
-                deleted_pks.append(leaf.index_records[i].primary_key)
-                i += 1
-
-            for idx in reversed(indices_to_delete):
-                leaf.keys.pop(idx)
-                leaf.index_records.pop(idx)
-            if indices_to_delete:
-                self._write_node(leaf.node_id, leaf)
+        while True:
+            # la fusión o el préstamo de una hoja en underflow rehace el encadenamiento:
+            # tras vaciar el tramo de cada hoja se vuelve a ubicar la racha desde la raíz
+            leaf, pos = self._find_first_leaf_with_key(secondary_key)
+            if leaf is None:
+                break
 
-                if leaf.node_id != self.root_node_id and leaf.is_underflow(self.min_keys):
-                    self._handle_leaf_underflow(leaf)
+            end = bisect.bisect_right(leaf.keys, secondary_key, pos)
+            deleted_pks.extend(leaf.primary_keys[pos:end])
+            del leaf.keys[pos:end]
+            del leaf.primary_keys[pos:end]
+            self._write_node(leaf.node_id, leaf)
 
-            if i >= len(leaf.keys):
-                if leaf.next_leaf_id is not None:
-                    next_leaf = self._read_node(leaf.next_leaf_id)
-                    if next_leaf is None or len(next_leaf.keys) == 0 or next_leaf.keys[0] > secondary_key:
-                        break
-                    leaf = next_leaf
-                    pos = 0
-                else:
-                    break
-            elif len(leaf.keys) > 0 and leaf.keys[0] > secondary_key:
-                break
-            else:
-                break
+            if leaf.node_id != self.root_node_id and leaf.is_underflow(self.min_keys):
+                self._handle_leaf_underflow(leaf)
 
-        if deleted_pks:
             self._reduce_tree_height_if_needed()
-            self._flush_metadata_if_needed()
 
         return deleted_pks
-
+    
     def range_search(self, start_key: Any, end_key: Any) -> OperationResult:
         self.performance.start_operation()
 
@@ -700,29 +934,20 @@ class BPlusTreeUnclusteredIndex:
 
         results = []
         leaf = self._find_start_leaf_for_range(start_key_normalized)
-        leaf_idx = 0
         if leaf is None:
             return self.performance.end_operation([])
 
         while leaf is not None:
-            found_in_leaf = 0
-            for i in range(len(leaf.keys)):
-                stored_key = leaf.keys[i]
-                stored_key_normalized = self._normalize_key(stored_key)
-                if stored_key_normalized < start_key_normalized:
-                    continue
-                if stored_key_normalized > end_key_normalized:
-                    break
-                results.append(leaf.index_records[i].primary_key)
-                found_in_leaf += 1
+            # las claves de la hoja ya están normalizadas y ordenadas: el tramo del rango sale con dos bisect
+            lo = bisect.bisect_left(leaf.keys, start_key_normalized)
+            hi = bisect.bisect_right(leaf.keys, end_key_normalized, lo)
+            results.extend(leaf.primary_keys[lo:hi])
             if leaf.next_leaf_id is not None:
                 next_leaf = self._read_node(leaf.next_leaf_id)
                 if next_leaf is None or not next_leaf.keys:
                     break
-                min_next_key = self._normalize_key(next_leaf.keys[0])
-                if min_next_key <= end_key_normalized:
+                if next_leaf.keys[0] <= end_key_normalized:
                     leaf = next_leaf
-                    leaf_idx += 1
                 else:
                     break
             else:
@@ -752,42 +977,45 @@ class BPlusTreeUnclusteredIndex:
         if self.NODE_SIZE is None:
             return None
             
+        internal_nodes = self._internal_nodes
+        bisect_right = bisect.bisect_right
         current_id = self.root_node_id
+        levels = 0
         
         while True:
-            current = self._read_node(current_id)
-            
-            if current is None:
-                return None
-            
-            if isinstance(current, LeafNode):
-                return current
+            # los internos están fijados en memoria: se recorren sin pasar por _read_node ni por el LRU;
+            # los aciertos de caché de todo el descenso se registran de una vez al llegar a la hoja
+            current = internal_nodes.get(current_id)
+            if current is not None:
+                levels += 1
+            else:
+                self.performance.track_cache_hit(levels)
+                current = self._read_node(current_id)
+                if current is None or current.is_leaf:
+                    return current
+                levels = 0
             
-            pos = bisect.bisect_right(current.keys, key)
-            current_id = current.child_node_ids[pos]
-
-    def _insert_into_tree(self, node_id: int, key: Any, index_record: IndexRecord) -> bool:
-        node = self._read_node(node_id)
+            current_id = current.child_node_ids[bisect_right(current.keys, key)]
 
-        if isinstance(node, LeafNode):
-            return self._insert_into_leaf(node, key, index_record)
-        else:
-            return self._insert_into_internal(node, key, index_record)
+    def _insert_into_tree(self, key: Any, index_record: IndexRecord) -> bool:
+        # mismo descenso que una búsqueda: los internos fijados se recorren sin recursión ni isinstance
+        leaf = self._find_leaf_for_key(key)
+        if leaf is None:
+            return False
+        return self._insert_into_leaf(leaf, key, index_record)
 
     def _insert_into_leaf(self, leaf: LeafNode, key: Any, index_record: IndexRecord) -> bool:
-        pos = 0
-        while pos < len(leaf.keys):
-            if leaf.keys[pos] > key:
+        # búsqueda binaria hasta la racha de claves iguales, que se recorre ordenada por primary_key
+        pos = bisect.bisect_left(leaf.keys, key)
+        while pos < len(leaf.keys) and leaf.keys[pos] == key:
+            if leaf.primary_keys[pos] == index_record.primary_key:
+                return False
+            elif leaf.primary_keys[pos] > index_record.primary_key:
                 break
-            elif leaf.keys[pos] == key:
-                if leaf.index_records[pos].primary_key == index_record.primary_key:
-                    return False  
-                elif leaf.index_records[pos].primary_key > index_record.primary_key:
-                    break
             pos += 1
 
         leaf.keys.insert(pos, key)
-        leaf.index_records.insert(pos, index_record)
+        leaf.primary_keys.insert(pos, index_record.primary_key)
         self._write_node(leaf.node_id, leaf)
 
         if leaf.is_full(self.max_keys):
@@ -795,14 +1023,10 @@ class BPlusTreeUnclusteredIndex:
         
         return True
 
-    def _insert_into_internal(self, internal: InternalNode, key: Any, index_record: IndexRecord) -> bool:
-        pos = bisect.bisect_right(internal.keys, key)
-        child_id = internal.child_node_ids[pos]
-        return self._insert_into_tree(child_id, key, index_record)
-
     def _split_leaf_node(self, leaf: LeafNode):
+        self._leaf_chain_clean = False
         new_leaf = LeafNode()
-        new_leaf.node_id = self._allocate_node_id()
+        new_leaf.node_id = self._allocate_node_id(leaf.node_id)
         new_leaf.parent_node_id = leaf.parent_node_id
 
         mid = len(leaf.keys) // 2
@@ -821,7 +1045,7 @@ class BPlusTreeUnclusteredIndex:
                 break
 
         new_leaf.keys = leaf.keys[mid:]
-        new_leaf.index_records = leaf.index_records[mid:]
+        new_leaf.primary_keys = leaf.primary_keys[mid:]
 
         new_leaf.next_leaf_id = leaf.next_leaf_id
         new_leaf.prev_leaf_id = leaf.node_id
@@ -833,8 +1057,8 @@ class BPlusTreeUnclusteredIndex:
                 next_leaf.prev_leaf_id = new_leaf.node_id
                 self._write_node(next_leaf.node_id, next_leaf)
 
-        leaf.keys = leaf.keys[:mid]
-        leaf.index_records = leaf.index_records[:mid]
+        del leaf.keys[mid:]
+        del leaf.primary_keys[mid:]
 
         self._write_node(leaf.node_id, leaf)
         self._write_node(new_leaf.node_id, new_leaf)
@@ -845,7 +1069,7 @@ class BPlusTreeUnclusteredIndex:
 
     def _split_internal_node(self, internal: InternalNode):
         new_internal = InternalNode()
-        new_internal.node_id = self._allocate_node_id()
+        new_internal.node_id = self._allocate_node_id(internal.node_id)
         new_internal.parent_node_id = internal.parent_node_id
 
         mid = len(internal.keys) // 2
@@ -854,40 +1078,109 @@ class BPlusTreeUnclusteredIndex:
         new_internal.keys = internal.keys[mid + 1:]
         new_internal.child_node_ids = internal.child_node_ids[mid + 1:]
 
-        internal.keys = internal.keys[:mid]
-        internal.child_node_ids = internal.child_node_ids[:mid + 1]
+        del internal.keys[mid:]
+        del internal.child_node_ids[mid + 1:]
 
+        # los hijos que se quedan ya apuntan a internal: solo se reasigna la mitad que se mueve
         for child_id in new_internal.child_node_ids:
-            child = self._read_node(child_id)
-            child.parent_node_id = new_internal.node_id
-            self._write_node(child_id, child)
-
-        for child_id in internal.child_node_ids:
-            child = self._read_node(child_id)
-            child.parent_node_id = internal.node_id
-            self._write_node(child_id, child)
+            self._set_parent_pointer(child_id, new_internal.node_id)
 
         self._write_node(internal.node_id, internal)
         self._write_node(new_internal.node_id, new_internal)
 
-
         self._promote_key_to_parent(internal, promote_key, new_internal.node_id)
 
-    def _find_rightmost_leaf_in_subtree(self, node_id: int) -> Optional[LeafNode]:
-        node = self._read_node(node_id)
+    def _bulk_leaf_bounds(self, keys: List[Any]):
+        """Cortes parejos de hoja a BULK_FILL_FACTOR de su capacidad, para que las inserciones posteriores no partan
+        cada hoja; un corte que cae dentro de una racha de claves iguales se corre a su inicio o a su final si cabe"""
+        # con max_keys claves un nodo ya se parte: max_keys - 1 es lo más que guarda en reposo
+        limit = self.max_keys - 1
+        target = max(int(self.max_keys * self.BULK_FILL_FACTOR), 1)
+        min_keys = max(self.min_keys, 1)
+        total = len(keys)
+        start = 0
+        while total - start > target:
+            # no más grupos que los que dejan min_keys en cada hoja; así ninguna queda en underflow
+            groups = min(-(-(total - start) // target), (total - start) // min_keys)
+            if groups < 2:
+                break
+            end = start + -(-(total - start) // groups)
+            if keys[end - 1] == keys[end]:
+                run_start = bisect.bisect_left(keys, keys[end], start, end)
+                run_end = bisect.bisect_right(keys, keys[end], end)
+                if run_start - start >= min_keys:
+                    end = run_start
+                elif run_end - start <= limit and total - run_end >= min_keys:
+                    end = run_end
+            yield start, end
+            start = end
+        yield start, total
+
+    def _bulk_build_leaves(self, entries: List[tuple], first_node_id: int) -> List[tuple]:
+        keys = [key for key, _ in entries]
+        level = []
+        prev_leaf = None
+
+        for start, end in self._bulk_leaf_bounds(keys):
+            leaf = LeafNode()
+            leaf.node_id = first_node_id if prev_leaf is None else self._allocate_node_id(prev_leaf.node_id)
+            leaf.keys = keys[start:end]
+            leaf.primary_keys = [primary_key for _, primary_key in entries[start:end]]
+
+            if prev_leaf is not None:
+                leaf.prev_leaf_id = prev_leaf.node_id
+                prev_leaf.next_leaf_id = leaf.node_id
+
+            level.append((leaf.keys[0], leaf))
+            prev_leaf = leaf
+
+        for _, leaf in level:
+            self._write_node(leaf.node_id, leaf)
+        self._leaf_chain_clean = True
+        return level
 
-        while isinstance(node, InternalNode):
-            node = self._read_node(node.child_node_ids[-1])
+    def _bulk_build_internal_level(self, children: List[tuple]) -> List[tuple]:
+        level = []
 
-        return node
+        # hasta max_keys hijos (max_keys - 1 claves) por interno, repartidos parejo
+        groups = -(-len(children) // self.max_keys)
+        size, extra = divmod(len(children), groups)
+        start = 0
+        for i in range(groups):
+            end = start + size + (1 if i < extra else 0)
+            chunk = children[start:end]
+            start = end
 
-    def _find_leftmost_leaf_in_subtree(self, node_id: int) -> Optional[LeafNode]:
-        node = self._read_node(node_id)
+            internal = InternalNode()
+            internal.node_id = self._allocate_node_id()
+            internal.keys = [first_key for first_key, _ in chunk[1:]]
+            internal.child_node_ids = [child.node_id for _, child in chunk]
+
+            for _, child in chunk:
+                child.parent_node_id = internal.node_id
+
+            level.append((chunk[0][0], internal))
+
+        for _, internal in level:
+            self._write_node(internal.node_id, internal)
+        return level
 
-        while isinstance(node, InternalNode):
-            node = self._read_node(node.child_node_ids[0])
+    def _find_rightmost_leaf_in_subtree(self, node_id: int) -> Optional[LeafNode]:
+        return self._find_extreme_leaf(node_id, -1)
+
+    def _find_leftmost_leaf_in_subtree(self, node_id: int) -> Optional[LeafNode]:
+        return self._find_extreme_leaf(node_id, 0)
 
-        return node
+    def _find_extreme_leaf(self, node_id: int, child_slot: int) -> Optional[LeafNode]:
+        """Baja por los internos fijados usando solo sus ids de hijos; únicamente la hoja final se materializa"""
+        internal_nodes = self._internal_nodes
+        while True:
+            node = internal_nodes.get(node_id)
+            if node is None:
+                node = self._read_node(node_id)
+                if node is None or node.is_leaf:
+                    return node
+            node_id = node.child_node_ids[child_slot]
 
     def _rebuild_entire_leaf_chain(self):
         if self.NODE_SIZE is None:
@@ -895,34 +1188,36 @@ class BPlusTreeUnclusteredIndex:
 
         all_leaves = []
         self._collect_leaves_in_order(self.root_node_id, all_leaves)
-        
-        for i in range(len(all_leaves) - 1):
-            current_leaf = all_leaves[i]
-            next_leaf = all_leaves[i + 1]
-            
-            if current_leaf.keys and next_leaf.keys:
-                last_key_current = self._normalize_key(current_leaf.keys[-1])
-                first_key_next = self._normalize_key(next_leaf.keys[0])
-                
-                if last_key_current > first_key_next:
-                    all_leaves.sort(key=lambda leaf: self._normalize_key(leaf.keys[0]) if leaf.keys else "")
-                    break
 
-        for i in range(len(all_leaves)):
-            leaf = all_leaves[i]
-            leaf.prev_leaf_id = all_leaves[i - 1].node_id if i > 0 else None
-            leaf.next_leaf_id = all_leaves[i + 1].node_id if i < len(all_leaves) - 1 else None
-            self._write_node(leaf.node_id, leaf)
-        
-    def _collect_leaves_in_order(self, node_id: int, leaves_list: list):
+        # las claves de las hojas ya están normalizadas (se normalizan al insertar y al decodificar): se comparan tal cual
+        if any(current_leaf.keys and next_leaf.keys and current_leaf.keys[-1] > next_leaf.keys[0]
+               for current_leaf, next_leaf in zip(all_leaves, all_leaves[1:])):
+            # sort evalúa la clave una vez por hoja; las hojas vacías van primero sin comparar "" con claves numéricas
+            all_leaves.sort(key=lambda leaf: (True, leaf.keys[0]) if leaf.keys else (False, None))
+
+        # solo se reescriben las hojas cuyos enlaces no coinciden: en un árbol sano no se escribe nada
+        last = len(all_leaves) - 1
+        for i, leaf in enumerate(all_leaves):
+            prev_leaf_id = all_leaves[i - 1].node_id if i > 0 else None
+            next_leaf_id = all_leaves[i + 1].node_id if i < last else None
+            if leaf.prev_leaf_id != prev_leaf_id or leaf.next_leaf_id != next_leaf_id:
+                leaf.prev_leaf_id = prev_leaf_id
+                leaf.next_leaf_id = next_leaf_id
+                self._write_node(leaf.node_id, leaf)
 
-        node = self._read_node(node_id)
+        self._leaf_chain_clean = True
 
-        if isinstance(node, InternalNode):
-            for child_id in node.child_node_ids:
-                self._collect_leaves_in_order(child_id, leaves_list)
-        else:
-            leaves_list.append(node)
+    def _collect_leaves_in_order(self, node_id: int, leaves_list: list):
+        """Recorrido iterativo con pila: los internos están fijados en memoria, así que solo las hojas cuestan lecturas"""
+        pending = [node_id]
+        while pending:
+            node = self._read_node(pending.pop())
+            if node is None:
+                continue
+            if node.is_leaf:
+                leaves_list.append(node)
+            else:
+                pending.extend(reversed(node.child_node_ids))
 
     def _promote_key_to_parent(self, left_child: Node, key: Any, right_child_id: int):
         if left_child.parent_node_id is None:
@@ -933,11 +1228,9 @@ class BPlusTreeUnclusteredIndex:
             new_root.child_node_ids = [left_child.node_id, right_child_id]
 
             left_child.parent_node_id = new_root.node_id
-            right_child = self._read_node(right_child_id)
-            right_child.parent_node_id = new_root.node_id
 
             self._write_node(left_child.node_id, left_child)
-            self._write_node(right_child_id, right_child)
+            self._set_parent_pointer(right_child_id, new_root.node_id)
             self._write_node(new_root.node_id, new_root)
 
             self.root_node_id = new_root.node_id
@@ -948,41 +1241,73 @@ class BPlusTreeUnclusteredIndex:
             if not isinstance(parent, InternalNode):
                 raise ValueError(f"Parent must be internal node, got {type(parent)}")
 
-            pos = bisect.bisect_left(parent.keys, key)
+            # el nuevo hijo va justo a la derecha de left_child: con claves repetidas, un bisect por la clave
+            # promovida puede dejarlo en otro hueco y desalinear el padre de la cadena de hojas.
+            # listas de Python: insert ya es un memmove en C (array.array es más lento)
+            pos = self._child_slot(parent, left_child)
             parent.keys.insert(pos, key)
             parent.child_node_ids.insert(pos + 1, right_child_id)
 
-            right_child = self._read_node(right_child_id)
-            right_child.parent_node_id = parent.node_id
-            self._write_node(right_child_id, right_child)
-
-            self._write_node(left_child.node_id, left_child)
+            # left_child ya quedó marcado como sucio por el split que llama aquí y no cambia en esta rama
+            self._set_parent_pointer(right_child_id, parent.node_id)
             self._write_node(parent.node_id, parent)
 
             if parent.is_full(self.max_keys):
                 self._split_internal_node(parent)
 
     def _reduce_tree_height_if_needed(self):
-        root = self._read_node(self.root_node_id)
+        # una raíz solo se vacía por una fusión, que la deja escrita y fijada entre los internos:
+        # si no está ahí (hoja o interno sin tocar) no hay nada que reducir y no se lee ninguna página
+        root = self._internal_nodes.get(self.root_node_id)
 
-        if isinstance(root, InternalNode) and len(root.keys) == 0:
+        if root is not None and len(root.keys) == 0:
             if len(root.child_node_ids) > 0:
                 old_root_id = root.node_id
                 self.root_node_id = root.child_node_ids[0]
 
-                new_root = self._read_node(self.root_node_id)
-                new_root.parent_node_id = None
-                self._write_node(self.root_node_id, new_root)
+                self._set_parent_pointer(self.root_node_id, None)
 
                 self._metadata_dirty = True
                 self._mark_node_as_deleted(old_root_id)
 
+    @staticmethod
+    def _child_slot(parent: InternalNode, node: Node) -> int:
+        """Posición de node entre los hijos de parent: bisect por su primera clave y una comparación; con duplicados, búsqueda lineal"""
+        child_node_ids = parent.child_node_ids
+        if node.keys:
+            slot = bisect.bisect_right(parent.keys, node.keys[0])
+            if slot < len(child_node_ids) and child_node_ids[slot] == node.node_id:
+                return slot
+        return child_node_ids.index(node.node_id)
+
+    def _prefetch_siblings(self, parent: InternalNode, index: int):
+        """Pide al kernel las páginas de ambos hermanos antes de inspeccionar el primero; los que ya están en memoria se omiten"""
+        mm = self._mm
+        if MADV_WILLNEED is None or mm is None:
+            return
+        children = parent.child_node_ids
+        for slot in (index - 1, index + 1):
+            if not 0 <= slot < len(children):
+                continue
+            node_id = children[slot]
+            if node_id in self._internal_nodes or node_id in self._node_cache or node_id in self._dirty_nodes:
+                continue
+            offset = self._get_node_offset(node_id)
+            start = offset - offset % mmap.PAGESIZE
+            end = min(offset + self.NODE_SIZE, len(mm))
+            if end > start:
+                try:
+                    mm.madvise(MADV_WILLNEED, start, end - start)
+                except (OSError, ValueError):
+                    pass
+
     def _handle_leaf_underflow(self, leaf: LeafNode):
         if leaf.parent_node_id is None:
             return
 
         parent = self._read_node(leaf.parent_node_id)
-        leaf_index = parent.child_node_ids.index(leaf.node_id)
+        leaf_index = self._child_slot(parent, leaf)
+        self._prefetch_siblings(parent, leaf_index)
 
         if leaf_index > 0:
             left_sibling_id = parent.child_node_ids[leaf_index - 1]
@@ -1003,44 +1328,52 @@ class BPlusTreeUnclusteredIndex:
             left_sibling = self._read_node(left_sibling_id)
             if isinstance(left_sibling, LeafNode):
                 self._merge_leaf_with_left(leaf, left_sibling, parent, leaf_index)
+                self._handle_internal_underflow(parent)
         else:
             right_sibling_id = parent.child_node_ids[leaf_index + 1]
             right_sibling = self._read_node(right_sibling_id)
             if isinstance(right_sibling, LeafNode):
                 self._merge_leaf_with_right(leaf, right_sibling, parent, leaf_index)
+                self._handle_internal_underflow(parent)
 
     def _borrow_from_left_leaf(self, leaf: LeafNode, left_sibling: LeafNode,
                                 parent: InternalNode, leaf_index: int):
         borrowed_key = left_sibling.keys.pop()
-        borrowed_record = left_sibling.index_records.pop()
+        borrowed_primary_key = left_sibling.primary_keys.pop()
 
+        # insert(0, ...) en una lista ya es un memmove en C; una deque rompería los slices y el bisect de las hojas
         leaf.keys.insert(0, borrowed_key)
-        leaf.index_records.insert(0, borrowed_record)
+        leaf.primary_keys.insert(0, borrowed_primary_key)
 
-        parent.keys[leaf_index - 1] = leaf.keys[0]
+        self._set_separator(parent, leaf_index - 1, borrowed_key)
 
         self._write_node(left_sibling.node_id, left_sibling)
         self._write_node(leaf.node_id, leaf)
-        self._write_node(parent.node_id, parent)
 
     def _borrow_from_right_leaf(self, leaf: LeafNode, right_sibling: LeafNode,
                                  parent: InternalNode, leaf_index: int):
         borrowed_key = right_sibling.keys.pop(0)
-        borrowed_record = right_sibling.index_records.pop(0)
+        borrowed_primary_key = right_sibling.primary_keys.pop(0)
 
         leaf.keys.append(borrowed_key)
-        leaf.index_records.append(borrowed_record)
+        leaf.primary_keys.append(borrowed_primary_key)
 
-        parent.keys[leaf_index] = right_sibling.keys[0]
+        self._set_separator(parent, leaf_index, right_sibling.keys[0])
 
         self._write_node(right_sibling.node_id, right_sibling)
         self._write_node(leaf.node_id, leaf)
-        self._write_node(parent.node_id, parent)
+
+    def _set_separator(self, parent: InternalNode, slot: int, key: Any):
+        """Solo marca sucio al padre si el separador cambia: con claves repetidas suele quedar igual"""
+        if parent.keys[slot] != key:
+            parent.keys[slot] = key
+            self._write_node(parent.node_id, parent)
 
     def _merge_leaf_with_left(self, leaf: LeafNode, left_sibling: LeafNode,
                                parent: InternalNode, leaf_index: int):
+        self._leaf_chain_clean = False
         left_sibling.keys.extend(leaf.keys)
-        left_sibling.index_records.extend(leaf.index_records)
+        left_sibling.primary_keys.extend(leaf.primary_keys)
 
         left_sibling.next_leaf_id = leaf.next_leaf_id
         if leaf.next_leaf_id is not None:
@@ -1056,13 +1389,11 @@ class BPlusTreeUnclusteredIndex:
         self._write_node(parent.node_id, parent)
         self._mark_node_as_deleted(leaf.node_id)
 
-        if parent.node_id != self.root_node_id and parent.is_underflow(self.min_keys):
-            self._handle_internal_underflow(parent)
-
     def _merge_leaf_with_right(self, leaf: LeafNode, right_sibling: LeafNode,
                                 parent: InternalNode, leaf_index: int):
+        self._leaf_chain_clean = False
         leaf.keys.extend(right_sibling.keys)
-        leaf.index_records.extend(right_sibling.index_records)
+        leaf.primary_keys.extend(right_sibling.primary_keys)
 
         leaf.next_leaf_id = right_sibling.next_leaf_id
         if right_sibling.next_leaf_id is not None:
@@ -1078,40 +1409,48 @@ class BPlusTreeUnclusteredIndex:
         self._write_node(parent.node_id, parent)
         self._mark_node_as_deleted(right_sibling.node_id)
 
-        if parent.node_id != self.root_node_id and parent.is_underflow(self.min_keys):
-            self._handle_internal_underflow(parent)
-
     def _handle_internal_underflow(self, internal: InternalNode):
+        """Sube nivel a nivel mientras haya underflow: un bucle en lugar de recursión a través de las fusiones"""
+        while (internal is not None and internal.node_id != self.root_node_id
+               and internal.is_underflow(self.min_keys)):
+            internal = self._rebalance_internal(internal)
+
+    def _rebalance_internal(self, internal: InternalNode) -> Optional[InternalNode]:
+        """Presta o fusiona un interno con underflow; devuelve el padre si hubo fusión (puede quedar en underflow)"""
         if internal.parent_node_id is None:
-            return
+            return None
 
         parent = self._read_node(internal.parent_node_id)
-        internal_index = parent.child_node_ids.index(internal.node_id)
+        internal_index = self._child_slot(parent, internal)
+        self._prefetch_siblings(parent, internal_index)
 
         if internal_index > 0:
             left_sibling_id = parent.child_node_ids[internal_index - 1]
             left_sibling = self._read_node(left_sibling_id)
             if isinstance(left_sibling, InternalNode) and len(left_sibling.keys) > self.min_keys:
                 self._borrow_from_left_internal(internal, left_sibling, parent, internal_index)
-                return
+                return None
 
         if internal_index < len(parent.child_node_ids) - 1:
             right_sibling_id = parent.child_node_ids[internal_index + 1]
             right_sibling = self._read_node(right_sibling_id)
             if isinstance(right_sibling, InternalNode) and len(right_sibling.keys) > self.min_keys:
                 self._borrow_from_right_internal(internal, right_sibling, parent, internal_index)
-                return
+                return None
 
         if internal_index > 0:
             left_sibling_id = parent.child_node_ids[internal_index - 1]
             left_sibling = self._read_node(left_sibling_id)
             if isinstance(left_sibling, InternalNode):
                 self._merge_internal_with_left(internal, left_sibling, parent, internal_index)
+                return parent
         else:
             right_sibling_id = parent.child_node_ids[internal_index + 1]
             right_sibling = self._read_node(right_sibling_id)
             if isinstance(right_sibling, InternalNode):
                 self._merge_internal_with_right(internal, right_sibling, parent, internal_index)
+                return parent
+        return None
 
     def _borrow_from_left_internal(self, internal: InternalNode, left_sibling: InternalNode,
                                     parent: InternalNode, internal_index: int):
@@ -1121,15 +1460,12 @@ class BPlusTreeUnclusteredIndex:
         borrowed_child_id = left_sibling.child_node_ids.pop()
         internal.child_node_ids.insert(0, borrowed_child_id)
 
-        borrowed_child = self._read_node(borrowed_child_id)
-        borrowed_child.parent_node_id = internal.node_id
-        self._write_node(borrowed_child_id, borrowed_child)
+        self._set_parent_pointer(borrowed_child_id, internal.node_id)
 
-        parent.keys[internal_index - 1] = left_sibling.keys.pop()
+        self._set_separator(parent, internal_index - 1, left_sibling.keys.pop())
 
         self._write_node(left_sibling.node_id, left_sibling)
         self._write_node(internal.node_id, internal)
-        self._write_node(parent.node_id, parent)
 
     def _borrow_from_right_internal(self, internal: InternalNode, right_sibling: InternalNode,
                                      parent: InternalNode, internal_index: int):
@@ -1139,15 +1475,12 @@ class BPlusTreeUnclusteredIndex:
         borrowed_child_id = right_sibling.child_node_ids.pop(0)
         internal.child_node_ids.append(borrowed_child_id)
 
-        borrowed_child = self._read_node(borrowed_child_id)
-        borrowed_child.parent_node_id = internal.node_id
-        self._write_node(borrowed_child_id, borrowed_child)
+        self._set_parent_pointer(borrowed_child_id, internal.node_id)
 
-        parent.keys[internal_index] = right_sibling.keys.pop(0)
+        self._set_separator(parent, internal_index, right_sibling.keys.pop(0))
 
         self._write_node(right_sibling.node_id, right_sibling)
         self._write_node(internal.node_id, internal)
-        self._write_node(parent.node_id, parent)
 
     def _merge_internal_with_left(self, internal: InternalNode, left_sibling: InternalNode,
                                    parent: InternalNode, internal_index: int):
@@ -1158,9 +1491,7 @@ class BPlusTreeUnclusteredIndex:
         left_sibling.child_node_ids.extend(internal.child_node_ids)
 
         for child_id in internal.child_node_ids:
-            child = self._read_node(child_id)
-            child.parent_node_id = left_sibling.node_id
-            self._write_node(child_id, child)
+            self._set_parent_pointer(child_id, left_sibling.node_id)
 
         parent.child_node_ids.pop(internal_index)
         parent.keys.pop(internal_index - 1)
@@ -1169,9 +1500,6 @@ class BPlusTreeUnclusteredIndex:
         self._write_node(parent.node_id, parent)
         self._mark_node_as_deleted(internal.node_id)
 
-        if parent.node_id != self.root_node_id and parent.is_underflow(self.min_keys):
-            self._handle_internal_underflow(parent)
-
     def _merge_internal_with_right(self, internal: InternalNode, right_sibling: InternalNode,
                                     parent: InternalNode, internal_index: int):
         separator_key = parent.keys[internal_index]
@@ -1181,9 +1509,7 @@ class BPlusTreeUnclusteredIndex:
         internal.child_node_ids.extend(right_sibling.child_node_ids)
 
         for child_id in right_sibling.child_node_ids:
-            child = self._read_node(child_id)
-            child.parent_node_id = internal.node_id
-            self._write_node(child_id, child)
+            self._set_parent_pointer(child_id, internal.node_id)
 
         parent.child_node_ids.pop(internal_index + 1)
         parent.keys.pop(internal_index)
@@ -1192,16 +1518,19 @@ class BPlusTreeUnclusteredIndex:
         self._write_node(parent.node_id, parent)
         self._mark_node_as_deleted(right_sibling.node_id)
 
-        if parent.node_id != self.root_node_id and parent.is_underflow(self.min_keys):
-            self._handle_internal_underflow(parent)
-
     def drop_index(self):
+        self._node_cache.clear()
+        self._internal_nodes.clear()
+        self._dirty_nodes.clear()
+        self._reset_free_list()
+        self._release_file()
         if os.path.exists(self.file_path):
             os.remove(self.file_path)
             return [self.file_path]
         return []
 
     def clear(self):
+        self._release_file()
         if os.path.exists(self.file_path):
             os.remove(self.file_path)
 
@@ -1217,16 +1546,25 @@ class BPlusTreeUnclusteredIndex:
 
         self._initialize_new_tree()
 
+    def _file_size(self) -> Optional[int]:
+        """Con el mmap abierto su longitud es el tamaño del archivo; si no, un solo stat (None si no existe)"""
+        if self._mm is not None:
+            return len(self._mm)
+        try:
+            return os.stat(self.file_path).st_size
+        except FileNotFoundError:
+            return None
+
     def get_total_nodes(self) -> int:
-        if not os.path.exists(self.file_path):
+        file_size = self._file_size()
+        if file_size is None or not self.NODE_SIZE:
             return 0
-        return os.path.getsize(self.file_path) // self.NODE_SIZE if hasattr(self, 'NODE_SIZE') else 0
+        return file_size // self.NODE_SIZE
 
     def get_file_info(self) -> dict:
-        if not os.path.exists(self.file_path):
+        file_size = self._file_size()
+        if file_size is None:
             return {"exists": False}
-
-        file_size = os.path.getsize(self.file_path)
         
         if not hasattr(self, 'NODE_SIZE') or self.NODE_SIZE is None:
             return {
@@ -1277,39 +1615,28 @@ class BPlusTreeUnclusteredIndex:
         }
 
     def warm_up(self):
-        if self.NODE_SIZE is None or not os.path.exists(self.file_path):
+        if self.NODE_SIZE is None or self._file_size() is None:
             return
 
         try:
-            
-            self._rebuild_entire_leaf_chain()
-
-            _ = self._read_node(self.root_node_id)
-
-            if self.key_type == "INT":
-                dummy_key = -999999
-            elif self.key_type == "FLOAT":
-                dummy_key = -999999.0
-            else:
-                dummy_key = "\x00"
+            # la cadena de hojas solo puede romperse al partir o fusionar hojas: si no hubo ninguna, no se revisa
+            if not self._leaf_chain_clean:
+                self._rebuild_entire_leaf_chain()
+                self._flush_dirty_nodes()
 
-            try:
-                leaf = self._find_leaf_for_key(dummy_key)
-                if leaf:
-                    import bisect
-                    _ = bisect.bisect_left(leaf.keys, dummy_key)
-            except:
-                pass
-
-            from ..core.performance_tracker import PerformanceTracker
+            # basta con fijar la raíz; el resto de internos se fija en el primer descenso que los toque
+            self._read_node(self.root_node_id)
             self.performance = PerformanceTracker()
-        except:
-            pass
+        except Exception as e:
+            print(f"Error warming up index: {e}")
 
     def close(self):
-        if self._file_handle is not None and not self._file_handle.closed:
-            self._file_handle.close()
-            self._file_handle = None
+        if getattr(self, '_dirty_nodes', None):
+            self._flush_dirty_nodes()
+        if getattr(self, '_unsynced', None):
+            self.sync()
+        if getattr(self, '_fd', None) is not None:
+            self._release_file()
 
     def __del__(self):
         self.close()
@@ -154,7 +154,9 @@ class DatabaseManager:
             "feature_type": feature_type if index_type in ("MULTIMEDIA_SEQ", "MULTIMEDIA_INV") else None,
             "multimedia_directory": multimedia_directory if index_type in ("MULTIMEDIA_SEQ", "MULTIMEDIA_INV") else None,
             "multimedia_pattern": multimedia_pattern if index_type in ("MULTIMEDIA_SEQ", "MULTIMEDIA_INV") else None,
-            "is_virtual": is_virtual
+            "is_virtual": is_virtual,
+            "field_type": None if is_virtual else field_info[0],
+            "field_size": None if is_virtual else field_info[1]
         }
 
         total_reads = 0
@@ -208,23 +210,40 @@ class DatabaseManager:
 
                     field_type, field_size = field_info
                     skipped_duplicates = 0
-                    for record in existing_records:
-                        secondary_value = getattr(record, field_name)
-                        primary_key = record.get_key()
-
-                        index_record = IndexRecord(field_type, field_size)
-                        index_record.set_index_data(secondary_value, primary_key)
-
-                        insert_result = secondary_index.insert(index_record)
+                    if hasattr(secondary_index, 'insert_many'):
+                        # el índice recibe todo el lote: vacío, lo arma de abajo hacia arriba sin splits
+                        index_records = []
+                        for record in existing_records:
+                            index_record = IndexRecord(field_type, field_size)
+                            index_record.set_index_data(getattr(record, field_name), record.get_key())
+                            index_records.append(index_record)
+
+                        insert_result = secondary_index.insert_many(index_records)
+                        if index_records and not insert_result.data:
+                            raise ValueError("bulk load of the secondary index failed")
 
                         total_reads += insert_result.disk_reads
                         total_writes += insert_result.disk_writes
                         total_time += insert_result.execution_time_ms
+                        records_indexed = len(index_records)
+                    else:
+                        for record in existing_records:
+                            secondary_value = getattr(record, field_name)
+                            primary_key = record.get_key()
 
-                        if insert_result.disk_writes > 0 or index_type != "HASH":
-                            records_indexed += 1
-                        else:
-                            skipped_duplicates += 1
+                            index_record = IndexRecord(field_type, field_size)
+                            index_record.set_index_data(secondary_value, primary_key)
+
+                            insert_result = secondary_index.insert(index_record)
+
+                            total_reads += insert_result.disk_reads
+                            total_writes += insert_result.disk_writes
+                            total_time += insert_result.execution_time_ms
+
+                            if insert_result.disk_writes > 0 or index_type != "HASH":
+                                records_indexed += 1
+                            else:
+                                skipped_duplicates += 1
 
                     if skipped_duplicates > 0:
                         print(f"Skipped {skipped_duplicates} duplicate records during index creation")
@@ -264,6 +283,8 @@ class DatabaseManager:
         if not primary_result.data:
             return OperationResult(False, total_time, total_reads, total_writes, primary_result.rebuild_triggered, breakdown)
 
+        primary_key = record.get_key()
+
         for field_name, index_info in table_info["secondary_indexes"].items():
             index_type = index_info["type"]
 
@@ -271,12 +292,9 @@ class DatabaseManager:
                 continue
 
             secondary_index = index_info["index"]
-
-            field_type, field_size = self._get_field_info(table_info["table"], field_name)
             secondary_value = getattr(record, field_name)
-            primary_key = record.get_key()
 
-            index_record = IndexRecord(field_type, field_size)
+            index_record = IndexRecord(index_info["field_type"], index_info["field_size"])
             index_record.set_index_data(secondary_value, primary_key)
 
             secondary_result = secondary_index.insert(index_record)
@@ -292,6 +310,81 @@ class DatabaseManager:
 
         return OperationResult(primary_result.data, total_time, total_reads, total_writes, primary_result.rebuild_triggered, breakdown)
 
+    def insert_many(self, table_name: str, records: List[Record]):
+        """Inserta un lote de registros; cada índice recibe todas sus entradas en una sola llamada cuando lo soporta.
+        Devuelve cuántos registros se insertaron (los duplicados de primary key se descartan)"""
+        if table_name not in self.tables:
+            raise ValueError(f"Table {table_name} does not exist")
+
+        table_info = self.tables[table_name]
+        primary_index = table_info["primary_index"]
+        rebuild_triggered = False
+
+        if hasattr(primary_index, 'insert_many'):
+            # el índice descarta claves repetidas sin decir cuáles: se filtran antes para saber qué filas entran
+            batch = {}
+            for record in records:
+                batch.setdefault(record.get_key(), record)
+            existing, total_reads, total_writes, total_time = self._search_primary_keys(primary_index, list(batch))
+            inserted = [record for record, found in zip(batch.values(), existing) if not found]
+
+            primary_result = primary_index.insert_many(inserted)
+            total_reads += primary_result.disk_reads
+            total_writes += primary_result.disk_writes
+            total_time += primary_result.execution_time_ms
+            rebuild_triggered = primary_result.rebuild_triggered
+
+            if inserted and not primary_result.data:
+                # el lote no entró en la primaria: los secundarios no reciben sus entradas
+                breakdown = {"primary_metrics": {"reads": total_reads, "writes": total_writes, "time_ms": total_time}}
+                return OperationResult(False, total_time, total_reads, total_writes, rebuild_triggered, breakdown)
+        else:
+            inserted = []
+            total_reads = total_writes = 0
+            total_time = 0
+            for record in records:
+                primary_result = primary_index.insert(record)
+                total_reads += primary_result.disk_reads
+                total_writes += primary_result.disk_writes
+                total_time += primary_result.execution_time_ms
+                rebuild_triggered = rebuild_triggered or primary_result.rebuild_triggered
+                if primary_result.data:
+                    inserted.append(record)
+
+        breakdown = {
+            "primary_metrics": {"reads": total_reads, "writes": total_writes, "time_ms": total_time}
+        }
+
+        for field_name, index_info in table_info["secondary_indexes"].items():
+            if index_info["type"] == "INVERTED_TEXT" or not inserted:
+                continue
+
+            secondary_index = index_info["index"]
+            index_records = []
+            for record in inserted:
+                index_record = IndexRecord(index_info["field_type"], index_info["field_size"])
+                index_record.set_index_data(getattr(record, field_name), record.get_key())
+                index_records.append(index_record)
+
+            reads = writes = 0
+            time_ms = 0
+            if hasattr(secondary_index, 'insert_many'):
+                secondary_result = secondary_index.insert_many(index_records)
+                reads, writes, time_ms = secondary_result.disk_reads, secondary_result.disk_writes, secondary_result.execution_time_ms
+            else:
+                for index_record in index_records:
+                    secondary_result = secondary_index.insert(index_record)
+                    reads += secondary_result.disk_reads
+                    writes += secondary_result.disk_writes
+                    time_ms += secondary_result.execution_time_ms
+
+            total_reads += reads
+            total_writes += writes
+            total_time += time_ms
+            breakdown[f"secondary_metrics_{field_name}"] = {"reads": reads, "writes": writes, "time_ms": time_ms}
+
+        return OperationResult(len(inserted), total_time, total_reads, total_writes, rebuild_triggered, breakdown)
+
     def search(self, table_name: str, value, field_name: str = None, limit: int = None):
         if table_name not in self.tables:
             raise ValueError(f"Table {table_name} does not exist")
@@ -330,19 +423,12 @@ class DatabaseManager:
             total_reads = secondary_result.disk_reads
             total_writes = secondary_result.disk_writes
 
-            primary_lookup_reads = 0
-            primary_lookup_writes = 0
-            primary_lookup_time = 0
+            records, primary_lookup_reads, primary_lookup_writes, primary_lookup_time = self._search_primary_keys(
+                primary_index, [doc_id for doc_id, _ in secondary_result.data])
 
             matching_records = []
-            for doc_id, score in secondary_result.data:
-                primary_result = primary_index.search(doc_id)
-                primary_lookup_reads += primary_result.disk_reads
-                primary_lookup_writes += primary_result.disk_writes
-                primary_lookup_time += primary_result.execution_time_ms
-
-                if primary_result.data:
-                    record = primary_result.data
+            for (doc_id, score), record in zip(secondary_result.data, records):
+                if record:
                     if not hasattr(record, '_multimedia_score'):
                         record._multimedia_score = score
                     matching_records.append(record)
@@ -379,19 +465,12 @@ class DatabaseManager:
                 total_reads = secondary_result.disk_reads
                 total_writes = secondary_result.disk_writes
 
-                primary_lookup_reads = 0
-                primary_lookup_writes = 0
-                primary_lookup_time = 0
+                records, primary_lookup_reads, primary_lookup_writes, primary_lookup_time = self._search_primary_keys(
+                    primary_index, [doc_id for doc_id, _ in secondary_result.data])
 
                 matching_records = []
-                for doc_id, score in secondary_result.data:
-                    primary_result = primary_index.search(doc_id)
-                    primary_lookup_reads += primary_result.disk_reads
-                    primary_lookup_writes += primary_result.disk_writes
-                    primary_lookup_time += primary_result.execution_time_ms
-
-                    if primary_result.data:
-                        record = primary_result.data
+                for (doc_id, score), record in zip(secondary_result.data, records):
+                    if record:
                         if not hasattr(record, '_text_score'):
                             record._text_score = score
                         matching_records.append(record)
@@ -422,19 +501,12 @@ class DatabaseManager:
                 total_reads = secondary_result.disk_reads
                 total_writes = secondary_result.disk_writes
 
-                primary_lookup_reads = 0
-                primary_lookup_writes = 0
-                primary_lookup_time = 0
+                records, primary_lookup_reads, primary_lookup_writes, primary_lookup_time = self._search_primary_keys(
+                    primary_index, [doc_id for doc_id, _ in secondary_result.data])
 
                 matching_records = []
-                for doc_id, score in secondary_result.data:
-                    primary_result = primary_index.search(doc_id)
-                    primary_lookup_reads += primary_result.disk_reads
-                    primary_lookup_writes += primary_result.disk_writes
-                    primary_lookup_time += primary_result.execution_time_ms
-
-                    if primary_result.data:
-                        record = primary_result.data
+                for (doc_id, score), record in zip(secondary_result.data, records):
+                    if record:
                         if not hasattr(record, '_multimedia_score'):
                             record._multimedia_score = score
                         matching_records.append(record)
@@ -467,15 +539,9 @@ class DatabaseManager:
             primary_lookup_time = 0
 
             if secondary_result.data:
-                matching_records = []
-                for primary_key in secondary_result.data:
-                    primary_result = primary_index.search(primary_key)
-                    primary_lookup_reads += primary_result.disk_reads
-                    primary_lookup_writes += primary_result.disk_writes
-                    primary_lookup_time += primary_result.execution_time_ms
-
-                    if primary_result.data:
-                        matching_records.append(primary_result.data)
+                records, primary_lookup_reads, primary_lookup_writes, primary_lookup_time = self._search_primary_keys(
+                    primary_index, secondary_result.data)
+                matching_records = [record for record in records if record]
 
                 total_reads += primary_lookup_reads
                 total_writes += primary_lookup_writes
@@ -504,19 +570,34 @@ class DatabaseManager:
             else:
                 raise NotImplementedError(f"Full scan not supported for {table_info['primary_type']} index")
 
+            # el valor buscado se normaliza una sola vez; los INT se comparan como enteros para no pasar
+            # cada registro por str(), y solo si value_str es la forma que str() daría ("7", no "007")
+            value_str = value.decode('utf-8').rstrip('\x00').rstrip() if hasattr(value, 'decode') else str(value).rstrip()
+            try:
+                int_value = int(value_str) if str(int(value_str)) == value_str else None
+            except ValueError:
+                int_value = None
+
             matching_records = []
             for record in all_records:
                 record_value = getattr(record, field_name, None)
-                if record_value is not None:
-                    if hasattr(record_value, 'decode'):
-                        record_value = record_value.decode('utf-8').rstrip('\x00').rstrip()
-                    else:
-                        record_value = str(record_value).rstrip()
-
-                    value_str = value.decode('utf-8').rstrip('\x00').rstrip() if hasattr(value, 'decode') else str(value).rstrip()
+                if record_value is None:
+                    continue
 
-                    if record_value == value_str:
+                value_type = type(record_value)
+                if value_type is int:
+                    if record_value == int_value:
                         matching_records.append(record)
+                    continue
+                if value_type is str:
+                    record_value = record_value.rstrip()
+                elif hasattr(record_value, 'decode'):
+                    record_value = record_value.decode('utf-8').rstrip('\x00').rstrip()
+                else:
+                    record_value = str(record_value).rstrip()
+
+                if record_value == value_str:
+                    matching_records.append(record)
 
             return OperationResult(matching_records, scan_result.execution_time_ms, scan_result.disk_reads, scan_result.disk_writes)
 
@@ -563,15 +644,9 @@ class DatabaseManager:
             primary_lookup_time = 0
 
             if secondary_result.data:
-                matching_records = []
-                for primary_key in secondary_result.data:
-                    primary_result = primary_index.search(primary_key)
-                    primary_lookup_reads += primary_result.disk_reads
-                    primary_lookup_writes += primary_result.disk_writes
-                    primary_lookup_time += primary_result.execution_time_ms
-
-                    if primary_result.data:
-                        matching_records.append(primary_result.data)
+                records, primary_lookup_reads, primary_lookup_writes, primary_lookup_time = self._search_primary_keys(
+                    primary_index, secondary_result.data)
+                matching_records = [record for record in records if record]
 
                 total_reads += primary_lookup_reads
                 total_writes += primary_lookup_writes
@@ -1085,6 +1160,23 @@ class DatabaseManager:
                 return (ftype, fsize)
         return None
 
+    def _search_primary_keys(self, primary_index, primary_keys):
+        """Busca un lote de primary keys; devuelve los registros alineados con primary_keys y las métricas sumadas"""
+        if hasattr(primary_index, 'search_many'):
+            result = primary_index.search_many(primary_keys)
+            return result.data, result.disk_reads, result.disk_writes, result.execution_time_ms
+
+        records = []
+        reads = writes = 0
+        time_ms = 0
+        for primary_key in primary_keys:
+            primary_result = primary_index.search(primary_key)
+            reads += primary_result.disk_reads
+            writes += primary_result.disk_writes
+            time_ms += primary_result.execution_time_ms
+            records.append(primary_result.data)
+        return records, reads, writes, time_ms
+
     def _create_primary_index(self, table: Table, index_type: str):
         if index_type == "ISAM":
 
@@ -1140,7 +1232,8 @@ class DatabaseManager:
             return BPlusTreeUnclusteredIndex(
                 order=50,
                 index_column=field_name,
-                file_path=filename
+                file_path=filename,
+                node_size_bytes=4096
             )
         
         elif index_type == "HASH":
@@ -1371,7 +1464,9 @@ class DatabaseManager:
                         "language": info.get("language"),
                         "feature_type": info.get("feature_type"),
                         "multimedia_directory": info.get("multimedia_directory"),
-                        "multimedia_pattern": info.get("multimedia_pattern")
+                        "multimedia_pattern": info.get("multimedia_pattern"),
+                        "field_type": info.get("field_type"),
+                        "field_size": info.get("field_size")
                     }
                     for field, info in table_info["secondary_indexes"].items()
                 },
@@ -1441,6 +1536,10 @@ class DatabaseManager:
                             feature_type = index_info.get("feature_type", "SIFT")
                             multimedia_directory = index_info.get("multimedia_directory", None)
                             multimedia_pattern = index_info.get("multimedia_pattern", None)
+                            if "field_type" in index_info:
+                                field_type, field_size = index_info["field_type"], index_info["field_size"]
+                            else:
+                                field_type, field_size = self._get_field_info(table, field_name) or (None, None)
 
                             secondary_index = self._create_secondary_index(table, field_name, index_type, language=language, feature_type=feature_type, multimedia_directory=multimedia_directory, multimedia_pattern=multimedia_pattern)
                             table_info["secondary_indexes"][field_name] = {
@@ -1449,7 +1548,9 @@ class DatabaseManager:
                                 "language": language if index_type == "INVERTED_TEXT" else None,
                                 "feature_type": feature_type if index_type in ("MULTIMEDIA_SEQ", "MULTIMEDIA_INV") else None,
                                 "multimedia_directory": multimedia_directory if index_type in ("MULTIMEDIA_SEQ", "MULTIMEDIA_INV") else None,
-                                "multimedia_pattern": multimedia_pattern if index_type in ("MULTIMEDIA_SEQ", "MULTIMEDIA_INV") else None
+                                "multimedia_pattern": multimedia_pattern if index_type in ("MULTIMEDIA_SEQ", "MULTIMEDIA_INV") else None,
+                                "field_type": field_type,
+                                "field_size": field_size
                             }
                             if hasattr(secondary_index, 'warm_up'):
                                 secondary_index.warm_up()
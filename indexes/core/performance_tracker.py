@@ -17,6 +17,8 @@ class OperationResult:
 
 class PerformanceTracker:
     def __init__(self):
+        self.cache_hits = 0
+        self.cache_misses = 0
         self.reset()
 
     def reset(self):
@@ -47,6 +49,12 @@ class PerformanceTracker:
     def track_write(self):
         self.writes += 1
 
+    def track_cache_hit(self, count=1):
+        self.cache_hits += count
+
+    def track_cache_miss(self):
+        self.cache_misses += 1
+
     def end_operation(self, result_data, rebuild_triggered=False):
         execution_time = (time.time() - self.start_time) * 1000
 
@@ -48,7 +48,7 @@ class Record:
                 setattr(self, field_name, value)
             else:
                 raise AttributeError(f"Campo {field_name} no existe en el registro")
-    def pack(self) -> bytes:
+    def _packed_values(self) -> list:
         processed_values = []
         for field_name, field_type, field_size in self.value_type_size:
             value = getattr(self, field_name)
@@ -58,8 +58,14 @@ class Record:
                 processed_values.extend(value)
             else:
                 processed_values.append(self._process_value(value, field_type, field_size))
+        return processed_values
+
+    def pack(self) -> bytes:
+        return struct.pack(self.FORMAT, *self._packed_values())
 
-        return struct.pack(self.FORMAT, *processed_values)
+    def pack_into(self, buffer, offset: int = 0):
+        """Escribe el registro empaquetado directamente en un buffer del llamador"""
+        struct.pack_into(self.FORMAT, buffer, offset, *self._packed_values())
 
     def _process_value(self, value, field_type: str, field_size: int):
         if field_type == "CHAR":
@@ -92,6 +98,15 @@ class Record:
         else:
             raise AttributeError(f"Campo {field_name} no existe")
 
+    def copy(self) -> 'Record':
+        """Copia independiente del registro: modificarla no altera el original (los ARRAY no se comparten)"""
+        record = object.__new__(type(self))
+        record.__dict__.update(self.__dict__)
+        for field_name, field_type, _ in self.value_type_size:
+            if field_type == "ARRAY" and isinstance(getattr(self, field_name), list):
+                setattr(record, field_name, list(getattr(self, field_name)))
+        return record
+
     @classmethod
     def unpack(cls, data: bytes, list_of_types: List[Tuple[str, str, int]], key_field: str):
         record = cls(list_of_types, key_field)
@@ -108,6 +123,26 @@ class Record:
                 data_index += 1
 
         return record
+
+    @classmethod
+    def make_decoder(cls, list_of_types: List[Tuple[str, str, int]], key_field: str):
+        """Precompila el Struct y el esquema para deserializar muchos registros del mismo tipo"""
+        if any(field_type == "ARRAY" for _, field_type, _ in list_of_types):
+            return lambda data: cls.unpack(data, list_of_types, key_field)
+
+        template = cls.unpack(bytes(Record(list_of_types, key_field).RECORD_SIZE), list_of_types, key_field)
+        record_struct = struct.Struct(template.FORMAT)
+        field_names = [field_name for field_name, _, _ in template.value_type_size]
+        base_attrs = dict(template.__dict__)
+
+        def decode(data: bytes):
+            record = object.__new__(cls)
+            attrs = record.__dict__
+            attrs.update(base_attrs)
+            attrs.update(zip(field_names, record_struct.unpack(data)))
+            return record
+
+        return decode
     
     def __str__(self):
         fields = []
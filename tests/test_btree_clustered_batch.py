@@ -0,0 +1,181 @@
+import sys
+import os
+import random
+import shutil
+import tempfile
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from indexes.bplus_tree.bplus_tree_clustered import BPlusTreeClusteredIndex
+from indexes.core.record import Table, Record
+
+def create_table():
+    return Table(
+        table_name="products",
+        sql_fields=[("product_id", "INT", 4), ("name", "CHAR", 12), ("price", "FLOAT", 4)],
+        key_field="product_id"
+    )
+
+def open_tree(table, path, order=8):
+    return BPlusTreeClusteredIndex(order=order, key_column="product_id", file_path=path, record_class=Record, table=table)
+
+def make_record(table, product_id):
+    record = Record(table.all_fields, "product_id")
+    record.set_values(product_id=product_id, name=b"p%d" % product_id, price=float(product_id % 100))
+    return record
+
+def check_contents(tree, expected_ids):
+    records = tree.scan_all().data
+    assert [record.product_id for record in records] == sorted(expected_ids), "scan_all mismatch"
+    for record in records:
+        assert record.name == "p%d" % record.product_id, (record.product_id, record.name)
+        assert record.price == float(record.product_id % 100), (record.product_id, record.price)
+
+def test_insert_many():
+    print(f"\n{'='*60}")
+    print("INSERT_MANY (BULK LOAD AND INCREMENTAL BATCH)")
+    print(f"{'='*60}")
+
+    table = create_table()
+    temp_dir = tempfile.mkdtemp()
+    path = os.path.join(temp_dir, "products")
+    rng = random.Random(7)
+    try:
+        tree = open_tree(table, path)
+        ids = rng.sample(range(5000), 800)
+        batch = [make_record(table, product_id) for product_id in ids + ids[:50]]
+        result = tree.insert_many(batch)
+        print(f"   Bulk load: {result.data} records inserted")
+        assert result.data == len(ids), result.data
+
+        extra = rng.sample(range(5000), 200)
+        result = tree.insert_many([make_record(table, product_id) for product_id in extra])
+        expected = set(ids) | set(extra)
+        print(f"   Incremental batch: {result.data} new records")
+        assert result.data == len(expected) - len(ids), result.data
+        tree.close()
+
+        tree = open_tree(table, path)
+        check_contents(tree, expected)
+        assert tree.search(ids[0]).data.product_id == ids[0]
+        tree.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def test_search_many_and_delete_many():
+    print(f"\n{'='*60}")
+    print("SEARCH_MANY AND DELETE_MANY")
+    print(f"{'='*60}")
+
+    table = create_table()
+    temp_dir = tempfile.mkdtemp()
+    path = os.path.join(temp_dir, "products")
+    rng = random.Random(11)
+    try:
+        tree = open_tree(table, path)
+        ids = list(range(0, 3000, 3))
+        for product_id in ids:
+            tree.insert(make_record(table, product_id))
+
+        keys = rng.sample(range(3000), 300)
+        found = tree.search_many(keys).data
+        assert len(found) == len(keys)
+        for key, record in zip(keys, found):
+            if key % 3 == 0:
+                assert record is not None and record.product_id == key, (key, record)
+            else:
+                assert record is None, (key, record)
+        print(f"   search_many: {sum(record is not None for record in found)} of {len(keys)} keys found")
+
+        doomed = rng.sample(ids, 400) + [1, 2, 4]
+        result = tree.delete_many(doomed)
+        print(f"   delete_many: {result.data} records deleted")
+        assert result.data == 400, result.data
+        tree.close()
+
+        tree = open_tree(table, path)
+        remaining = set(ids) - set(doomed)
+        check_contents(tree, remaining)
+        assert tree.search_many(doomed[:20]).data == [None] * 20
+        tree.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def test_reorganize():
+    print(f"\n{'='*60}")
+    print("REORGANIZE")
+    print(f"{'='*60}")
+
+    table = create_table()
+    temp_dir = tempfile.mkdtemp()
+    path = os.path.join(temp_dir, "products")
+    rng = random.Random(3)
+    try:
+        tree = open_tree(table, path)
+        expected = set()
+        for _ in range(3000):
+            product_id = rng.randint(0, 2000)
+            if rng.random() < 0.7:
+                tree.insert(make_record(table, product_id))
+                expected.add(product_id)
+            else:
+                tree.delete(product_id)
+                expected.discard(product_id)
+
+        result = tree.reorganize()
+        print(f"   Reorganized into {result.data} nodes")
+        check_contents(tree, expected)
+        tree.close()
+
+        tree = open_tree(table, path)
+        check_contents(tree, expected)
+        for product_id in list(expected)[:50]:
+            assert tree.search(product_id).data.product_id == product_id
+        tree.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def test_free_pages_are_reused():
+    print(f"\n{'='*60}")
+    print("FREED PAGES ARE REUSED")
+    print(f"{'='*60}")
+
+    table = create_table()
+    temp_dir = tempfile.mkdtemp()
+    path = os.path.join(temp_dir, "products")
+    try:
+        tree = open_tree(table, path)
+        sizes = []
+        for cycle in range(4):
+            for product_id in range(2000):
+                tree.insert(make_record(table, product_id))
+            sizes.append(tree.get_total_nodes())
+            if cycle % 2:
+                tree.delete_many(range(2000))
+            else:
+                for product_id in range(2000):
+                    tree.delete(product_id)
+            # la lista de páginas libres también tiene que sobrevivir a reabrir el archivo
+            tree.close()
+            tree = open_tree(table, path)
+
+        print(f"   Nodes in file after each load: {sizes}")
+        assert sizes == [sizes[0]] * len(sizes), sizes
+        assert tree.scan_all().data == []
+        tree.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def main():
+    print("\n" + "="*60)
+    print("B+ TREE CLUSTERED INDEX - BATCH OPERATIONS TEST")
+    print("="*60)
+
+    test_insert_many()
+    test_search_many_and_delete_many()
+    test_reorganize()
+    test_free_pages_are_reused()
+    print("\n[OK] All batch operation checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import sys
+import os
+import shutil
+import tempfile
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from indexes.bplus_tree.bplus_tree_clustered import BPlusTreeClusteredIndex
+from indexes.core.record import Table, Record
+
+def create_table():
+    return Table(
+        table_name="items",
+        sql_fields=[("item_id", "INT", 4), ("name", "CHAR", 10)],
+        key_field="item_id"
+    )
+
+def open_tree(table, path, order=40):
+    return BPlusTreeClusteredIndex(order=order, key_column="item_id", file_path=path, record_class=Record, table=table)
+
+def make_record(table, item_id, name):
+    record = Record(table.all_fields, "item_id")
+    record.set_values(item_id=item_id, name=name)
+    return record
+
+def test_char_values_survive_leaf_rewrites():
+    print(f"\n{'='*60}")
+    print("CHAR VALUES AFTER READS AND LEAF REWRITES")
+    print(f"{'='*60}")
+
+    table = create_table()
+    temp_dir = tempfile.mkdtemp()
+    path = os.path.join(temp_dir, "items")
+    try:
+        tree = open_tree(table, path)
+        for item_id in (0, 2, 4, 6, 8):
+            tree.insert(make_record(table, item_id, b"n%d" % item_id))
+
+        # leer registros los deja decodificados en la hoja cacheada; la reescritura no debe rellenarlos
+        tree.search(4)
+        tree.search(6)
+        tree.insert(make_record(table, 5, b"n5"))
+        tree.close()
+
+        tree = open_tree(table, path)
+        names = [record.name for record in tree.scan_all().data]
+        print(f"   Names after reopen: {names}")
+        assert names == ["n0", "n2", "n4", "n5", "n6", "n8"], names
+        tree.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def test_returned_records_are_independent():
+    print(f"\n{'='*60}")
+    print("RETURNED RECORDS DO NOT ALIAS THE NODE CACHE")
+    print(f"{'='*60}")
+
+    table = create_table()
+    temp_dir = tempfile.mkdtemp()
+    try:
+        tree = open_tree(table, os.path.join(temp_dir, "items"), order=8)
+        for item_id in range(50):
+            tree.insert(make_record(table, item_id, b"n%d" % item_id))
+
+        tree.search(3).data.name = "MUTATED"
+        tree.range_search(3, 4).data[0].name = "MUTATED"
+        tree.scan_all().data[3]._text_score = 0.5
+
+        record = tree.search(3).data
+        print(f"   search(3) after mutating earlier results: {record.name}")
+        assert record.name == "n3", record.name
+        assert not hasattr(record, "_text_score")
+        assert [r.name for r in tree.range_search(3, 3).data] == ["n3"]
+
+        batch = tree.search_many([7, 3, 7, 999]).data
+        print(f"   search_many([7, 3, 7, 999]): {[r.name if r else None for r in batch]}")
+        assert [r.name if r else None for r in batch] == ["n7", "n3", "n7", None]
+        assert batch[0] is not batch[2]
+        batch[0]._text_score = 0.5
+        assert not hasattr(batch[2], "_text_score")
+        assert not hasattr(tree.search_many([7]).data[0], "_text_score")
+        tree.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def main():
+    print("\n" + "="*60)
+    print("B+ TREE CLUSTERED INDEX - RECORD STORAGE TEST")
+    print("="*60)
+
+    test_char_values_survive_leaf_rewrites()
+    test_returned_records_are_independent()
+    print("\n[OK] All record storage checks passed")
+
+if __name__ == "__main__":
+    main()
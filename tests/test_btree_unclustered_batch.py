@@ -0,0 +1,125 @@
+import sys
+import os
+import random
+import shutil
+import tempfile
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from indexes.bplus_tree.bplus_tree_unclustered import BPlusTreeUnclusteredIndex
+from indexes.core.record import IndexRecord
+
+def make_index_record(value_type, value, primary_key):
+    index_record = IndexRecord(value_type, 10 if value_type == "CHAR" else 4)
+    index_record.set_index_data(value, primary_key)
+    return index_record
+
+def expected_for(model, low, high):
+    return sorted(primary_key for value, primary_key in model if low <= value <= high)
+
+def check_against_model(tree, model, values):
+    for value in values:
+        result = sorted(tree.search(value).data)
+        assert result == expected_for(model, value, value), (value, len(result))
+    low, high = min(values), max(values)
+    assert sorted(tree.range_search(low, high).data) == expected_for(model, low, high)
+
+def test_insert_many_bulk_load_and_batches():
+    print(f"\n{'='*60}")
+    print("INSERT_MANY ON EMPTY AND LOADED INDEXES")
+    print(f"{'='*60}")
+
+    temp_dir = tempfile.mkdtemp()
+    path = os.path.join(temp_dir, "categories")
+    rng = random.Random(5)
+    try:
+        tree = BPlusTreeUnclusteredIndex(8, "category", path)
+        model = set()
+        batch = []
+        for primary_key in range(1500):
+            value = "c%03d" % rng.randint(0, 60)
+            # mezcla bytes y str, como llegan los CHAR desde el CSV y desde el parser
+            batch.append(make_index_record("CHAR", value.encode() if primary_key % 2 else value, primary_key))
+            model.add((value, primary_key))
+        result = tree.insert_many(batch)
+        print(f"   Bulk load: {result.data} entries")
+        assert result.data == len(model), result.data
+
+        batch = []
+        for primary_key in range(1500, 1800):
+            value = "c%03d" % rng.randint(0, 60)
+            batch.append(make_index_record("CHAR", value.encode() if primary_key % 2 else value, primary_key))
+            model.add((value, primary_key))
+        result = tree.insert_many(batch)
+        print(f"   Batch into loaded index: {result.data} entries")
+        assert result.data == 300, result.data
+
+        values = sorted({value for value, _ in model})
+        check_against_model(tree, model, values)
+        tree.close()
+
+        tree = BPlusTreeUnclusteredIndex(8, "category", path)
+        check_against_model(tree, model, values)
+        tree.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def test_bulk_loaded_leaves_leave_room():
+    print(f"\n{'='*60}")
+    print("BULK-LOADED LEAVES ACCEPT INSERTS WITHOUT SPLITTING")
+    print(f"{'='*60}")
+
+    temp_dir = tempfile.mkdtemp()
+    rng = random.Random(9)
+    try:
+        tree = BPlusTreeUnclusteredIndex(50, "amount", os.path.join(temp_dir, "amounts"))
+        tree.insert_many([make_index_record("INT", rng.randint(0, 10**6), primary_key) for primary_key in range(5000)])
+
+        writes = 0
+        for primary_key in range(5000, 5200):
+            writes += tree.insert(make_index_record("INT", rng.randint(0, 10**6), primary_key)).disk_writes
+        print(f"   200 inserts after the bulk load: {writes} page writes")
+        # un split escribiría también la hoja nueva y el padre
+        assert writes == 200, writes
+        tree.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def test_free_pages_are_reused():
+    print(f"\n{'='*60}")
+    print("FREED PAGES ARE REUSED")
+    print(f"{'='*60}")
+
+    temp_dir = tempfile.mkdtemp()
+    path = os.path.join(temp_dir, "values")
+    try:
+        tree = BPlusTreeUnclusteredIndex(8, "value", path)
+        sizes = []
+        for _ in range(4):
+            for primary_key in range(2000):
+                tree.insert(make_index_record("INT", primary_key % 300, primary_key))
+            sizes.append(tree.get_total_nodes())
+            for value in range(300):
+                tree.delete(value)
+            tree.close()
+            tree = BPlusTreeUnclusteredIndex(8, "value", path)
+
+        print(f"   Nodes in file after each load: {sizes}")
+        assert sizes == [sizes[0]] * len(sizes), sizes
+        assert tree.range_search(0, 300).data == []
+        tree.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def main():
+    print("\n" + "="*60)
+    print("B+ TREE UNCLUSTERED INDEX - BATCH OPERATIONS TEST")
+    print("="*60)
+
+    test_insert_many_bulk_load_and_batches()
+    test_bulk_loaded_leaves_leave_room()
+    test_free_pages_are_reused()
+    print("\n[OK] All batch operation checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import sys
+import os
+import shutil
+import tempfile
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from indexes.bplus_tree.bplus_tree_unclustered import BPlusTreeUnclusteredIndex
+from indexes.core.record import IndexRecord
+
+def make_index_record(value, primary_key):
+    index_record = IndexRecord("INT", 4)
+    index_record.set_index_data(value, primary_key)
+    return index_record
+
+def load_duplicate_run(tree):
+    # 30 entradas con el mismo valor ocupan varias hojas de un árbol de orden 8
+    records = [make_index_record(value, value) for value in range(20)]
+    records += [make_index_record(7, 100 + i) for i in range(30)]
+    return records
+
+def check_duplicate_run_delete(tree, path):
+    result = tree.search(7)
+    print(f"   search(7): {len(result.data)} primary keys")
+    assert sorted(result.data) == [7] + list(range(100, 130)), sorted(result.data)
+
+    assert tree.delete(7, 100).data is True
+    assert tree.delete(7, 129).data is True
+    assert tree.delete(7, 100).data is False
+
+    deleted = tree.delete(7).data
+    print(f"   delete(7): {len(deleted)} entries removed")
+    assert sorted(deleted) == [7] + list(range(101, 129)), sorted(deleted)
+    assert tree.search(7).data == []
+    tree.close()
+
+    tree = BPlusTreeUnclusteredIndex(8, "value", path)
+    assert tree.search(7).data == []
+    remaining = tree.range_search(0, 19).data
+    assert sorted(remaining) == [value for value in range(20) if value != 7], sorted(remaining)
+    tree.close()
+
+def test_delete_duplicate_run_after_inserts():
+    print(f"\n{'='*60}")
+    print("DELETE A DUPLICATE RUN (ROW BY ROW INSERTS)")
+    print(f"{'='*60}")
+
+    temp_dir = tempfile.mkdtemp()
+    path = os.path.join(temp_dir, "values")
+    try:
+        tree = BPlusTreeUnclusteredIndex(8, "value", path)
+        for index_record in load_duplicate_run(tree):
+            tree.insert(index_record)
+        check_duplicate_run_delete(tree, path)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def test_delete_duplicate_run_after_bulk_load():
+    print(f"\n{'='*60}")
+    print("DELETE A DUPLICATE RUN (BULK LOAD)")
+    print(f"{'='*60}")
+
+    temp_dir = tempfile.mkdtemp()
+    path = os.path.join(temp_dir, "values")
+    try:
+        tree = BPlusTreeUnclusteredIndex(8, "value", path)
+        tree.insert_many(load_duplicate_run(tree))
+        check_duplicate_run_delete(tree, path)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def main():
+    print("\n" + "="*60)
+    print("B+ TREE UNCLUSTERED INDEX - DUPLICATE KEYS TEST")
+    print("="*60)
+
+    test_delete_duplicate_run_after_inserts()
+    test_delete_duplicate_run_after_bulk_load()
+    print("\n[OK] All duplicate key checks passed")
+
+if __name__ == "__main__":
+    main()
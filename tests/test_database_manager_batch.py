@@ -0,0 +1,136 @@
+import sys
+import os
+import random
+import shutil
+import tempfile
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from indexes.core.database_manager import DatabaseManager
+from indexes.core.record import Table, Record
+from indexes.core.performance_tracker import OperationResult
+
+def create_orders_table():
+    return Table(
+        table_name="orders",
+        sql_fields=[("order_id", "INT", 4), ("category", "CHAR", 10), ("quantity", "INT", 4)],
+        key_field="order_id"
+    )
+
+def make_record(db_manager, order_id, mixed=True):
+    record = Record(db_manager.tables["orders"]["table"].all_fields, "order_id")
+    category = "cat%d" % (order_id % 7)
+    # mezcla bytes y str en el mismo lote
+    record.set_values(order_id=order_id, category=category.encode() if order_id % 2 or not mixed else category, quantity=order_id % 5)
+    return record
+
+def ids_for(db_manager, value, field_name):
+    return sorted(record.order_id for record in db_manager.search("orders", value, field_name=field_name).data)
+
+def check_secondaries(db_manager, expected_ids):
+    for category in range(7):
+        expected = sorted(order_id for order_id in expected_ids if order_id % 7 == category)
+        assert ids_for(db_manager, "cat%d" % category, "category") == expected, ("category", category)
+    for quantity in range(5):
+        expected = sorted(order_id for order_id in expected_ids if order_id % 5 == quantity)
+        assert ids_for(db_manager, quantity, "quantity") == expected, ("quantity", quantity)
+
+def test_insert_many_keeps_indexes_in_sync():
+    print(f"\n{'='*60}")
+    print("DATABASE MANAGER INSERT_MANY")
+    print(f"{'='*60}")
+
+    temp_dir = tempfile.mkdtemp()
+    rng = random.Random(13)
+    try:
+        for primary_type in ("BTREE", "ISAM"):
+            db_manager = DatabaseManager("batch_test_db", base_path=temp_dir)
+            db_manager.create_table(create_orders_table(), primary_index_type=primary_type)
+            db_manager.create_index("orders", "category", "BTREE")
+            db_manager.create_index("orders", "quantity", "HASH")
+
+            first = rng.sample(range(2000), 600)
+            # el primer lote repite claves dentro del lote; el segundo, claves ya guardadas
+            batch = first + first[:40] if primary_type == "BTREE" else first
+            result = db_manager.insert_many("orders", [make_record(db_manager, order_id) for order_id in batch])
+            print(f"   {primary_type}: first batch inserted {result.data} records")
+            assert result.data == len(first), result.data
+
+            second = rng.sample(range(2000, 2600), 200)
+            batch = second + first[:30] if primary_type == "BTREE" else second
+            result = db_manager.insert_many("orders", [make_record(db_manager, order_id) for order_id in batch])
+            print(f"   {primary_type}: second batch inserted {result.data} records")
+            assert result.data == len(second), result.data
+
+            expected_ids = set(first) | set(second)
+            check_secondaries(db_manager, expected_ids)
+
+            db_manager = DatabaseManager("batch_test_db", base_path=temp_dir)
+            check_secondaries(db_manager, expected_ids)
+
+            # borrar por un valor repetido en muchas hojas no deja entradas colgando en el otro índice
+            deleted = db_manager.delete("orders", "cat3", field_name="category").data
+            expected_ids = {order_id for order_id in expected_ids if order_id % 7 != 3}
+            print(f"   {primary_type}: deleted {deleted} records with category cat3")
+            check_secondaries(db_manager, expected_ids)
+
+            db_manager.drop_table("orders")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def test_insert_many_stops_when_primary_fails():
+    print(f"\n{'='*60}")
+    print("INSERT_MANY WITH A FAILING PRIMARY INDEX")
+    print(f"{'='*60}")
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        db_manager = DatabaseManager("batch_test_db", base_path=temp_dir)
+        db_manager.create_table(create_orders_table(), primary_index_type="BTREE")
+        db_manager.create_index("orders", "category", "BTREE")
+
+        primary_index = db_manager.tables["orders"]["primary_index"]
+        primary_index.insert_many = lambda records: OperationResult(False, 0, 0, 0)
+        result = db_manager.insert_many("orders", [make_record(db_manager, order_id) for order_id in range(20)])
+        print(f"   Result: {result.data}")
+        assert result.data is False
+        assert db_manager.tables["orders"]["secondary_indexes"]["category"]["index"].search("cat1").data == []
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def test_create_index_on_loaded_table():
+    print(f"\n{'='*60}")
+    print("CREATE INDEX ON A LOADED TABLE (BULK LOAD)")
+    print(f"{'='*60}")
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        db_manager = DatabaseManager("batch_test_db", base_path=temp_dir)
+        db_manager.create_table(create_orders_table(), primary_index_type="BTREE")
+        expected_ids = set(range(0, 3000, 2))
+        # los str se guardan rellenados con espacios en la primaria: el índice se arma desde valores bytes
+        db_manager.insert_many("orders", [make_record(db_manager, order_id, mixed=False) for order_id in expected_ids])
+
+        print(f"   {db_manager.create_index('orders', 'category', 'BTREE').data}")
+        print(f"   {db_manager.create_index('orders', 'quantity', 'BTREE').data}")
+        check_secondaries(db_manager, expected_ids)
+
+        db_manager = DatabaseManager("batch_test_db", base_path=temp_dir)
+        check_secondaries(db_manager, expected_ids)
+        assert sorted(r.order_id for r in db_manager.range_search("orders", 1, 2, field_name="quantity").data) == \
+            sorted(order_id for order_id in expected_ids if order_id % 5 in (1, 2))
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def main():
+    print("\n" + "="*60)
+    print("DATABASE MANAGER - BATCH LOAD TEST")
+    print("="*60)
+
+    test_insert_many_keeps_indexes_in_sync()
+    test_insert_many_stops_when_primary_fails()
+    test_create_index_on_loaded_table()
+    print("\n[OK] All batch load checks passed")
+
+if __name__ == "__main__":
+    main()